@@ -0,0 +1,153 @@
+# File: alarm.py
+"""
+Alarm sounds played off the Tk thread.
+
+    from alarm import ALARM
+    ALARM.play(3)       # returns at once; three beeps play on a worker thread
+
+Requests go through a small bounded queue to one worker thread, so a burst
+of reminders can never pile up minutes of beeping or block the UI. The sound
+backend is picked once: winsound on Windows, otherwise a WAV buffer piped to
+aplay/paplay when one is installed (kept in memory when not), or the null
+backend when ALARM_BACKEND=null.
+"""
+import io                                  # Import io for the in-memory WAV buffer
+import math                                # Import math to synthesise the beep
+import os                                  # Import os to read the backend setting
+import queue                               # Import queue for the bounded request queue
+import shutil                              # Import shutil to find a command-line player
+import struct                              # Import struct to pack PCM samples
+import subprocess                          # Import subprocess to run the player
+import threading                           # Import threading for the worker
+import wave                                # Import wave to write the WAV buffer
+
+try:
+    import winsound                        # Windows only
+except ImportError:
+    winsound = None
+
+BEEP_HZ = 1000        # Beep pitch
+BEEP_MS = 700         # Beep length
+BEEP_GAP_MS = 300     # Silence between beeps
+QUEUE_SIZE = 4        # Alarm requests waiting beyond this are dropped
+
+
+# ---------------- Backends ----------------
+class NullBackend:
+    """Plays nothing; counts beeps (useful for tests and headless machines)."""
+
+    name = "null"
+
+    def __init__(self):
+        self.beeps = 0
+
+    def beep(self, hz, ms):
+        self.beeps += 1
+
+
+class WinsoundBackend:
+    name = "winsound"
+
+    def beep(self, hz, ms):
+        winsound.Beep(hz, ms)
+
+
+class WavBackend:
+    """Renders each beep as 16-bit mono PCM in a WAV buffer and pipes it to a player."""
+
+    name = "wav"
+    RATE = 22050
+
+    def __init__(self, player=None):
+        self.player = player               # Command reading a WAV file on stdin, or None
+        self.last_wav = b""                # Last rendered beep, kept for inspection
+
+    def render(self, hz, ms):
+        frames = int(self.RATE * ms / 1000)
+        samples = (int(12000 * math.sin(2 * math.pi * hz * i / self.RATE)) for i in range(frames))
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.RATE)
+            w.writeframes(struct.pack(f"<{frames}h", *samples))
+        return buf.getvalue()
+
+    def beep(self, hz, ms):
+        self.last_wav = self.render(hz, ms)
+        if self.player:
+            subprocess.run(self.player, input=self.last_wav, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=False)
+
+
+def default_backend():
+    """Backend for this machine (ALARM_BACKEND=null|wav|winsound overrides)."""
+    choice = os.environ.get("ALARM_BACKEND", "").strip().lower()
+    if choice == "null":
+        return NullBackend()
+    if winsound is not None and choice in ("", "winsound"):
+        return WinsoundBackend()
+    for cmd in (["aplay", "-q", "-"], ["paplay"]):
+        if shutil.which(cmd[0]):
+            return WavBackend(cmd)
+    return WavBackend()
+
+
+# ---------------- Alarm ----------------
+class Alarm:
+    """One worker thread playing queued beep sequences."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._cancel = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self.backend is None:
+                self.backend = default_backend()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="alarm", daemon=True)
+                self._thread.start()
+
+    def play(self, times=3):
+        """Queue `times` beeps; returns False if too many alarms are already waiting."""
+        self._start()
+        try:
+            self._queue.put_nowait(times)
+        except queue.Full:
+            return False
+        return True
+
+    def stop(self):
+        """Silence the sequence playing now and drop the queued ones."""
+        self._cancel.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+                self._queue.task_done()
+        except queue.Empty:
+            pass
+
+    def _run(self):
+        while True:
+            times = self._queue.get()
+            self._cancel.clear()
+            try:
+                for i in range(times):
+                    if self._cancel.is_set():
+                        break
+                    try:
+                        self.backend.beep(BEEP_HZ, BEEP_MS)
+                    except Exception:
+                        break              # Sound device trouble: skip this alarm, keep the worker
+                    if i < times - 1 and self._cancel.wait(BEEP_GAP_MS / 1000):
+                        break
+            finally:
+                self._queue.task_done()
+
+
+# Shared alarm used by every window
+ALARM = Alarm()
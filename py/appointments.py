@@ -0,0 +1,123 @@
+# File: appointments.py
+"""
+Appointments between two or more students.
+
+    from appointments import find_conflicts, book, cancel
+    if not find_conflicts(users, "2026-03-02", "09:00", "10:00"):
+        book(users, "2026-03-02", "09:00", "10:00")
+    cancel("lee", event)            # event: lee's copy; removes everyone's
+
+Every participant gets their own timetable event ("Appointment with ..."
+naming the others, category "appointment"), and all copies share one
+appt_id. Booking and cancelling go through EVENTS.commit, so the copies of
+every participant are written together or not at all. Conflict checks for
+the participants run in parallel, each against one day of one timetable.
+find_common_free_slots suggests times at which every participant is free.
+"""
+import heapq                               # Import heapq to merge busy intervals of several users
+import uuid                                # Import uuid for appointment IDs
+from datetime import timedelta             # Import timedelta to step through the searched days
+from concurrent.futures import ThreadPoolExecutor  # Import executor for parallel conflict checks
+from event_cache import EVENTS, to_minutes  # Import shared per-date events cache
+
+TITLE_PREFIX = "Appointment with "         # Title of every appointment event
+MAX_WORKERS = 8                            # Timetables checked at the same time
+DAY_START = 8 * 60                         # Earliest suggested start (minutes, 08:00)
+DAY_END = 22 * 60                          # Latest suggested end (minutes, 22:00)
+SLOT_STEP = 30                             # Minutes between suggested starts inside one free gap
+
+
+def appointment_title(user, participants):
+    """Title of `user`'s copy: "Appointment with lee, wong"."""
+    return TITLE_PREFIX + ", ".join(p for p in participants if p != user)
+
+
+def participants_of(user, event):
+    """Everyone in the appointment `event` of `user` (user first), read from its title."""
+    others = event["title"][len(TITLE_PREFIX):].split(", ") if event["title"].startswith(TITLE_PREFIX) else []
+    return [user] + [p.strip() for p in others if p.strip() and p.strip() != user]
+
+
+def find_conflicts(users, date, start, end):
+    """{user: first clashing event} for the users busy during [start, end) ("HH:MM") on `date`."""
+    start_min, end_min = to_minutes(start), to_minutes(end)
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(users)))) as pool:
+        clashes = pool.map(lambda u: EVENTS.conflict(u, date, start_min, end_min), users)
+        return {u: e for u, e in zip(users, clashes) if e is not None}
+
+
+def find_common_free_slots(users, first_date, last_date, duration, count=5,
+                           day_start=DAY_START, day_end=DAY_END, not_before=None):
+    """
+    Earliest `count` slots of `duration` minutes in which none of `users` is busy,
+    between first_date and last_date (datetime.date, inclusive), within
+    [day_start, day_end) each day. Returns [(date "YYYY-MM-DD", start "HH:MM", end "HH:MM"), ...].
+
+    Each user's busy intervals for a day are already sorted by start, so they are
+    merged in one pass (heapq.merge) and the gaps between them are walked once.
+    Starts before `not_before` (a datetime) are skipped.
+    """
+    slots = []
+    day = first_date
+    while day <= last_date and len(slots) < count:
+        date = day.strftime("%Y-%m-%d")
+        start_of_day = day_start
+        if not_before is not None and day == not_before.date():
+            now = -(-(not_before.hour * 60 + not_before.minute) // SLOT_STEP) * SLOT_STEP  # Rounded up to the next step
+            start_of_day = max(day_start, now)  # Nothing in the past
+        if not_before is None or day >= not_before.date():
+            free_from = start_of_day
+            busy = heapq.merge(*(EVENTS.busy(user, date) for user in users))  # Everyone's events by start
+            for s, e in list(busy) + [(day_end, day_end)]:  # Sentinel closes the last gap
+                gap_end = min(s, day_end)
+                while free_from + duration <= gap_end and len(slots) < count:  # Fill the gap before this event
+                    slots.append((date, f"{free_from // 60:02d}:{free_from % 60:02d}",
+                                  f"{(free_from + duration) // 60:02d}:{(free_from + duration) % 60:02d}"))
+                    free_from += SLOT_STEP
+                if len(slots) >= count or s >= day_end:
+                    break
+                free_from = max(free_from, e)  # Next gap starts after this event
+        day += timedelta(days=1)
+    return slots
+
+
+def book(participants, date, start, end, description=""):
+    """Add the appointment to every participant's timetable in one commit; return its appt_id."""
+    appt_id = uuid.uuid4().hex[:12]
+    EVENTS.commit({
+        user: ([{
+            "date": date,
+            "start_time": start,
+            "end_time": end,
+            "title": appointment_title(user, participants),
+            "reminder": "0",
+            "category": "appointment",
+            "description": description,
+            "appt_id": appt_id
+        }], [])
+        for user in participants
+    })
+    return appt_id
+
+
+def same_appointment(user, event, other):
+    """True if `other` (someone else's event) is their copy of `user`'s appointment `event`."""
+    if event.get("appt_id"):
+        return other.get("appt_id") == event["appt_id"]
+    # Made before appointment IDs (two people only): the reciprocal title at the same time
+    return (other["title"] == TITLE_PREFIX + user
+            and other["start_time"] == event["start_time"] and other["end_time"] == event["end_time"])
+
+
+def cancel(user, event):
+    """Remove the appointment `event` of `user` from every participant's timetable at once."""
+    deletes = {user: [event["id"]]}
+    for p in participants_of(user, event)[1:]:
+        for e in EVENTS.day(p, event["date"]):
+            if same_appointment(user, event, e):
+                deletes[p] = [e["id"]]
+                break
+    if len(deletes) == 1:
+        EVENTS.delete(user, event["id"])   # Nobody else involved: a plain single-event delete
+    else:
+        EVENTS.commit({p: ([], ids) for p, ids in deletes.items()})
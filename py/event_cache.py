@@ -0,0 +1,196 @@
+# File: event_cache.py
+"""
+In-memory timetable events, grouped by user and date.
+
+    from event_cache import EVENTS
+    EVENTS.day("tan", "2026-03-02")           # that day's events (copies)
+    EVENTS.conflict("tan", "2026-03-02", 540, 600)
+
+Each user's events are read once. Before answering, the cache asks the
+storage backend for the user's events stamp (file mtime/size, or SQLite's
+data_version) and reloads only when it changed. Adds, edits and deletes
+made through the cache update it in place. Start and end times are kept
+as minute offsets, so daily views and conflict checks only look at one
+day's events.
+
+Reading a user's events from storage happens outside the cache lock, so
+lookups for different users (e.g. a group appointment's conflict checks)
+can load in parallel.
+"""
+import bisect                              # Import bisect to keep each day sorted by start
+import threading                           # Import threading to guard the cache
+from storage import get_backend            # Import storage backend (CSV files or SQLite)
+
+
+def to_minutes(hhmm: str) -> int:
+    """'09:30' -> 570"""
+    h, _, m = hhmm.partition(":")
+    return int(h) * 60 + int(m)
+
+
+class _UserEvents:
+    """One user's events: by ID (file order) and per date sorted by start minute."""
+
+    def __init__(self, events, stamp):
+        self.stamp = stamp
+        self.by_id = {}                    # id -> event dict
+        self.by_date = {}                  # date -> [(start_min, end_min, id), ...] sorted
+        self.next_id = 1                   # ID counter: never reuses an ID within a session
+        for e in events:
+            self.add(e)
+
+    def add(self, e):
+        if e["id"] in self.by_id:          # Duplicate ID in old files: the later row wins
+            self._unindex(self.by_id[e["id"]])
+        self.by_id[e["id"]] = e
+        self.next_id = max(self.next_id, e["id"] + 1)
+        bisect.insort(self.by_date.setdefault(e["date"], []), _span(e))
+
+    def remove(self, eid):
+        e = self.by_id.pop(eid)
+        self._unindex(e)
+        return e
+
+    def replace(self, e):
+        """Swap in an edited event, keeping its place in stored order."""
+        self._unindex(self.by_id[e["id"]])
+        self.by_id[e["id"]] = e
+        bisect.insort(self.by_date.setdefault(e["date"], []), _span(e))
+
+    def _unindex(self, e):
+        day = self.by_date[e["date"]]
+        day.remove(_span(e))
+        if not day:
+            del self.by_date[e["date"]]
+
+
+def _span(e):
+    try:
+        return (to_minutes(e["start_time"]), to_minutes(e["end_time"]), e["id"])
+    except ValueError:
+        return (0, 0, e["id"])             # Unreadable time: sorts first, never conflicts
+
+
+class EventCache:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._users = {}                   # user -> _UserEvents
+
+    # ---------------- Loading ----------------
+    def _get(self, user):
+        backend = get_backend()
+        stamp = backend.events_stamp(user)
+        with self._lock:
+            cached = self._users.get(user)
+            if cached is not None and stamp is not None and stamp == cached.stamp:
+                return cached
+        loaded = _UserEvents(backend.load_events(user), stamp)  # Slow part, without the lock
+        with self._lock:
+            current = self._users.get(user)
+            if current is not None and current is not cached:
+                return current                 # Someone else loaded or wrote meanwhile: theirs is newer
+            self._users[user] = loaded
+            return loaded
+
+    def _write(self, user, cached, write):
+        """Run one backend write (usually a single append) and remember the new stamp."""
+        backend = get_backend()
+        before = backend.events_stamp(user)
+        write(backend)
+        if backend.events_compaction_due(user):
+            backend.compact_events(user, list(cached.by_id.values()))
+        # Only trust the new stamp if nobody else wrote in between
+        cached.stamp = backend.events_stamp(user) if before == cached.stamp else None
+
+    # ---------------- Lookups ----------------
+    def all(self, user):
+        """Every event of the user in stored order (copies)."""
+        cached = self._get(user)
+        with self._lock:
+            return [dict(e) for e in cached.by_id.values()]
+
+    def day(self, user, date):
+        """The user's events on one date, earliest start first (copies)."""
+        cached = self._get(user)
+        with self._lock:
+            return [dict(cached.by_id[eid]) for _, _, eid in cached.by_date.get(date, [])]
+
+    def get(self, user, eid):
+        cached = self._get(user)
+        with self._lock:
+            e = cached.by_id.get(eid)
+            return dict(e) if e else None
+
+    def busy(self, user, date):
+        """[(start_min, end_min), ...] of the user's events on a date, sorted by start."""
+        cached = self._get(user)
+        with self._lock:
+            return [(s, e) for s, e, _ in cached.by_date.get(date, [])]
+
+    def conflict(self, user, date, start, end, ignore_id=None):
+        """First event on `date` overlapping [start, end) minutes, or None."""
+        cached = self._get(user)
+        with self._lock:
+            for s, e, eid in cached.by_date.get(date, []):
+                if s >= end:
+                    break                  # Sorted by start: nothing later can overlap
+                if e > start and eid != ignore_id:
+                    return dict(cached.by_id[eid])
+            return None
+
+    # ---------------- Updates ----------------
+    def add(self, user, event):
+        """Store a new event (its id is assigned here); return the stored copy."""
+        with self._lock:
+            cached = self._get(user)
+            event = {"appt_id": "", **event, "id": cached.next_id}  # Same keys as a loaded event
+            cached.add(event)
+            self._write(user, cached, lambda b: b.append_event(user, event))
+            return dict(event)
+
+    def update(self, user, eid, **fields):
+        """Change fields of an event; return the stored copy (None if it does not exist)."""
+        with self._lock:
+            cached = self._get(user)
+            if eid not in cached.by_id:
+                return None
+            event = dict(cached.by_id[eid], **fields)
+            cached.replace(event)
+            self._write(user, cached, lambda b: b.update_event(user, event))
+            return dict(event)
+
+    def delete(self, user, eid):
+        """Remove an event; return it (None if it does not exist)."""
+        with self._lock:
+            cached = self._get(user)
+            if eid not in cached.by_id:
+                return None
+            event = cached.remove(eid)
+            self._write(user, cached, lambda b: b.delete_event(user, eid))
+            return event
+
+    def commit(self, changes):
+        """
+        Add and delete events of several users in one all-or-nothing write.
+
+        changes: {user: ([new event, ...], [id to delete, ...])}
+        Returns {user: [stored new events]}. If storage fails, nothing changes.
+        """
+        with self._lock:
+            staged, added, next_ids = {}, {}, {}
+            for user, (new, gone) in changes.items():
+                cached = self._get(user)
+                gone = set(gone)
+                added[user] = [dict(e, id=cached.next_id + i) for i, e in enumerate(new)]
+                staged[user] = [e for eid, e in cached.by_id.items() if eid not in gone] + added[user]
+                next_ids[user] = cached.next_id + len(new)
+            backend = get_backend()
+            backend.commit_events(staged)
+            for user, events in staged.items():
+                cached = self._users[user] = _UserEvents(events, backend.events_stamp(user))
+                cached.next_id = max(cached.next_id, next_ids[user])  # Deleted IDs stay retired
+            return {user: [dict(e) for e in events] for user, events in added.items()}
+
+
+# Shared cache used by the timetable and appointment windows
+EVENTS = EventCache()
@@ -1,53 +1,18 @@
 import tkinter as tk              # Import tkinter for GUI components
 from tkinter import messagebox    # Import messagebox for popup dialogs
-import os                         # Import os for file and directory handling
 from homepage import open_main_app  # Import function to open the main app after login
+from user_directory import USERS  # Import shared, indexed user directory
 
 # --- Global variables for this file ---
-USER_FILE = os.path.join("data", "users.txt")  # Path to user data file
 current_user = ""                              # Store currently logged-in username
 
 
 # =========================================================
 # Utility functions
 # =========================================================
-def ensure_user_file():
-    """Make sure the user file exists"""
-    if not os.path.exists(USER_FILE):                      # Check if file does not exist
-        os.makedirs(os.path.dirname(USER_FILE), exist_ok=True)  # Create "data" directory if missing
-        with open(USER_FILE, "w") as f:                    # Create an empty file
-            pass
-
-
-def read_users():
-    """Return [(student_id, username, password), ...]"""
-    ensure_user_file()                         # Ensure user file exists before reading
-    users = []                                 # Initialize empty list
-    with open(USER_FILE, "r", encoding="utf-8") as f:   # Open user file in read mode
-        for line in f:                         # Read each line
-            parts = line.strip().split(",")    # Split by comma
-            if len(parts) == 3:                # New format: id, username, password
-                users.append((parts[0], parts[1], parts[2]))
-            elif len(parts) == 2:              # Old format fallback: username, password
-                users.append(("0000000", parts[0], parts[1]))  # Use default ID
-    return users                               # Return list of users
-
-
-def generate_student_id():
-    """Generate a new unique student ID"""
-    users = read_users()                       # Load all users
-    ids = [int(u[0]) for u in users if u[0].isdigit()]  # Collect valid numeric IDs
-    if not ids:                                # If no IDs exist
-        return "1000001"                       # Start from 1000001
-    return str(max(ids) + 1).zfill(7)          # Otherwise assign max+1, padded to 7 digits
-
-
 def write_user(username, password):
     """Write new user with auto student_id"""
-    student_id = generate_student_id()         # Generate a new ID
-    with open(USER_FILE, "a", encoding="utf-8") as f:   # Open file in append mode
-        f.write(f"{student_id},{username},{password}\n")  # Write user info
-    return student_id                          # Return assigned ID
+    return USERS.register(username, password).student_id  # Reserve ID, save and index the user
 
 
 # =========================================================
@@ -80,8 +45,7 @@ def open_register_window(parent):
             messagebox.showwarning("Warning", "Fields cannot be empty!", parent=reg_win)
             return
 
-        users = read_users()                     # Load existing users
-        if any(saved_user == username for _, saved_user, _ in users):
+        if USERS.exists(username):               # Dictionary lookup instead of scanning all users
             # If username already exists, show error
             messagebox.showerror("Error", "Username already exists!", parent=reg_win)
             return
@@ -104,19 +68,18 @@ def login_user():
     username = user_entry.get().strip()         # Get username input
     password = pass_entry.get().strip()         # Get password input
 
-    users = read_users()                        # Load users
-    for saved_sid, saved_user, saved_pass in users:  # Check each user
-        if saved_user == username and saved_pass == password:  # Match found
-            current_user = username             # Set current user
-            messagebox.showinfo("Login Successful", f"Welcome, {username}!\nID: {saved_sid}", parent=login_window)
-            # Show success popup with ID
-            user_entry.delete(0, tk.END)        # Clear username field
-            pass_entry.delete(0, tk.END)        # Clear password field
-            login_window.withdraw()             # Hide login window
-            open_main_app(login_window, current_user)  # Open main app
-            return
-
-    # If loop finishes without returning -> wrong login
+    user = USERS.authenticate(username, password)  # Look up the user by name
+    if user is not None:                        # Match found
+        current_user = username                 # Set current user
+        messagebox.showinfo("Login Successful", f"Welcome, {username}!\nID: {user.student_id}", parent=login_window)
+        # Show success popup with ID
+        user_entry.delete(0, tk.END)            # Clear username field
+        pass_entry.delete(0, tk.END)            # Clear password field
+        login_window.withdraw()                 # Hide login window
+        open_main_app(login_window, current_user)  # Open main app
+        return
+
+    # No matching user -> wrong login
     messagebox.showerror("Login Failed", "Wrong username or password!", parent=login_window)
     pass_entry.delete(0, tk.END)                # Clear only password field
 
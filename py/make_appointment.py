@@ -1,21 +1,11 @@
 # File: make_appointment.py
 import tkinter as tk  # import tkinter for GUI
 from tkinter import ttk, messagebox  # import ttk for styled widgets, messagebox for dialogs
-from datetime import datetime  # import datetime for date and time handling
-import os  # import os for file path operations
-from student_timetable import (  # import timetable functions
-    load_events,  # command: load events from file
-    add_event_txt,  # command: add an event to file
-    delete_event_txt  # command: delete an event from file
-)
-
-
-USERS_FILE = os.path.join("data", "users.txt")  # command: set the file path for users
-
-
-def to_minutes(hhmm: str) -> int:  # command: convert HH:MM to total minutes
-    h, m = map(int, hhmm.split(":"))  # command: split hour and minute
-    return h * 60 + m  # command: return total minutes
+from datetime import datetime, timedelta  # import datetime for date and time handling
+from user_directory import USERS  # import shared user directory
+from event_cache import EVENTS, to_minutes  # import shared per-date events cache and HH:MM -> minutes
+from student_timetable import load_events  # import timetable function: load events
+from appointments import find_conflicts, find_common_free_slots, book, cancel, TITLE_PREFIX  # import group appointment booking and free-slot search
 
 
 def to_12h_str(hhmm: str) -> str:  # command: convert 24h HH:MM to 12h string
@@ -31,19 +21,21 @@ def to_12h_str(hhmm: str) -> str:  # command: convert 24h HH:MM to 12h string
     return f"{hour}:{minute:02d} {suffix}"  # command: return formatted string
 
 
+SLOT_SEARCH_DAYS = 7  # command: days searched from the selected date
+
+
 class AppointmentApp:  # command: main appointment GUI class
     def __init__(self, root, current_user):  # command: initialize the GUI
         self.root = root  # command: store root window
         self.current_user = current_user  # command: store current user
         self.root.title("Make Appointment")  # command: set window title
-        self.root.geometry("600x400")  # command: set window size
+        self.root.geometry("600x560")  # command: set window size
         self.root.configure(bg="lightcyan")  # command: set background color
 
-        tk.Label(root, text="Select User to Appointment:", bg="lightcyan").place(x=20, y=20)  # command: add user selection label
-        self.user_var = tk.StringVar()  # command: variable for selected user
-        self.user_combobox = ttk.Combobox(root, textvariable=self.user_var, width=25, state="readonly")  # command: create user dropdown
-        self.user_combobox.place(x=250, y=20)  # command: place user dropdown
-        self.load_users()  # command: load users into dropdown
+        tk.Label(root, text="Select Users to Appointment (one or more):", bg="lightcyan").place(x=20, y=20)  # command: add user selection label
+        self.user_listbox = tk.Listbox(root, selectmode=tk.MULTIPLE, exportselection=False, width=18, height=9)  # command: create multi-select user list
+        self.user_listbox.place(x=440, y=20)  # command: place user list
+        self.load_users()  # command: load users into list
 
         tk.Label(root, text="Date (YYYY-MM-DD):", bg="lightcyan").place(x=20, y=60)  # command: add date label
 
@@ -86,11 +78,18 @@ class AppointmentApp:  # command: main appointment GUI class
         ttk.Combobox(root, textvariable=self.end_ampm, values=ampm,   width=4, state="readonly").place(x=350, y=140)  # command: end AM/PM dropdown
 
         tk.Button(root, text="Make Appointment", bg="lightgreen", command=self.make_appointment).place(x=100, y=180)  # command: button to create appointment
+        tk.Button(root, text="Find Free Slots", bg="lightyellow", command=self.find_free_slots).place(x=250, y=180)  # command: button to suggest common free times
         tk.Button(root, text="Cancel Selected", bg="lightcoral", command=self.cancel_appointment).place(x=400, y=180)  # command: button to cancel selected appointment
 
-        tk.Label(root, text="Your Appointment History:", bg="lightcyan").place(x=20, y=230)  # command: label for history
+        tk.Label(root, text="Free Slots (click to use):", bg="lightcyan").place(x=20, y=220)  # command: label for free slots
+        self.slots_listbox = tk.Listbox(root, width=70, height=5)  # command: listbox to show suggested slots
+        self.slots_listbox.place(x=20, y=245)  # command: place listbox
+        self.slots_listbox.bind("<<ListboxSelect>>", self.use_free_slot)  # command: fill date/time from a slot
+        self.free_slots = []  # command: slots shown in the listbox
+
+        tk.Label(root, text="Your Appointment History:", bg="lightcyan").place(x=20, y=350)  # command: label for history
         self.history_listbox = tk.Listbox(root, width=70, height=8)  # command: listbox to show appointment history
-        self.history_listbox.place(x=20, y=260)  # command: place listbox
+        self.history_listbox.place(x=20, y=380)  # command: place listbox
 
         self.refresh_history()  # command: refresh the listbox with current appointments
 
@@ -103,42 +102,63 @@ class AppointmentApp:  # command: main appointment GUI class
         return options  # command: return time list
 
     def load_users(self):  # command: load users from file
-        if not os.path.exists(USERS_FILE):  # command: check file exists
-            messagebox.showerror("Error", f"{USERS_FILE} not found.")  # command: error if missing
-            return
+        users = USERS.usernames(exclude=self.current_user)  # command: all users except current user
 
-        users = []
-        with open(USERS_FILE, "r", encoding="utf-8") as f:  # command: open file
-            for line in f:
-                parts = line.strip().split(",")  # command: split line
-                if len(parts) == 2:  # command: format username,password
-                    username, _ = parts
-                    if username != self.current_user:
-                        users.append(username)  # command: add user
-                elif len(parts) == 3:  # command: format id,username,password
-                    student_id, username, _ = parts
-                    if username != self.current_user:
-                        users.append(username)  # command: add user
-
-        self.user_combobox["values"] = users  # command: update dropdown
+        self.user_listbox.delete(0, tk.END)  # command: clear list
+        for user in users:
+            self.user_listbox.insert(tk.END, user)  # command: add user
         if users:
-            self.user_var.set(users[0])  # command: default selection
+            self.user_listbox.selection_set(0)  # command: default selection
+
+    def selected_users(self):  # command: users picked in the list
+        return [self.user_listbox.get(i) for i in self.user_listbox.curselection()]
+
+    def find_free_slots(self):  # command: suggest times when every participant is free
+        others = self.selected_users()  # command: get selected users
+        start_str = f"{self.start_hour.get()}:{self.start_min.get()} {self.start_ampm.get()}"  # command: get start time
+        end_str   = f"{self.end_hour.get()}:{self.end_min.get()} {self.end_ampm.get()}"  # command: get end time
+        try:
+            first = datetime.strptime(f"{self.year_var.get()}-{self.month_var.get()}-{self.day_var.get()}", "%Y-%m-%d").date()  # command: search from the selected date
+            start_24 = datetime.strptime(start_str, "%I:%M %p").strftime("%H:%M")  # command: convert start to 24h
+            end_24 = datetime.strptime(end_str, "%I:%M %p").strftime("%H:%M")  # command: convert end to 24h
+            duration = to_minutes(end_24) - to_minutes(start_24)  # command: length of the chosen time (negative if end is before start)
+            if duration <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date or time!")  # command: show error
+            return
 
-    def has_conflict(self, events, start, end):  # command: check for conflicts
-        for e in events:
-            e_start = to_minutes(e['start_time'])  # command: event start minutes
-            e_end = to_minutes(e['end_time'])  # command: event end minutes
-            if start < e_end and end > e_start:  # command: check overlap
-                return True  # command: conflict found
-        return False  # command: no conflict
+        users = [self.current_user] + others  # command: everyone who must be free
+        last = first + timedelta(days=SLOT_SEARCH_DAYS - 1)  # command: end of the search range
+        self.free_slots = find_common_free_slots(users, first, last, duration, count=5, not_before=datetime.now())  # command: earliest common slots
+        self.slots_listbox.delete(0, tk.END)  # command: clear listbox
+        for date, start, end in self.free_slots:
+            self.slots_listbox.insert(tk.END, f"{date} | {to_12h_str(start)} - {to_12h_str(end)}")  # command: insert slot
+        if not self.free_slots:
+            self.slots_listbox.insert(tk.END, f"No free {duration}-minute slot in the next {SLOT_SEARCH_DAYS} days")  # command: nothing found
+
+    def use_free_slot(self, event=None):  # command: copy a suggested slot into the date/time fields
+        selection = self.slots_listbox.curselection()
+        if not selection or selection[0] >= len(self.free_slots):
+            return
+        date, start, end = self.free_slots[selection[0]]
+        self.year_var.set(date[:4])  # command: set year
+        self.month_var.set(date[5:7])  # command: set month
+        self.day_var.set(date[8:])  # command: set day
+        for hhmm, hour, minute, ampm in ((start, self.start_hour, self.start_min, self.start_ampm),
+                                         (end, self.end_hour, self.end_min, self.end_ampm)):
+            t = datetime.strptime(hhmm, "%H:%M")
+            hour.set(t.strftime("%I"))  # command: set hour
+            minute.set(t.strftime("%M"))  # command: set minute
+            ampm.set(t.strftime("%p"))  # command: set AM/PM
 
     def make_appointment(self):  # command: create appointment
-        other_user = self.user_var.get().strip()  # command: get selected user
+        others = self.selected_users()  # command: get selected users
         date = f"{self.year_var.get()}-{self.month_var.get()}-{self.day_var.get()}"  # command: get date
         start_str = f"{self.start_hour.get()}:{self.start_min.get()} {self.start_ampm.get()}"  # command: get start time
         end_str   = f"{self.end_hour.get()}:{self.end_min.get()} {self.end_ampm.get()}"  # command: get end time
 
-        if not other_user or not date or not start_str or not end_str:  # command: check blanks
+        if not others or not date or not start_str or not end_str:  # command: check blanks
             messagebox.showerror("Error", "All fields are required!")  # command: show error
             return
 
@@ -152,20 +172,21 @@ class AppointmentApp:  # command: main appointment GUI class
             messagebox.showerror("Error", "Invalid date or time!")  # command: show error
             return
 
-        user_events = load_events(self.current_user, date)  # command: load current user events
-        if self.has_conflict(user_events, to_minutes(start_24), to_minutes(end_24)):  # command: check conflict
+        participants = [self.current_user] + others  # command: everyone in the appointment
+        conflicts = find_conflicts(participants, date, start_24, end_24)  # command: check every timetable in parallel
+        if self.current_user in conflicts:
             messagebox.showerror("Error", "Conflict with your timetable!")  # command: show conflict
             return
-        other_events = load_events(other_user, date)  # command: load other user events
-        if self.has_conflict(other_events, to_minutes(start_24), to_minutes(end_24)):  # command: check conflict
-            messagebox.showerror("Error", "Conflict with other user's timetable!")  # command: show conflict
+        if conflicts:
+            busy = ", ".join(u for u in participants if u in conflicts)  # command: who is busy
+            messagebox.showerror("Error", f"Conflict with the timetable of: {busy}")  # command: show conflict
             return
 
-        title_current = f"Appointment with {other_user}"  # command: set current user title
-        add_event_txt(self.current_user, date, start_24, end_24, title_current, category="appointment")  # command: add event
-
-        title_other = f"Appointment with {self.current_user}"  # command: set other user title
-        add_event_txt(other_user, date, start_24, end_24, title_other, category="appointment")  # command: add event
+        try:
+            book(participants, date, start_24, end_24)  # command: add to every timetable at once
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save the appointment: {e}")  # command: nothing was booked
+            return
 
         messagebox.showinfo("Success", "Appointment created!")  # command: show success
         self.refresh_history()  # command: refresh history
@@ -175,34 +196,17 @@ class AppointmentApp:  # command: main appointment GUI class
         if not selection:
             messagebox.showerror("Error", "No appointment selected!")  # command: show error
             return
-        idx = selection[0]  # command: get index
-        line = self.history_listbox.get(idx)  # command: get line text
-        date, time_str, title = line.split(" | ", 2)  # command: split line
-        start_str, end_str = time_str.split(" - ")  # command: split time
-
-        start_24 = datetime.strptime(start_str.strip(), "%I:%M %p").strftime("%H:%M")  # command: convert start
-        end_24 = datetime.strptime(end_str.strip(), "%I:%M %p").strftime("%H:%M")  # command: convert end
-
-        user_events = load_events(self.current_user, date)  # command: load user events
-        to_delete = None  # command: init
-        for e in user_events:
-            if e['title'] == title and e['start_time'] == start_24 and e['end_time'] == end_24:  # command: match event
-                to_delete = e
-                break
-
-        if not to_delete:
+        event = self.history[selection[0]]  # command: event shown on that line
+        if EVENTS.get(self.current_user, event['id']) is None:
             messagebox.showerror("Error", "Appointment not found in your records.")  # command: show error
+            self.refresh_history()
             return
 
-        delete_event_txt(self.current_user, to_delete['id'])  # command: delete event
-
-        if title.startswith("Appointment with "):  # command: remove from other user
-            other_user = title.replace("Appointment with ", "").strip()
-            other_events = load_events(other_user, date)
-            for ev in other_events:
-                if ev['title'] == f"Appointment with {self.current_user}" and ev['start_time'] == start_24 and ev['end_time'] == end_24:
-                    delete_event_txt(other_user, ev['id'])
-                    break
+        try:
+            cancel(self.current_user, event)  # command: remove it from every participant at once
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not cancel the appointment: {e}")  # command: nothing was removed
+            return
 
         messagebox.showinfo("Success", "Appointment cancelled.")  # command: show success
         self.refresh_history()  # command: refresh history
@@ -210,8 +214,9 @@ class AppointmentApp:  # command: main appointment GUI class
     def refresh_history(self):  # command: update history listbox
         self.history_listbox.delete(0, tk.END)  # command: clear listbox
         events = load_events(self.current_user)  # command: load events
-        appointments = [e for e in events if e['title'].startswith("Appointment with ")]  # command: filter appointments
-        for e in sorted(appointments, key=lambda x: (x['date'], x['start_time'])):  # command: sort
+        appointments = [e for e in events if e['title'].startswith(TITLE_PREFIX)]  # command: filter appointments
+        self.history = sorted(appointments, key=lambda x: (x['date'], x['start_time']))  # command: sort, keep for cancelling
+        for e in self.history:
             line = f"{e['date']} | {to_12h_str(e['start_time'])} - {to_12h_str(e['end_time'])} | {e['title']}"  # command: format line
             self.history_listbox.insert(tk.END, line)  # command: insert line
 
@@ -0,0 +1,185 @@
+# File: note_index.py
+"""
+Full-text index of one user's notes.
+
+    index = NoteIndex(user_dir)
+    index.ensure(stamp, lambda: notes)      # load from disk, or rebuild if the notes changed
+    index.search("exam chem")               # note IDs containing both words, best first
+
+Notes are split into lower-case word tokens. Each token has a posting list
+{note_id: weight}, where a word in the title counts TITLE_WEIGHT times, in
+tags or category FIELD_WEIGHT times and in the content once per occurrence.
+Every query word matches the tokens it is a prefix of (found by bisect in the
+sorted vocabulary), the words are ANDed, and results are ranked by weight
+times inverse document frequency.
+
+On disk (data/{user}/):
+  notes_index.txt     the posting lists at the last compaction
+  notes_index.log     notes indexed or removed since then, append-only
+
+Both record the notes' stamp they match; when the notes were changed
+behind the index's back, it is rebuilt from the notes.
+"""
+import bisect                              # Import bisect for the sorted vocabulary
+import math                                # Import math for the idf weight
+import os                                  # Import os for the index files
+import re                                  # Import re to split text into words
+
+TITLE_WEIGHT = 3       # A title word weighs this many content words
+FIELD_WEIGHT = 2       # Same for tag and category words
+LOG_THRESHOLD = 200    # Rewrite notes_index.txt once its log holds this many changes
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lower-case words of `text`, in order."""
+    return _WORD.findall((text or "").lower())
+
+
+def note_terms(note):
+    """{token: weight} of a note dict (title, tags, category, content)."""
+    terms = {}
+    for field, weight in (("title", TITLE_WEIGHT), ("tags", FIELD_WEIGHT),
+                          ("category", FIELD_WEIGHT), ("content", 1)):
+        for token in tokenize(note.get(field, "")):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+
+class NoteIndex:
+    def __init__(self, folder, threshold=LOG_THRESHOLD):
+        self.index_file = os.path.join(folder, "notes_index.txt")
+        self.log_file = os.path.join(folder, "notes_index.log")
+        self.threshold = threshold
+        self.stamp = None                  # Notes stamp the index matches (None: not loaded)
+        self._postings = {}                # token -> {note_id: weight}
+        self._docs = {}                    # note_id -> {token: weight}, to remove a note's postings
+        self._vocab = []                   # Sorted tokens, for prefix lookups
+        self._log_rows = 0
+
+    # ---------------- Loading ----------------
+    def ensure(self, stamp, notes):
+        """Make the index match notes with this stamp; notes() is only called to rebuild."""
+        if self.stamp is not None and self.stamp == stamp:
+            return
+        if self._load() != stamp:
+            self._clear()
+            for note in notes():
+                self._add(note["id"], note_terms(note))
+            self._write_snapshot(stamp)
+        self.stamp = stamp
+
+    def _load(self):
+        """Read the index files; return the notes stamp they match (None if missing)."""
+        self._clear()
+        docs, postings = self._docs, self._postings
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                stamp = f.readline().rstrip("\n").partition("\t")[2]
+                for line in f:
+                    token, _, items = line.rstrip("\n").partition("\t")
+                    postings[token] = plist = {int(d): int(w) for d, w in (item.split(":") for item in items.split(","))}
+                    for doc, weight in plist.items():
+                        docs.setdefault(doc, {})[token] = weight
+        except (FileNotFoundError, ValueError):
+            return None
+        self._vocab = sorted(postings)
+        try:
+            with open(self.log_file, "r", encoding="utf-8") as f:
+                for line in f:             # Replay changes made since the snapshot
+                    op, doc, stamp, terms = (line.rstrip("\n").split("\t") + [""])[:4]
+                    self._remove(int(doc))
+                    if op == "put":
+                        self._add(int(doc), {t: int(w) for t, w in (item.split(":") for item in terms.split(" ") if item)})
+                    self._log_rows += 1
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            return None                    # Torn last line: rebuild
+        return stamp
+
+    def _clear(self):
+        self._postings, self._docs, self._vocab = {}, {}, []
+        self._log_rows = 0
+
+    # ---------------- Updates ----------------
+    def put(self, note, stamp):
+        """(Re-)index one note; `stamp` is the notes' stamp after it was saved."""
+        terms = note_terms(note)
+        self._remove(note["id"])
+        self._add(note["id"], terms)
+        self._append("put", note["id"], stamp, " ".join(f"{t}:{w}" for t, w in terms.items()))
+
+    def remove(self, note_ids, stamp):
+        for note_id in note_ids:
+            self._remove(note_id)
+            self._append("del", note_id, stamp, "")
+
+    def _add(self, doc, terms):
+        self._docs[doc] = terms
+        for token, weight in terms.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._vocab, token)
+            postings[doc] = weight
+
+    def _remove(self, doc):
+        for token in self._docs.pop(doc, {}):
+            postings = self._postings[token]
+            del postings[doc]
+            if not postings:
+                del self._postings[token]
+                del self._vocab[bisect.bisect_left(self._vocab, token)]
+
+    def _append(self, op, doc, stamp, terms):
+        self.stamp = stamp
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(f"{op}\t{doc}\t{stamp}\t{terms}\n")
+        self._log_rows += 1
+        if self._log_rows >= self.threshold:
+            self._write_snapshot(stamp)
+
+    def _write_snapshot(self, stamp):
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"#stamp\t{stamp}\n")
+            for token in self._vocab:
+                f.write(token + "\t" + ",".join(f"{d}:{w}" for d, w in self._postings[token].items()) + "\n")
+        os.replace(tmp, self.index_file)
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)       # The snapshot already holds every change
+        self._log_rows = 0
+
+    # ---------------- Queries ----------------
+    def prefix_tokens(self, prefix):
+        """Indexed tokens starting with `prefix`."""
+        i = bisect.bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            yield self._vocab[i]
+            i += 1
+
+    def search(self, query, within=None):
+        """
+        IDs of notes matching every word of `query` (each word as a prefix), best first.
+        Only notes in `within` are considered when it is given. None for an empty query.
+        """
+        words = tokenize(query)
+        if not words:
+            return None
+        total = len(self._docs) or 1
+        scores = None
+        for word in dict.fromkeys(words):
+            matches = {}
+            for token in self.prefix_tokens(word):
+                postings = self._postings[token]
+                idf = math.log(1 + total / len(postings))
+                for doc, weight in postings.items():
+                    if (within is None or doc in within) and weight * idf > matches.get(doc, 0):
+                        matches[doc] = weight * idf
+            scores = matches if scores is None else {d: scores[d] + s for d, s in matches.items() if d in scores}
+            if not scores:
+                return []
+            within = scores                # AND: later words only look at notes still in
+        return sorted(scores, key=lambda d: (-scores[d], d))
@@ -3,19 +3,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import os
 import datetime
+import difflib
 import webbrowser
 import platform
 import subprocess
+from note_index import NoteIndex
+from notes_store import NotesStore
 
 # ----------------- Configuration -----------------
 DATA_DIR = "data"
 
-# Field separators and tokens (kept simple & human-readable)
-FIELD_SEP = "||"        # separates fields in a single note line
-ATT_SEP = ";;"          # separates multiple attachments inside attachments field
-NL_TOKEN = "<NL>"       # replaces newline in content for single-line storage
-PIPE_TOKEN = "<PIPE>"   # escape for FIELD_SEP if user types it
-SEMI_TOKEN = "<SEMI>"   # escape for ATT_SEP if user types it
+SEARCH_DELAY_MS = 200   # search this long after the last keystroke
 
 # Default suggestions
 DEFAULT_CATEGORIES = ["General","School","Work","Personal","Study"]
@@ -25,16 +23,6 @@ DEFAULT_TAGS = ["Urgent","Todo","Important","Exam"]
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
-def encode_field(s: str) -> str:
-    if s is None:
-        return ""
-    return s.replace(FIELD_SEP, PIPE_TOKEN).replace(ATT_SEP, SEMI_TOKEN).replace("\n", NL_TOKEN)
-
-def decode_field(s: str) -> str:
-    if s is None:
-        return ""
-    return s.replace(PIPE_TOKEN, FIELD_SEP).replace(SEMI_TOKEN, ATT_SEP).replace(NL_TOKEN, "\n")
-
 def open_path(path: str):
     """Open a file path or URL cross-platform."""
     if path.startswith("http://") or path.startswith("https://"):
@@ -67,12 +55,12 @@ class NotesOrganizerApp:
         # prepare per-user paths
         self.user_dir = os.path.join(DATA_DIR, self.user)
         ensure_dir(self.user_dir)
-        self.notes_file = os.path.join(self.user_dir, "notes.txt")
+        self.store = NotesStore(self.user_dir)  # notes/index.csv + one file per note
         self.categories_file = os.path.join(self.user_dir, "categories.txt")
         self.tags_file = os.path.join(self.user_dir, "tags.txt")
 
         # ensure files exist
-        for p in (self.notes_file, self.categories_file, self.tags_file):
+        for p in (self.categories_file, self.tags_file):
             if not os.path.exists(p):
                 open(p, "a", encoding="utf-8").close()
 
@@ -97,6 +85,9 @@ class NotesOrganizerApp:
                   bg="#dc3545", fg="white", relief="flat", padx=10).pack(side="left", padx=8, pady=8)
 
         # Search on toolbar
+        self._search_after = None  # pending debounced search (Tk after id)
+        self._last_query = None    # query of the last search, and the note IDs it matched
+        self._last_ids = None
         self.search_var = tk.StringVar()
         search_entry = tk.Entry(toolbar, textvariable=self.search_var, width=36, font=("Segoe UI", 10))
         search_entry.pack(side="right", padx=8)
@@ -125,6 +116,7 @@ class NotesOrganizerApp:
                 if self.search_var.get() == self._placeholder_text:
                     self.search_var.set("")
         self.search_var.trace_add("write", on_type)
+        self.search_var.trace_add("write", self.schedule_search)  # search as you type
         set_placeholder()
 
         # Layout: left list, right editor
@@ -144,6 +136,8 @@ class NotesOrganizerApp:
         left_buttons.pack(fill="x", padx=8, pady=(0,8))
         tk.Button(left_buttons, text="Refresh", command=self.reload_notes, padx=6).pack(side="left")
         tk.Button(left_buttons, text="All", command=self.show_all, padx=6).pack(side="left", padx=6)
+        self.status_label = tk.Label(left_buttons, text="", fg="gray")
+        self.status_label.pack(side="right")
 
         # Right
         right_frame = ttk.Frame(paned)
@@ -221,9 +215,11 @@ class NotesOrganizerApp:
         right_frame.grid_columnconfigure(1, weight=1)
 
         # Internal state
-        self.notes = []            # list of note dicts
+        self.notes = []            # list of NoteHeader (id, title, category, tags, date)
         self.filtered_indices = [] # maps listbox index -> notes index
+        self._shown_rows = []      # lines currently in the listbox
         self.currently_loaded_idx = None  # real index of note loaded into editor, or None
+        self.index = NoteIndex(self.user_dir)  # full-text search index
 
         # Load notes
         self.reload_notes()
@@ -309,16 +305,20 @@ class NotesOrganizerApp:
         return items
 
     def save_suggestion_line(self, path, new_item):
-        items = set(self.load_suggestions(path, []))
-        items.add(new_item.strip())
+        self.save_suggestions(path, [new_item])
+
+    def save_suggestions(self, path, new_items):
+        """Add suggestions; the file is written (once) and the combobox updated only if any is new."""
+        combo = self.category_combo if path == self.categories_file else self.tags_combo
+        items = set(self.root.tk.splitlist(combo["values"]))  # the combobox holds what the file holds
+        new = {it.strip() for it in new_items if it.strip()} - items
+        if not new:
+            return
+        items |= new
         with open(path, "w", encoding="utf-8") as f:
             for it in sorted(items):
                 f.write(it + "\n")
-        # refresh combobox values
-        if path == self.categories_file:
-            self.category_combo["values"] = self.load_suggestions(self.categories_file, DEFAULT_CATEGORIES)
-        elif path == self.tags_file:
-            self.tags_combo["values"] = self.load_suggestions(self.tags_file, DEFAULT_TAGS)
+        combo["values"] = sorted(items)
 
     def add_suggestion_popup(self, path, label):
         ans = simpledialog.askstring(f"Add {label}", f"Enter new {label}:", parent=self.root)
@@ -345,14 +345,13 @@ class NotesOrganizerApp:
         # delete from listbox highest->lowest to avoid index shift
         for i in reversed(sel):
             self.attach_listbox.delete(i)
-        # If a note is currently loaded in the editor and user wants changes applied immediately:
-        # we will update the in-memory note attachments (they will be saved on next Save).
+        # If a note is currently loaded in the editor, apply the removal to it immediately
         if self.currently_loaded_idx is not None and 0 <= self.currently_loaded_idx < len(self.notes):
-            # Rebuild attachments from listbox into the in-memory note
+            # Rebuild attachments from listbox and rewrite just that note's file
             new_attachments = [self.attach_listbox.get(i) for i in range(self.attach_listbox.size())]
-            self.notes[self.currently_loaded_idx]["attachments"] = new_attachments
-            # persist to file immediately
-            self.save_all_notes()
+            note_id = self.notes[self.currently_loaded_idx].id
+            content, _ = self.store.load_body(note_id)
+            self.store.save_body(note_id, content, new_attachments)
 
     def open_selected_attachment(self, event=None):
         sel = self.attach_listbox.curselection()
@@ -361,64 +360,42 @@ class NotesOrganizerApp:
         p = self.attach_listbox.get(sel[0])
         open_path(p)
 
-    # ----------------- Notes file format helpers -----------------
-    def build_note_line(self, note: dict) -> str:
-        title = encode_field(note.get("title",""))
-        category = encode_field(note.get("category",""))
-        tags = encode_field(note.get("tags",""))
-        content = encode_field(note.get("content",""))
-        attachments = encode_field(ATT_SEP.join(note.get("attachments",[])))
-        date = encode_field(note.get("date",""))
-        return FIELD_SEP.join([title, category, tags, content, attachments, date]) + "\n"
-
-    def parse_note_line(self, line: str) -> dict:
-        parts = line.rstrip("\n").split(FIELD_SEP)
-        while len(parts) < 6:
-            parts.append("")
-        title = decode_field(parts[0])
-        category = decode_field(parts[1])
-        tags = decode_field(parts[2])
-        content = decode_field(parts[3])
-        attachments_str = decode_field(parts[4])
-        date = decode_field(parts[5])
-        attachments = attachments_str.split(ATT_SEP) if attachments_str else []
-        return {"title": title, "category": category, "tags": tags, "content": content, "attachments": attachments, "date": date}
-
     # ----------------- Load / Save -----------------
     def reload_notes(self):
-        """Reload from user's notes file and refresh listbox (clears search/filter)."""
-        self.notes.clear()
+        """Reload note headers from the user's notes folder and refresh listbox (clears search/filter)."""
         ensure_dir(self.user_dir)
-        with open(self.notes_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        note = self.parse_note_line(line)
-                        self.notes.append(note)
-                    except Exception:
-                        continue
+        self.notes = self.store.load_headers()  # contents stay on disk until a note is opened
+        self.index.ensure(self.store.stamp(), self.store.load_all)
         # refresh suggestions combobox values
         self.category_combo["values"] = self.load_suggestions(self.categories_file, DEFAULT_CATEGORIES)
         self.tags_combo["values"] = self.load_suggestions(self.tags_file, DEFAULT_TAGS)
         self.show_all()
 
-    def save_all_notes(self):
-        ensure_dir(self.user_dir)
-        with open(self.notes_file, "w", encoding="utf-8") as f:
-            for note in self.notes:
-                f.write(self.build_note_line(note))
-
     # ----------------- UI Actions -----------------
     def show_all(self):
+        self._last_query = None  # notes may have changed: next search starts afresh
         self.filtered_indices = list(range(len(self.notes)))
         self.refresh_listbox()
+        self.status_label.config(text=f"{len(self.notes)} notes")
 
     def refresh_listbox(self):
-        self.notes_listbox.delete(0, tk.END)
+        """Bring the listbox in line with filtered_indices, touching only the rows that changed."""
+        rows = []
         for idx in self.filtered_indices:
             n = self.notes[idx]
-            display = f"{n['title']}  [{n['category']}] - {n.get('date','')}"
-            self.notes_listbox.insert(tk.END, display)
+            rows.append(f"{n.title}  [{n.category}] - {n.date}")
+        ops = difflib.SequenceMatcher(None, self._shown_rows, rows, autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in reversed(ops):  # back to front, so earlier positions stay valid
+            if tag in ("delete", "replace"):
+                self.notes_listbox.delete(i1, i2 - 1)
+            if tag in ("insert", "replace"):
+                self.notes_listbox.insert(i1, *rows[j1:j2])
+        self._shown_rows = rows
+
+    def refilter(self):
+        """Re-apply the current search after notes changed (only changed rows are redrawn)."""
+        self._last_query = None
+        self.search_notes()
 
     def new_note(self):
         self.title_entry.delete(0, tk.END)
@@ -445,24 +422,26 @@ class NotesOrganizerApp:
         sel = self.notes_listbox.curselection()
         if sel:
             listbox_i = sel[0]
-            if listbox_i < len(self.filtered_indices):
-                real_idx = self.filtered_indices[listbox_i]
-                self.notes[real_idx] = note
-                self.currently_loaded_idx = real_idx
+            if listbox_i >= len(self.filtered_indices):
+                return
+            real_idx = self.filtered_indices[listbox_i]
+            note["id"] = self.notes[real_idx].id
+            self.notes[real_idx] = self.store.save(note)  # writes only this note's file + one index row
+            self.currently_loaded_idx = real_idx
         else:
-            self.notes.append(note)
+            note["id"] = None  # the store assigns a new ID
+            self.notes.append(self.store.save(note))
             # set currently_loaded_idx to last appended
             self.currently_loaded_idx = len(self.notes) - 1
+        self.index.put(note, self.store.stamp())
 
-        # persist new category/tag suggestions if they are new
+        # persist new category/tag suggestions if they are new (one write per file at most)
         if category:
-            self.save_suggestion_line(self.categories_file, category)
+            self.save_suggestions(self.categories_file, [category])
         if tags:
-            for t in [tt.strip() for tt in tags.split(",") if tt.strip()]:
-                self.save_suggestion_line(self.tags_file, t)
+            self.save_suggestions(self.tags_file, tags.split(","))
 
-        self.save_all_notes()
-        self.reload_notes()
+        self.refilter()
         messagebox.showinfo("Saved", "Note saved successfully.", parent=self.root)
         self.new_note()
 
@@ -474,13 +453,16 @@ class NotesOrganizerApp:
         confirm = messagebox.askyesno("Confirm", f"Delete {len(sel)} selected note(s)?", parent=self.root)
         if not confirm:
             return
-        for listbox_i in reversed(sel):
+        deleted = []
+        for listbox_i in sorted(sel, key=lambda i: self.filtered_indices[i], reverse=True):
             real_idx = self.filtered_indices[listbox_i]
             # protect index range
             if 0 <= real_idx < len(self.notes):
+                deleted.append(self.notes[real_idx].id)
                 del self.notes[real_idx]
-        self.save_all_notes()
-        self.reload_notes()
+        self.store.delete(deleted)
+        self.index.remove(deleted, self.store.stamp())
+        self.refilter()
         self.new_note()
 
     def load_selected_note(self):
@@ -492,15 +474,16 @@ class NotesOrganizerApp:
         if not (0 <= real_idx < len(self.notes)):
             return
         note = self.notes[real_idx]
+        content, attachments = self.store.load_body(note.id)  # body read on selection (LRU-cached)
         # populate editor
         self.title_entry.delete(0, tk.END)
-        self.title_entry.insert(0, note["title"])
-        self.category_combo.set(note["category"])
-        self.tags_combo.set(note["tags"])
+        self.title_entry.insert(0, note.title)
+        self.category_combo.set(note.category)
+        self.tags_combo.set(note.tags)
         self.content_text.delete("1.0", tk.END)
-        self.content_text.insert("1.0", note["content"])
+        self.content_text.insert("1.0", content)
         self.attach_listbox.delete(0, tk.END)
-        for a in note.get("attachments", []):
+        for a in attachments:
             self.attach_listbox.insert(tk.END, a)
         self.currently_loaded_idx = real_idx
 
@@ -512,27 +495,36 @@ class NotesOrganizerApp:
         p = self.attach_listbox.get(sel[0])
         open_path(p)
 
+    def schedule_search(self, *args):
+        """Search once typing pauses for SEARCH_DELAY_MS instead of on every keystroke."""
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DELAY_MS, self.search_notes)
+
     def search_notes(self, event=None):
-        q = self.search_var.get().strip().lower()
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+            self._search_after = None
+        q = self.search_var.get().strip()
         # Ignore placeholder
         if q == self._placeholder_text:
             q = ""
-        self.filtered_indices = []
+        q = q.lower()
         if not q:
-            self.filtered_indices = list(range(len(self.notes)))
-        else:
-            for i, n in enumerate(self.notes):
-                combined = " ".join([
-                    n.get("title", ""),
-                    n.get("tags", ""),
-                    n.get("category", ""),
-                    n.get("content", "")
-                ]).lower()
-                if q in combined:
-                    self.filtered_indices.append(i)
-            if not self.filtered_indices:
-                messagebox.showerror("Not Found", f"No notes found for '{q}'", parent=self.root)
+            self.show_all()
+            return
+        # every word must match the start of a word in title, tags, category or content;
+        # a query that only extends the last one can only narrow its results
+        within = self._last_ids if self._last_query and q.startswith(self._last_query) else None
+        ids = self.index.search(q, within)
+        self._last_query, self._last_ids = q, set(ids)
+        position = {n.id: i for i, n in enumerate(self.notes)}
+        self.filtered_indices = [position[i] for i in ids if i in position]
         self.refresh_listbox()
+        if self.filtered_indices:
+            self.status_label.config(text=f"{len(self.filtered_indices)} of {len(self.notes)} notes")
+        else:
+            self.status_label.config(text=f"No notes match '{q}'")
 
 # ----------------- Run standalone -----------------
 if __name__ == "__main__":
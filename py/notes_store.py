@@ -0,0 +1,243 @@
+# File: notes_store.py
+"""
+Per-note storage for the notes organizer.
+
+    data/{user}/notes/
+        index.csv     one row per change: op (put/del), id, title, category, tags, date
+        {id}.txt      one note: number of attachments, one attachment per line, then the content
+
+Listing notes only reads index.csv (replayed into one NoteHeader per note,
+in the order notes were first saved); a note's content and attachments are
+read from its own file when it is opened, and the last BODY_CACHE_SIZE
+bodies opened are kept in memory. Saving or deleting a note writes
+that note's file and appends one row to index.csv, which is compacted once
+it holds more than twice as many rows as there are notes.
+
+Older notebooks (data/{user}/notes.txt, one "||"-separated line per note)
+are migrated on first use; the old file is kept as notes.txt.bak.
+"""
+import csv                                 # Import csv for the header index
+import os                                  # Import os for the note files
+from collections import OrderedDict        # Import OrderedDict for the LRU body cache
+
+HEADER_FIELDS = ["id", "title", "category", "tags", "date"]
+INDEX_FIELDS = ["op"] + HEADER_FIELDS
+COMPACT_SLACK = 50     # Extra index rows tolerated before compacting
+BODY_CACHE_SIZE = 32   # Note bodies kept in memory (least recently opened dropped first)
+
+# notes.txt format (migration only)
+FIELD_SEP = "||"        # separates fields in a single note line
+ATT_SEP = ";;"          # separates multiple attachments inside attachments field
+NL_TOKEN = "<NL>"       # replaces newline in content for single-line storage
+PIPE_TOKEN = "<PIPE>"   # escape for FIELD_SEP if user types it
+SEMI_TOKEN = "<SEMI>"   # escape for ATT_SEP if user types it
+
+
+def encode_field(s: str) -> str:
+    if s is None:
+        return ""
+    return s.replace(FIELD_SEP, PIPE_TOKEN).replace(ATT_SEP, SEMI_TOKEN).replace("\n", NL_TOKEN)
+
+
+def decode_field(s: str) -> str:
+    if s is None:
+        return ""
+    return s.replace(PIPE_TOKEN, FIELD_SEP).replace(SEMI_TOKEN, ATT_SEP).replace(NL_TOKEN, "\n")
+
+
+def parse_note_line(line: str) -> dict:
+    """A note dict from one notes.txt line (id None if the line has none)."""
+    parts = line.rstrip("\n").split(FIELD_SEP)
+    while len(parts) < 7:
+        parts.append("")
+    attachments_str = decode_field(parts[4])
+    return {
+        "id": int(parts[6]) if parts[6].isdigit() else None,
+        "title": decode_field(parts[0]),
+        "category": decode_field(parts[1]),
+        "tags": decode_field(parts[2]),
+        "content": decode_field(parts[3]),
+        "attachments": attachments_str.split(ATT_SEP) if attachments_str else [],
+        "date": decode_field(parts[5])
+    }
+
+
+class NoteHeader:
+    """The list-view fields of one note; slots keep thousands of them small."""
+
+    __slots__ = HEADER_FIELDS
+
+    def __init__(self, id, title="", category="", tags="", date=""):
+        self.id = id
+        self.title = title
+        self.category = category
+        self.tags = tags
+        self.date = date
+
+    def as_row(self, op="put"):
+        """index.csv row"""
+        return {"op": op, "id": self.id, "title": self.title, "category": self.category,
+                "tags": self.tags, "date": self.date}
+
+    def __repr__(self):
+        return f"NoteHeader({self.id!r}, {self.title!r})"
+
+
+def header_of(note):
+    """The header of a note dict (its content and attachments left out)."""
+    return NoteHeader(note["id"], note.get("title", ""), note.get("category", ""),
+                      note.get("tags", ""), note.get("date", ""))
+
+
+class NotesStore:
+    def __init__(self, user_dir):
+        self.user_dir = user_dir
+        self.notes_dir = os.path.join(user_dir, "notes")
+        self.index_file = os.path.join(self.notes_dir, "index.csv")
+        self.legacy_file = os.path.join(user_dir, "notes.txt")
+        self._headers = {}                 # id -> NoteHeader, in list order
+        self._bodies = OrderedDict()       # id -> (content, attachments), most recently used last
+        self._rows = 0                     # Rows in index.csv
+        self.next_id = 1
+
+    def note_file(self, note_id):
+        return os.path.join(self.notes_dir, f"{note_id}.txt")
+
+    # ---------------- Reading ----------------
+    def load_headers(self):
+        """Headers of every note (id, title, category, tags, date), in list order."""
+        if not os.path.exists(self.index_file):
+            self._migrate()
+        headers, rows = {}, 0
+        with open(self.index_file, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                rows += 1
+                try:
+                    note_id = int(row["id"])
+                except (TypeError, ValueError):
+                    continue               # Torn row
+                if row["op"] == "del":
+                    headers.pop(note_id, None)
+                else:
+                    headers[note_id] = NoteHeader(note_id, row["title"] or "", row["category"] or "",
+                                                  row["tags"] or "", row["date"] or "")  # An edit keeps the note's place
+        self._headers, self._rows = headers, rows
+        self._bodies.clear()
+        self.next_id = max(headers, default=0) + 1
+        return list(headers.values())
+
+    def load_body(self, note_id):
+        """(content, attachments) of one note, from the LRU cache when it was opened recently."""
+        body = self._bodies.get(note_id)
+        if body is not None:
+            self._bodies.move_to_end(note_id)
+        else:
+            body = self._read_body(note_id)
+            self._cache_body(note_id, body)
+        return body[0], list(body[1])
+
+    def _read_body(self, note_id):
+        try:
+            with open(self.note_file(note_id), "r", newline="", encoding="utf-8") as f:
+                count = int(f.readline() or 0)
+                attachments = [f.readline().rstrip("\n") for _ in range(count)]
+                return f.read(), attachments
+        except (FileNotFoundError, ValueError):
+            return "", []
+
+    def _cache_body(self, note_id, body):
+        self._bodies[note_id] = body
+        self._bodies.move_to_end(note_id)
+        while len(self._bodies) > BODY_CACHE_SIZE:
+            self._bodies.popitem(last=False)
+
+    def load_all(self):
+        """Every note with its content (reads every note file, bypassing the cache)."""
+        for header in self._headers.values():
+            content, attachments = self._read_body(header.id)
+            yield {"id": header.id, "title": header.title, "category": header.category,
+                   "tags": header.tags, "date": header.date, "content": content, "attachments": attachments}
+
+    def stamp(self):
+        """Changes whenever a note is saved or deleted."""
+        try:
+            st = os.stat(self.index_file)
+        except FileNotFoundError:
+            return "missing"
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    # ---------------- Writing ----------------
+    def save(self, note):
+        """Store one note (a new ID is assigned when its id is None); return its header."""
+        if note.get("id") is None:
+            note["id"] = self.next_id
+        self.next_id = max(self.next_id, note["id"] + 1)
+        self.save_body(note["id"], note.get("content", ""), note.get("attachments", []))
+        header = header_of(note)
+        self._headers[note["id"]] = header
+        self._append([header.as_row()])
+        return header
+
+    def save_body(self, note_id, content, attachments):
+        """Rewrite one note's file (its header is unchanged)."""
+        os.makedirs(self.notes_dir, exist_ok=True)
+        path = self.note_file(note_id)
+        with open(path + ".tmp", "w", newline="", encoding="utf-8") as f:
+            f.write(f"{len(attachments)}\n")
+            f.writelines(a.replace("\n", " ") + "\n" for a in attachments)
+            f.write(content)
+        os.replace(path + ".tmp", path)
+        self._cache_body(note_id, (content, list(attachments)))  # just saved: likely opened next
+
+    def delete(self, note_ids):
+        rows = []
+        for note_id in note_ids:
+            if self._headers.pop(note_id, None) is not None:
+                rows.append({"op": "del", "id": note_id})
+        self._append(rows)                 # Index first: a crash only leaves an unlisted file
+        for note_id in note_ids:
+            self._bodies.pop(note_id, None)
+            if os.path.exists(self.note_file(note_id)):
+                os.remove(self.note_file(note_id))
+
+    def _append(self, rows):
+        new_file = not os.path.exists(self.index_file)
+        with open(self.index_file, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+        self._rows += len(rows)
+        if self._rows > 2 * len(self._headers) + COMPACT_SLACK:
+            self._write_index()
+
+    def _write_index(self):
+        """Rewrite index.csv with one row per note."""
+        os.makedirs(self.notes_dir, exist_ok=True)
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(h.as_row() for h in self._headers.values())
+        os.replace(tmp, self.index_file)
+        self._rows = len(self._headers)
+
+    def _migrate(self):
+        """Split notes.txt into per-note files; index.csv is written last, so a crash just redoes it."""
+        self._headers = {}
+        notes = []
+        if os.path.exists(self.legacy_file):
+            with open(self.legacy_file, "r", encoding="utf-8") as f:
+                notes = [parse_note_line(line) for line in f if line.strip()]
+        taken = set()
+        next_id = max((n["id"] for n in notes if n["id"] is not None), default=0) + 1
+        for note in notes:
+            if note["id"] is None or note["id"] in taken:
+                note["id"] = next_id
+                next_id += 1
+            taken.add(note["id"])
+            self.save_body(note["id"], note["content"], note["attachments"])
+            self._headers[note["id"]] = header_of(note)
+        self._write_index()
+        if os.path.exists(self.legacy_file):
+            os.replace(self.legacy_file, self.legacy_file + ".bak")
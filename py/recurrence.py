@@ -0,0 +1,87 @@
+# File: recurrence.py
+"""
+Repeat rules for reminders.
+
+A repeating reminder is stored once, as a series: its "repeat" column holds
+the rule and its "datetime" the next occurrence. When an occurrence has
+rung, the same row moves on to the following one, so the file never grows
+and cancelling a series only clears its rule.
+
+Rule text (the "repeat" column):
+
+    None | Daily | Weekly | Weekdays | Every 3 days | Every 2 weeks
+    optionally followed by " until YYYY-MM-DD" (last day, inclusive)
+"""
+from collections import namedtuple         # Import namedtuple for parsed rules
+from datetime import datetime, timedelta   # Import datetime for occurrence arithmetic
+
+FREQUENCIES = ["Daily", "Weekdays", "Weekly", "Every N days", "Every N weeks"]  # Choices offered in the UI
+
+Rule = namedtuple("Rule", ["freq", "interval", "until"])  # freq: "daily" | "weekly" | "weekdays"
+
+
+def parse_rule(text):
+    """Rule for a repeat string, or None for "None"/empty/unknown text."""
+    text = (text or "").strip()
+    base, _, until_text = text.partition(" until ")
+    until = None
+    if until_text:
+        try:
+            until = datetime.strptime(until_text.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            return None
+    words = base.lower().split()
+    if words == ["daily"]:
+        return Rule("daily", 1, until)
+    if words == ["weekly"]:
+        return Rule("weekly", 1, until)
+    if words == ["weekdays"]:
+        return Rule("weekdays", 1, until)
+    if len(words) == 3 and words[0] == "every" and words[1].isdigit() and int(words[1]) > 0:
+        unit = words[2].rstrip("s")
+        if unit in ("day", "week"):
+            return Rule("daily" if unit == "day" else "weekly", int(words[1]), until)
+    return None
+
+
+def format_rule(freq, interval=1, until=None):
+    """Repeat string for a UI choice: format_rule("Every N days", 3) -> "Every 3 days"."""
+    if freq in ("Every N days", "Every N weeks"):
+        unit = "day" if freq == "Every N days" else "week"
+        interval = max(int(interval), 1)
+        text = f"Every {interval} {unit}{'s' if interval > 1 else ''}"
+    elif freq in ("Daily", "Weekly", "Weekdays"):
+        text = freq
+    else:
+        return "None"
+    if until:
+        text += f" until {until:%Y-%m-%d}" if not isinstance(until, str) else f" until {until}"
+    return text
+
+
+def _step(rule):
+    return timedelta(weeks=rule.interval) if rule.freq == "weekly" else timedelta(days=rule.interval)
+
+
+def occurrences(rule, start):
+    """Yield start and every following occurrence of the rule, lazily (ends at `until`)."""
+    step = _step(rule)
+    current = start
+    while rule.until is None or current.date() <= rule.until:
+        if rule.freq != "weekdays" or current.weekday() < 5:
+            yield current
+        current += step
+
+
+def next_occurrence(rule, start, after):
+    """First occurrence of the series starting at `start` later than `after` (None when it has ended)."""
+    if rule is None:
+        return None
+    if after > start:
+        # Jump straight to the last whole step (a week for weekdays) not after `after`
+        step = timedelta(weeks=1) if rule.freq == "weekdays" else _step(rule)
+        start += step * ((after - start) // step)
+    for when in occurrences(rule, start):
+        if when > after:
+            return when
+    return None
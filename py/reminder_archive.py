@@ -0,0 +1,110 @@
+# File: reminder_archive.py
+"""
+Monthly archives of reminders that have rung.
+
+Reminders marked "Rang" more than ARCHIVE_AFTER_DAYS ago are moved out of
+the user's live reminders into gzip-compressed CSV files, one per month of
+their due date:
+
+    data/archive/{user}_reminder_2026-01.csv.gz
+    data/archive/{user}_reminder_ids.txt      highest reminder ID ever archived
+
+Archives are only appended to (each append is its own gzip member, which
+gzip readers treat as one stream) and are read back lazily, newest month
+first, by the history view. New reminders get IDs above the archived ones
+(last_archived_id), so an ID in the history never means two reminders.
+"""
+import csv                                 # Import csv for the archive rows
+import gzip                                # Import gzip to compress the archives
+import os                                  # Import os for the archive folder
+from datetime import datetime, timedelta   # Import datetime to age reminders
+from storage import REMINDER_FIELDS        # Import reminder column layout
+
+ARCHIVE_DIR = os.path.join("data", "archive")  # Folder holding the archive files
+ARCHIVE_AFTER_DAYS = 7                     # Rang reminders older than this are archived
+DT_FORMAT = "%Y-%m-%d %I:%M %p"            # Format of the reminder "datetime" column
+
+
+def archive_path(user, month):
+    """Archive file of one user for one month ("YYYY-MM")."""
+    return os.path.join(ARCHIVE_DIR, f"{user}_reminder_{month}.csv.gz")
+
+
+def id_mark_path(user):
+    """File holding the highest reminder ID archived for this user."""
+    return os.path.join(ARCHIVE_DIR, f"{user}_reminder_ids.txt")
+
+
+def last_archived_id(user):
+    """Highest reminder ID ever archived for the user (-1 if none)."""
+    try:
+        with open(id_mark_path(user), "r", encoding="utf-8") as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        pass
+    # Archives written before the mark existed: scan them once and remember the result
+    highest = max((int(r["id"]) for r in iter_history(user) if str(r.get("id", "")).isdigit()), default=-1)
+    if highest >= 0:
+        _write_id_mark(user, highest)
+    return highest
+
+
+def _write_id_mark(user, highest):
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    tmp = id_mark_path(user) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(f"{highest}\n")
+    os.replace(tmp, id_mark_path(user))
+
+
+def split_expired(reminders, now=None, days=ARCHIVE_AFTER_DAYS):
+    """Return (keep, expired): expired are Rang reminders due more than `days` ago."""
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    keep, expired = [], []
+    for r in reminders:
+        try:
+            old = r["status"] == "Rang" and datetime.strptime(r["datetime"], DT_FORMAT) < cutoff
+        except ValueError:
+            old = False                    # Unreadable date: leave it where the user can see it
+        (expired if old else keep).append(r)
+    return keep, expired
+
+
+def archive(user, reminders):
+    """Append reminders to their monthly archive files."""
+    by_month = {}
+    for r in reminders:
+        month = datetime.strptime(r["datetime"], DT_FORMAT).strftime("%Y-%m")
+        by_month.setdefault(month, []).append(r)
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    highest = max(int(r["id"]) for r in reminders)
+    if highest > last_archived_id(user):
+        _write_id_mark(user, highest)      # Mark first: a crash can only leave it too high
+    for month, rows in by_month.items():
+        path = archive_path(user, month)
+        new_file = not os.path.exists(path)
+        with gzip.open(path, "at", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=REMINDER_FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+
+def archive_months(user):
+    """Months with an archive for this user, newest first."""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    prefix, suffix = f"{user}_reminder_", ".csv.gz"
+    return sorted(
+        (n[len(prefix):-len(suffix)] for n in os.listdir(ARCHIVE_DIR)
+         if n.startswith(prefix) and n.endswith(suffix)),
+        reverse=True
+    )
+
+
+def iter_history(user):
+    """Yield archived reminders one at a time, newest month first."""
+    for month in archive_months(user):
+        with gzip.open(archive_path(user, month), "rt", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))  # One month at a time
+        yield from reversed(rows)          # Newest first within the month too
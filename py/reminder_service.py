@@ -0,0 +1,274 @@
+# File: reminder_service.py
+"""
+One reminder service for the whole process.
+
+    from reminder_service import SERVICE, load_reminders, save_reminders
+
+Every window (reminder window, timetable) reads and writes reminders through
+it, so they all see the same in-memory copy with the repeat column intact.
+Writes go to storage on a single writer thread, one user at a time; several
+saves queued for the same user collapse into one write of the latest list.
+A write that fails is queued for the Tk thread, which reports it on the
+next timer wake-up or save; its list is kept, to be written with the user's
+next change (or at exit).
+
+A single Tk timer serves every subscribed user: due times sit in one
+min-heap and the timer sleeps until the earliest (at most MAX_SLEEP_MS).
+The same service ticks every reminder-window clock once per second.
+"""
+import atexit                              # Import atexit to flush pending writes on exit
+from tkinter import messagebox             # Import messagebox to report failed writes
+import copy                                # Import copy so callers never share the cache
+import heapq                               # Import heapq for the due-time heap
+import queue                               # Import queue for the writer thread
+import threading                           # Import threading for the writer and the cache lock
+import time                                # Import time to format the clock
+from datetime import datetime, timedelta   # Import datetime for due times
+from storage import get_backend            # Import storage backend (CSV files or SQLite)
+from reminder_archive import split_expired, archive  # Import rotation of old rang reminders
+
+DT_FORMAT = "%Y-%m-%d %I:%M %p"            # Format of the reminder "datetime" column
+MAX_SLEEP_MS = 60 * 1000                   # Re-check at least once a minute (clock changes, laptop sleep)
+CATCH_UP_AFTER = timedelta(minutes=1)      # Due longer ago than this counts as a missed reminder
+
+
+class ReminderService:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._cache = {}                   # user -> list of reminder dicts (the live copy)
+        self._pending = {}                 # user -> latest list waiting for the writer
+        self._writes = queue.Queue()       # users with a pending write, in order
+        self._writer = None
+        self._failed = set()               # users whose pending list failed to write (not queued)
+        self._errors = queue.Queue()       # (user, exception) of failed writes, reported on the Tk thread
+        self.on_save_error = _show_save_error  # Called on the Tk thread as on_save_error(root or None, user, error)
+
+        self._heap = []                    # (due, order, user, reminder) of subscribed users
+        self._order = 0
+        self._subscribers = {}             # user -> [on_due callback, ...]
+        self._roots = []                   # Tk widgets usable for after()
+        self._clocks = []                  # Clock labels ticked every second
+        self._after = None                 # (widget, after id) of the reminder timer
+        self._tick_after = None            # (widget, after id) of the clock timer
+
+    # ---------------- Cache + writer ----------------
+    def load(self, user):
+        """The user's reminders (a copy; change it and pass it to save())."""
+        with self._lock:
+            if user not in self._cache:
+                self._cache[user] = get_backend().load_reminders(user)
+                self.settle(user)
+                self.rotate(user)
+            return copy.deepcopy(self._cache[user])
+
+    def rotate(self, user):
+        """Move the user's long-finished (Rang) reminders into the monthly archives."""
+        with self._lock:
+            keep, expired = split_expired(self._cache.get(user, []))
+            if not expired:
+                return 0
+            archive(user, expired)         # Archive first: a crash can only duplicate history
+            self.save(user, keep)
+            return len(expired)
+
+    def settle(self, user):
+        """
+        Put the user's reminders left "Ringing" or "Missed" back to Pending: their
+        alert was never closed (window gone, program ended), so they are caught
+        up as missed the next time the user's reminders are watched.
+        """
+        with self._lock:
+            reminders = self._cache.get(user, [])
+            stuck = [r for r in reminders if r["status"] in ("Ringing", "Missed")]
+            if not stuck:
+                return 0
+            for r in stuck:
+                r["status"] = "Pending"
+            self.save(user, reminders)
+            return len(stuck)
+
+    def save(self, user, reminders):
+        """Replace the user's reminders; storage is written in the background."""
+        self.report_errors()               # Earlier failed writes, before this change is queued
+        snapshot = copy.deepcopy(list(reminders))
+        with self._lock:
+            self._cache[user] = snapshot
+            queued = user in self._pending and user not in self._failed
+            self._pending[user] = snapshot
+            if not queued:
+                self._failed.discard(user)     # Retried with this newer list
+                self._start_writer()
+                self._writes.put(user)
+        if user in self._subscribers:
+            self._reschedule(user)
+
+    def flush(self):
+        """Wait until every queued write has reached storage (failed writes are tried once more)."""
+        with self._lock:
+            for user in self._failed:
+                self._writes.put(user)
+            self._failed.clear()
+        if self._writer is not None:
+            self._writes.join()
+
+    def _start_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="reminder-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            user = self._writes.get()
+            try:
+                with self._lock:
+                    reminders = self._pending.pop(user, None)
+                if reminders is not None:
+                    get_backend().save_reminders(user, reminders)
+            except Exception as e:
+                with self._lock:
+                    if user not in self._pending:  # Unless a newer list is already queued, keep this one
+                        self._pending[user] = reminders
+                        self._failed.add(user)
+                self._errors.put((user, e))    # No Tk calls here: the Tk thread picks it up
+            finally:
+                self._writes.task_done()
+
+    def report_errors(self):
+        """Show the writes that failed since the last call (Tk thread only)."""
+        while True:
+            try:
+                user, error = self._errors.get_nowait()
+            except queue.Empty:
+                return
+            self.on_save_error(self._live_root(), user, error)
+
+    # ---------------- Subscriptions ----------------
+    def subscribe(self, root, user, on_due):
+        """
+        Call on_due([(reminder, missed), ...]) on the Tk thread when the user's
+        reminders fall due. With several windows per user only the first is called.
+        """
+        self._roots.append(root)
+        self._subscribers.setdefault(user, []).append(on_due)
+        self._reschedule(user)
+
+    def unsubscribe(self, root, user, on_due):
+        if root in self._roots:
+            self._roots.remove(root)
+        callbacks = self._subscribers.get(user, [])
+        if on_due in callbacks:
+            callbacks.remove(on_due)
+        if not callbacks:
+            self._subscribers.pop(user, None)
+            self._heap = [item for item in self._heap if item[2] != user]
+            heapq.heapify(self._heap)
+            self.settle(user)              # No window left to dismiss its alerts
+        # Timers started on this window die with it: move them to a window still open
+        self._arm()
+        if self._tick_after is not None and self._tick_after[0] is root:
+            self._tick()
+
+    def add_clock(self, label):
+        """Show the time on `label`, updated with every other clock once per second."""
+        self._clocks.append(label)
+        self._update_clock_label(label)
+        if self._tick_after is None:
+            self._tick()
+
+    # ---------------- Timer ----------------
+    def _live_root(self):
+        self._roots = [r for r in self._roots if _exists(r)]
+        return self._roots[0] if self._roots else None
+
+    def _reschedule(self, user):
+        """Replace the user's heap entries with their Pending reminders and re-arm."""
+        heap = [item for item in self._heap if item[2] != user]
+        for e in self._cache.get(user) or self.load(user):
+            if e["status"] != "Pending":
+                continue
+            try:
+                due = datetime.strptime(e["datetime"], DT_FORMAT)
+            except ValueError:
+                continue                   # Unreadable date: never due
+            self._order += 1
+            heap.append((due, self._order, user, dict(e)))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._arm()
+
+    def _arm(self):
+        """Cancel the pending timer and sleep until the next due reminder."""
+        _cancel(self._after)
+        self._after = None
+        root = self._live_root()
+        if root is None:
+            return
+        # Nothing due: still wake up now and then to report failed writes
+        delay = (self._heap[0][0] - datetime.now()).total_seconds() * 1000 if self._heap else MAX_SLEEP_MS
+        self._after = (root, root.after(int(min(max(delay, 0), MAX_SLEEP_MS)), self._wake))
+
+    def _wake(self):
+        self._after = None
+        now = datetime.now()
+        due = {}
+        while self._heap and self._heap[0][0] <= now:
+            when, _, user, e = heapq.heappop(self._heap)
+            due.setdefault(user, []).append((e, now - when >= CATCH_UP_AFTER))
+        self._arm()
+        self.report_errors()
+        for user, items in due.items():
+            callbacks = self._subscribers.get(user)
+            if callbacks:
+                callbacks[0](items)
+
+    def _tick(self):
+        _cancel(self._tick_after)
+        self._tick_after = None
+        root = self._live_root()
+        self._clocks = [label for label in self._clocks if _exists(label)]
+        if root is None or not self._clocks:
+            return
+        for label in self._clocks:
+            self._update_clock_label(label)
+        self._tick_after = (root, root.after(1000, self._tick))
+
+    @staticmethod
+    def _update_clock_label(label):
+        label.config(text=time.strftime("%I:%M:%S %p"))  # Current time in HH:MM:SS AM/PM format
+
+
+def _show_save_error(root, user, error):
+    options = {"parent": root} if root is not None else {}
+    messagebox.showerror("Save Failed", f"Could not save the reminders of {user}:\n{error}\n\n"
+                         "Your changes are kept and will be saved again with your next change.", **options)
+
+
+def _cancel(timer):
+    """Cancel a (widget, after id) timer if its widget is still around."""
+    if timer is not None and _exists(timer[0]):
+        try:
+            timer[0].after_cancel(timer[1])
+        except Exception:
+            pass
+
+
+def _exists(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False                       # Tk interpreter already gone
+
+
+# Shared service used by every window
+SERVICE = ReminderService()
+atexit.register(SERVICE.flush)
+
+
+def load_reminders(user):
+    """Load reminders for a given user (shared in-memory copy, see ReminderService)"""
+    return SERVICE.load(user)
+
+
+def save_reminders(user, reminders):
+    """Save all reminders of a user (written to storage by the service's writer thread)"""
+    SERVICE.save(user, reminders)
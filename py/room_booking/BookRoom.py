@@ -2,33 +2,17 @@
 import datetime as dt
 import tkinter as tk
 from tkinter import ttk, messagebox
-import os
-import csv
+from storage import get_backend, LEGACY_STUDENT_ID
+from user_directory import USERS
 from .rooms_data import ROOMS
-
-# Path to CSV files for storing bookings and user accounts
-BOOKINGS_FILE = os.path.join("data", "bookings.csv")
-USERS_FILE = os.path.join("data", "users.txt")
+from .booking_store import BOOKINGS, to_minutes
 
 
 # ---------------- Student Data ----------------
-def load_students():
-    """Load student data {id: USERNAME} from users.txt"""
-    if not os.path.exists(USERS_FILE):
-        return {}
-    students = {}
-    with open(USERS_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            parts = line.strip().split(",")
-            if len(parts) == 3:  # Format: student_id, username, password
-                sid = parts[0].strip()
-                username = parts[1].strip().upper()  # Store username in uppercase
-                students[sid] = username
-    return students
-
-
-# Dictionary of students loaded at startup
-STUDENTS = load_students()
+def student_name(sid):
+    """USERNAME registered under a student ID, or None"""
+    user = USERS.by_id(sid)
+    return user.username.upper() if user else None
 
 
 # ---------------- Helpers ----------------
@@ -130,11 +114,10 @@ def build_page(parent, selected_venue=None, current_user=None, back_callback=Non
 
     # Booking owner info
     owner_id, owner_name = None, None
-    for sid, uname in STUDENTS.items():
-        if uname.lower() == str(current_user).lower():
-            owner_id, owner_name = sid, uname.upper()
-            break
-    if not owner_id:
+    owner = USERS.find(str(current_user))
+    if owner and owner.student_id != LEGACY_STUDENT_ID:
+        owner_id, owner_name = owner.student_id, owner.username.upper()
+    else:
         owner_id, owner_name = "N/A", str(current_user).upper()
 
     own_frame = tk.LabelFrame(card, text="👤 Booking Owner", font=("Segoe UI", 11, "bold"), bg="white", fg="#2c3e50", padx=15, pady=10)
@@ -286,31 +269,26 @@ def confirm_booking(venue_var, room_var, date_var, start_var, end_var,
             messagebox.showerror("Error", "You cannot book a time that has already passed today.")
             return
 
-    # --- Availability check ---
-    for b in fetch_bookings():
-        if b["date"] == date_var.get():
-            b_start = dt.datetime.strptime(b["start"], "%I:%M %p").time()
-            b_end = dt.datetime.strptime(b["end"], "%I:%M %p").time()
-
-            new_start = dt.datetime.strptime(start_var.get(), "%I:%M %p").time()
-            new_end = dt.datetime.strptime(end_var.get(), "%I:%M %p").time()
-
-            # Check for overlap
-            if not (new_end <= b_start or new_start >= b_end):
-                # Owner double booking
-                if b["owner_id"] == owner_id:
-                    messagebox.showerror(
-                        "Error",
-                        f"You already have a booking in this time slot!\n\n"
-                    )
-                    return
-                # Room occupied by another booking
-                if b["venue"] == venue_var.get() and b["room"] == room_var.get():
-                    messagebox.showerror(
-                        "Error",
-                        f"This time slot is already booked for the selected room!\n\n"
-                    )
-                    return
+    # --- Availability check (interval index for this room and this owner) ---
+    conflict = BOOKINGS.find_conflict(
+        venue_var.get(), room_var.get(), date_var.get(), owner_id,
+        to_minutes(start_var.get()), to_minutes(end_var.get())
+    )
+    if conflict:
+        kind, _ = conflict
+        # Owner double booking
+        if kind == "owner":
+            messagebox.showerror(
+                "Error",
+                f"You already have a booking in this time slot!\n\n"
+            )
+            return
+        # Room occupied by another booking
+        messagebox.showerror(
+            "Error",
+            f"This time slot is already booked for the selected room!\n\n"
+        )
+        return
 
     # --- Members validation ---
     required = int(pax_var.get()) - 1
@@ -325,7 +303,7 @@ def confirm_booking(venue_var, room_var, date_var, start_var, end_var,
         if sid == owner_id:
             messagebox.showerror("Error", f"Row {i}: Owner cannot be added again.")
             return
-        expected_name = STUDENTS.get(sid)
+        expected_name = student_name(sid)
         if expected_name is None or expected_name != sname:
             messagebox.showerror("Error", f"Row {i}: Invalid student info ({sid} / {sname}).")
             return
@@ -364,47 +342,23 @@ def confirm_booking(venue_var, room_var, date_var, start_var, end_var,
     )
 
 
-# ---------------- CSV ----------------
+# ---------------- Storage ----------------
 def init_db():
-    """Initialize bookings.csv with headers if not exists"""
-    if not os.path.exists(BOOKINGS_FILE):
-        with open(BOOKINGS_FILE, "w", newline="", encoding="utf-8") as f:
-            fieldnames = [
-                "venue", "room", "date", "start", "end", "pax",
-                "owner_id", "owner_name", "members"
-            ]
-            csv.DictWriter(f, fieldnames=fieldnames).writeheader()
+    """Initialize booking storage if it does not exist yet"""
+    get_backend().init_bookings()
 
 
 def save_booking(data: dict):
-    """Append a booking record to bookings.csv"""
+    """Append a booking record to booking storage"""
     init_db()
-    with open(BOOKINGS_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "venue", "room", "date", "start", "end", "pax",
-            "owner_id", "owner_name", "members"
-        ])
-        writer.writerow(data)
+    BOOKINGS.append(data)
 
 
 def fetch_bookings():
     """Fetch all bookings as a list of dictionaries"""
-    if not os.path.exists(BOOKINGS_FILE):
-        return []
-    with open(BOOKINGS_FILE, "r", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+    return BOOKINGS.all()
 
 
 def fetch_upcoming_bookings():
     """Return only bookings from today onwards"""
-    all_bookings = fetch_bookings()
-    today = dt.date.today()
-    upcoming = []
-    for b in all_bookings:
-        try:
-            b_date = dt.datetime.strptime(b["date"], "%Y-%m-%d").date()
-            if b_date >= today:
-                upcoming.append(b)
-        except Exception:
-            continue
-    return upcoming
+    return BOOKINGS.from_date(dt.date.today().strftime("%Y-%m-%d"))
@@ -2,17 +2,12 @@
 
 import tkinter as tk                      # Import tkinter for GUI components
 from tkinter import ttk                   # Import ttk for themed (modern) widgets
-import os, csv                            # Import os for file paths, csv for reading/writing CSV files
-from .helpers import user_in_booking      # Import helper function to check if user is involved in a booking
+from .booking_store import CANCELLED     # Import shared indexed store for cancelled bookings
 
-# File path for storing cancelled bookings
-CANCELLED_FILE = os.path.join("data", "cancelled_bookings.csv")
-
-def fetch_cancelled_bookings():  # Function to load cancelled bookings from CSV
-    if not os.path.exists(CANCELLED_FILE):  # If file does not exist, return empty list
-        return []
-    with open(CANCELLED_FILE, "r", encoding="utf-8") as f:  # Open cancelled bookings file
-        return list(csv.DictReader(f))  # Read rows into list of dictionaries
+def fetch_cancelled_bookings(current_user=None):  # Function to load cancelled bookings (all, or one user's)
+    if current_user is None:                # No user given -> every cancelled booking
+        return CANCELLED.all()
+    return CANCELLED.for_user(current_user)  # Only cancelled bookings involving the user
 
 def build_page(parent, current_user, back_callback=None):  # Function to build cancelled bookings page
     for w in parent.winfo_children():  # Clear all existing widgets from parent
@@ -53,7 +48,7 @@ def build_page(parent, current_user, back_callback=None):  # Function to build c
 
     # ===== Data =====
     # Filter cancelled bookings to only include ones involving current_user
-    bookings = [b for b in fetch_cancelled_bookings() if user_in_booking(b, current_user)]
+    bookings = fetch_cancelled_bookings(current_user)
 
     # If user has no cancelled bookings, show message and return
     if not bookings:
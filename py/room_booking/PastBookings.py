@@ -2,17 +2,13 @@
 
 import tkinter as tk                        # Import tkinter for GUI components
 from tkinter import ttk                     # Import ttk for themed widgets
-import os, csv, datetime as dt              # Import os (file handling), csv (read/write), datetime (time operations)
-from .helpers import user_in_booking        # Import helper function to check if user is in a booking
+import datetime as dt                       # Import datetime (time operations)
+from .booking_store import BOOKINGS         # Import shared indexed booking store
 
-# File path for all bookings (not only past)
-BOOKINGS_FILE = os.path.join("data", "bookings.csv")
-
-def fetch_past_bookings():  # Function to load all bookings from CSV file
-    if not os.path.exists(BOOKINGS_FILE):   # If file not found, return empty list
-        return []
-    with open(BOOKINGS_FILE, "r", encoding="utf-8") as f:  # Open bookings file
-        return list(csv.DictReader(f))  # Return list of booking dictionaries
+def fetch_past_bookings(current_user=None):  # Function to load bookings (all, or one user's)
+    if current_user is None:                # No user given -> every booking
+        return BOOKINGS.all()
+    return BOOKINGS.for_user(current_user)  # Only bookings the user owns or joins
 
 def build_page(parent, current_user, back_callback=None):  # Function to build "Past Bookings" page
     for w in parent.winfo_children():      # Remove all widgets in parent frame
@@ -49,9 +45,7 @@ def build_page(parent, current_user, back_callback=None):  # Function to build "
 
     # ===== Data =====
     bookings = []                                    # List to store valid past bookings
-    for b in fetch_past_bookings():                  # Loop through all bookings
-        if not user_in_booking(b, current_user):     # Skip if current_user not in booking
-            continue
+    for b in fetch_past_bookings(current_user):      # Loop through this user's bookings
         b_date = dt.datetime.strptime(b["date"], "%Y-%m-%d").date()  # Parse booking date
         b_end = dt.datetime.strptime(b["end"], "%I:%M %p").time()    # Parse booking end time
         # Booking is in the past if: date < today OR (same date but already ended)
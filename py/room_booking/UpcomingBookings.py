@@ -2,45 +2,15 @@
 
 import tkinter as tk                                # Import tkinter for GUI
 from tkinter import ttk, messagebox                 # Import ttk for modern widgets, messagebox for dialogs
-import os, csv, datetime as dt                      # Import os (file paths), csv (read/write), datetime (time handling)
-from .BookRoom import fetch_upcoming_bookings       # Import function to fetch upcoming bookings
-from .helpers import user_in_booking                # Import helper to check if user is in a booking
-
-# File paths
-BOOKINGS_FILE = os.path.join("data", "bookings.csv")        # Path for active bookings
-CANCELLED_FILE = os.path.join("data", "cancelled_bookings.csv")  # Path for cancelled bookings
+import datetime as dt                               # Import datetime (time handling)
+from .booking_store import BOOKINGS                 # Import shared indexed booking store
 
 
 def move_to_cancelled(booking: dict):  # Function to move booking from active list to cancelled list
-    """Move booking to cancelled file and remove from active bookings"""
-    if not os.path.exists(CANCELLED_FILE):  # If cancelled file doesn’t exist, create it with headers
-        with open(CANCELLED_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=booking.keys())  # Use same fields as booking dict
-            writer.writeheader()
-
-    # Append this booking into cancelled file
-    with open(CANCELLED_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=booking.keys())
-        writer.writerow(booking)
-
-    # Remove booking from active bookings file
-    if os.path.exists(BOOKINGS_FILE):
-        with open(BOOKINGS_FILE, "r", encoding="utf-8") as f:  # Read all current bookings
-            rows = list(csv.DictReader(f))
-        # Keep only those bookings that are not the cancelled one
-        rows = [r for r in rows if not (
-            r["venue"] == booking["venue"]
-            and r["room"] == booking["room"]
-            and r["date"] == booking["date"]
-            and r["start"] == booking["start"]
-            and r["end"] == booking["end"]
-            and r["owner_id"] == booking["owner_id"]
-        )]
-        # Write remaining bookings back to file
-        with open(BOOKINGS_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=booking.keys())
-            writer.writeheader()
-            writer.writerows(rows)
+    """Move booking to cancelled bookings and remove it from active bookings"""
+    # One append to the cancellation journal; bookings.csv is only rewritten
+    # by the store's background compaction
+    BOOKINGS.cancel(booking)
 
 
 def build_page(parent, current_user, back_callback=None):  # Function to build Upcoming Bookings page
@@ -88,9 +58,7 @@ def build_page(parent, current_user, back_callback=None):  # Function to build U
 
     # ===== Data =====
     bookings = []  # List of upcoming bookings
-    for b in fetch_upcoming_bookings():  # Get all upcoming bookings
-        if not user_in_booking(b, current_user):  # Skip if current_user not in booking
-            continue
+    for b in BOOKINGS.for_user(current_user):  # Get only this user's bookings
         b_date = dt.datetime.strptime(b["date"], "%Y-%m-%d").date()  # Parse booking date
         b_end = dt.datetime.strptime(b["end"], "%I:%M %p").time()    # Parse booking end time
         # Booking is upcoming if: date > today OR (today but end time still in future)
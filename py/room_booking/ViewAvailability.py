@@ -3,11 +3,8 @@
 import tkinter as tk                  # Import tkinter for GUI
 from tkinter import ttk               # Import ttk for modern themed widgets
 import datetime as dt                 # Import datetime for date/time handling
-import csv                            # Import csv for reading/writing booking files
-import os                             # Import os for file path handling
 from .rooms_data import ROOMS         # Import predefined rooms data dictionary
-
-BOOKINGS_FILE = os.path.join("data", "bookings.csv")  # Path to active bookings file
+from .booking_store import BOOKINGS   # Import shared indexed booking store
 
 
 # ---------------- Helpers ----------------
@@ -27,13 +24,41 @@ def generate_times(start_hour=8, end_hour=21, step=30):  # Generate time slots (
 
 DATES = get_next_5_days()  # Preload next 5 days
 TIMES = generate_times()   # Preload time slots from 8:00–21:00
+SLOT_ENDS = [dt.datetime.strptime(t, "%I:%M %p").time() for t in TIMES[1:]]  # Parsed once: end time of each slot
+
+# How the grid is drawn: "canvas" (one canvas, recoloured in place) or "widgets" (one widget per cell)
+GRID_RENDERER = "canvas"
+
+# Cell sizes for the canvas renderer (pixels)
+TIME_COL_W, ROOM_COL_W, HEADER_H, ROW_H = 130, 150, 44, 24
+
+
+def fetch_bookings():  # Load all bookings (served from the shared store)
+    return BOOKINGS.all()  # Return list of booking dictionaries
+
+
+def slot_colors(selected_venue, rooms, chosen_date):  # Colour of every cell: [slot][room]
+    today_str = dt.date.today().strftime("%Y-%m-%d")     # Today's date string
+    now_time = dt.datetime.now().time()                  # Current time
+    occupied = BOOKINGS.occupancy(selected_venue, chosen_date)  # Cached bitmap from the store
+
+    colors = []
+    for i, end_time in enumerate(SLOT_ENDS):
+        row = []
+        for r in rooms:
+            color = "green"  # Default: available
+
+            # 1. Check if booked (bit i of this room's bitmap)
+            if occupied.get(r["name"], 0) >> i & 1:
+                color = "blue"  # Booked
 
+            # 2. Past time check (only if today, not booked yet)
+            elif chosen_date == today_str and end_time <= now_time:
+                color = "gray"  # Past
 
-def fetch_bookings():  # Load all bookings from file
-    if not os.path.exists(BOOKINGS_FILE):
-        return []
-    with open(BOOKINGS_FILE, "r", encoding="utf-8") as f:
-        return list(csv.DictReader(f))  # Return list of booking dictionaries
+            row.append(color)
+        colors.append(row)
+    return colors
 
 
 # ---------------- Show Room Detail ----------------
@@ -93,7 +118,7 @@ def show_room_detail(room):  # Pop-up window with detailed info about a room
 
 
 # ---------------- UI ----------------
-def build_page(parent, selected_venue=None, back_callback=None):  # Build availability page
+def build_page(parent, selected_venue=None, back_callback=None, renderer=None):  # Build availability page
     for w in parent.winfo_children():  # Clear parent frame
         w.destroy()
 
@@ -108,7 +133,6 @@ def build_page(parent, selected_venue=None, back_callback=None):  # Build availa
         background="white"
     ).pack(pady=10)
 
-    bookings = fetch_bookings()               # Load all bookings
     rooms = ROOMS.get(selected_venue, [])     # Get rooms for this venue
 
     # ---------------- Date Selector ----------------
@@ -158,14 +182,12 @@ def build_page(parent, selected_venue=None, back_callback=None):  # Build availa
     canvas.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
 
-    # ---------------- Draw Grid ----------------
+    # ---------------- Draw Grid (one widget per cell) ----------------
     def draw_grid():  # Function to draw availability table
         for w in scroll_frame.winfo_children():  # Clear old grid
             w.destroy()
 
-        chosen_date = date_var.get()                         # Selected date
-        today_str = dt.date.today().strftime("%Y-%m-%d")     # Today's date string
-        now_time = dt.datetime.now().time()                  # Current time
+        colors = slot_colors(selected_venue, rooms, date_var.get())  # Cell colours for this date
 
         # Header row
         tk.Label(scroll_frame, text="Time", font=("Segoe UI", 10, "bold"), width=16).grid(row=0, column=0, padx=1, pady=1)
@@ -182,42 +204,66 @@ def build_page(parent, selected_venue=None, back_callback=None):  # Build availa
 
         # Time slots grid
         for i in range(len(TIMES) - 1):
-            start = TIMES[i]
-            end = TIMES[i + 1]
-            label = f"{start} - {end}"  # Example: 9:00 AM – 9:30 AM
-
+            label = f"{TIMES[i]} - {TIMES[i + 1]}"  # Example: 9:00 AM – 9:30 AM
             tk.Label(scroll_frame, text=label, width=16, anchor="w").grid(row=i+1, column=0, padx=1, pady=1)
 
-            start_time = dt.datetime.strptime(start, "%I:%M %p").time()
-            end_time = dt.datetime.strptime(end, "%I:%M %p").time()
-
-            for j, r in enumerate(rooms, start=1):
-                color = "green"  # Default: available
-
-                # 1. Check if booked (overlap with booking interval)
-                for b in bookings:
-                    if (
-                        b["venue"] == selected_venue
-                        and b["room"] == r["name"]
-                        and b["date"] == chosen_date
-                    ):
-                        b_start = dt.datetime.strptime(b["start"], "%I:%M %p").time()
-                        b_end = dt.datetime.strptime(b["end"], "%I:%M %p").time()
-
-                        # Overlap check
-                        if not (end_time <= b_start or start_time >= b_end):
-                            color = "blue"  # Booked
-                            break
-
-                # 2. Past time check (only if today, not booked yet)
-                if color == "green" and chosen_date == today_str and end_time <= now_time:
-                    color = "gray"  # Past
-
+            for j, color in enumerate(colors[i], start=1):
                 # Draw block
                 block = tk.Canvas(scroll_frame, width=100, height=20, highlightthickness=0)
                 block.grid(row=i+1, column=j, padx=1, pady=1)
                 block.create_rectangle(0, 0, 100, 20, fill=color, outline="black")
 
+    # ---------------- Draw Grid (single canvas) ----------------
+    cells = []  # Rectangle item IDs: cells[slot][room]
+    shown = []  # Colour currently shown in each cell
+
+    def build_canvas_grid():  # Create every item once; dates only recolour them
+        grid = tk.Canvas(
+            scroll_frame, bg="white", highlightthickness=0,
+            width=TIME_COL_W + ROOM_COL_W * len(rooms) + 2,
+            height=HEADER_H + ROW_H * (len(TIMES) - 1) + 2
+        )
+        grid.pack()
+
+        # Header row (room names open the detail popup)
+        grid.create_text(TIME_COL_W / 2, HEADER_H / 2, text="Time", font=("Segoe UI", 10, "bold"))
+        for j, r in enumerate(rooms):
+            x0 = TIME_COL_W + j * ROOM_COL_W
+            tag = f"room{j}"
+            grid.create_rectangle(x0 + 1, 1, x0 + ROOM_COL_W - 1, HEADER_H - 1,
+                                  fill="#f0f0f0", outline="#bdc3c7", tags=tag)
+            grid.create_text(x0 + ROOM_COL_W / 2, HEADER_H / 2, text=r["name"], width=ROOM_COL_W - 10,
+                             font=("Segoe UI", 10, "bold"), justify="center", tags=tag)
+            grid.tag_bind(tag, "<Button-1>", lambda e, room=r: show_room_detail(room))
+            grid.tag_bind(tag, "<Enter>", lambda e: grid.config(cursor="hand2"))
+            grid.tag_bind(tag, "<Leave>", lambda e: grid.config(cursor=""))
+
+        # Time labels + one rectangle per slot per room
+        for i in range(len(TIMES) - 1):
+            y0 = HEADER_H + i * ROW_H
+            grid.create_text(6, y0 + ROW_H / 2, text=f"{TIMES[i]} - {TIMES[i + 1]}", anchor="w")
+            row = []
+            for j in range(len(rooms)):
+                x0 = TIME_COL_W + j * ROOM_COL_W
+                row.append(grid.create_rectangle(x0 + 2, y0 + 2, x0 + ROOM_COL_W - 2, y0 + ROW_H - 2,
+                                                 fill="", outline="black"))
+            cells.append(row)
+            shown.append([""] * len(rooms))
+        return grid
+
+    def recolor_grid():  # Update fills in place, touching only cells that changed
+        colors = slot_colors(selected_venue, rooms, date_var.get())
+        for i, row in enumerate(colors):
+            for j, color in enumerate(row):
+                if shown[i][j] != color:
+                    grid_canvas.itemconfigure(cells[i][j], fill=color)
+                    shown[i][j] = color
+
     # Re-draw grid whenever date changes
-    date_var.trace_add("write", lambda *_: draw_grid())
-    draw_grid()  # Initial draw
+    if (renderer or GRID_RENDERER) == "canvas":
+        grid_canvas = build_canvas_grid()
+        date_var.trace_add("write", lambda *_: recolor_grid())
+        recolor_grid()  # Initial colours
+    else:
+        date_var.trace_add("write", lambda *_: draw_grid())
+        draw_grid()  # Initial draw
@@ -0,0 +1,361 @@
+# File: room_booking/booking_store.py
+
+import bisect                              # Import bisect for sorted interval search
+import functools                           # Import functools for the locking decorator
+import threading                           # Import threading for the lock and background compaction
+from collections import defaultdict        # Import defaultdict for index buckets
+from storage import get_backend, BOOKING_FIELDS, same_booking  # Import pluggable storage backend
+
+FIELDNAMES = BOOKING_FIELDS  # Booking columns, in file order
+
+# Bookable day used by the availability grid: 26 half-hour slots, 8:00 AM – 9:00 PM
+SLOT_START = 8 * 60   # Minutes after midnight of slot 0
+SLOT_MINUTES = 30     # Length of one slot
+SLOT_COUNT = 26       # Number of slots per room per day
+
+
+# ---------------- Helpers ----------------
+def split_members(members: str):
+    """Yield (student_id, name) pairs from a 'ID|NAME; ID|NAME' members string."""
+    for m in (members or "").split(";"):
+        m = m.strip()
+        if not m:
+            continue
+        sid, _, name = m.partition("|")
+        yield sid.strip(), name.strip()
+
+
+def slot_key(b: dict):
+    """Index key for one room on one day."""
+    return (b.get("venue", ""), b.get("room", ""), b.get("date", ""))
+
+
+def _locked(method):
+    """Run a store method while holding the store's lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def to_minutes(t: str) -> int:
+    """Convert a '9:30 AM' style time to minutes after midnight (no strptime)."""
+    hm, _, ampm = t.strip().partition(" ")
+    h, m = hm.split(":")
+    hour = int(h) % 12
+    if ampm.strip().upper() == "PM":
+        hour += 12
+    elif ampm.strip().upper() != "AM":
+        raise ValueError(f"Invalid time: {t!r}")
+    return hour * 60 + int(m)
+
+
+# ---------------- Interval Index ----------------
+class IntervalIndex:
+    """
+    Time intervals (minute offsets) sorted by start, searched with bisect.
+
+    Alongside the sorted starts we keep a running maximum of end times. It never
+    decreases, so a search can walk back from the last interval starting before
+    the query end and stop as soon as nothing earlier can reach the query start.
+    For non-overlapping bookings (one room, or one owner) that is O(log n).
+    """
+
+    def __init__(self):
+        self._starts = []   # sorted start minutes
+        self._ends = []     # end minutes, same order as _starts
+        self._seqs = []     # booking seq, same order as _starts
+        self._max_end = []  # max(_ends[:i + 1])
+
+    def __len__(self):
+        return len(self._starts)
+
+    def add(self, start, end, seq):
+        i = bisect.bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._seqs.insert(i, seq)
+        self._max_end.insert(i, end)
+        self._refresh_max(i)
+
+    def remove(self, start, seq):
+        i = bisect.bisect_left(self._starts, start)
+        while i < len(self._starts) and self._starts[i] == start:
+            if self._seqs[i] == seq:
+                for lst in (self._starts, self._ends, self._seqs, self._max_end):
+                    del lst[i]
+                self._refresh_max(i)
+                return
+            i += 1
+
+    def _refresh_max(self, i):
+        running = self._max_end[i - 1] if i > 0 else -1
+        for j in range(i, len(self._ends)):
+            running = max(running, self._ends[j])
+            self._max_end[j] = running
+
+    def overlapping(self, start, end):
+        """Seqs of intervals overlapping [start, end), i.e. not (end <= s or start >= e)."""
+        hits = []
+        j = bisect.bisect_left(self._starts, end) - 1
+        while j >= 0 and self._max_end[j] > start:
+            if self._ends[j] > start:
+                hits.append(self._seqs[j])
+            j -= 1
+        return hits
+
+
+# ---------------- Store ----------------
+class BookingStore:
+    """
+    In-memory copy of one list of bookings with lookup indexes.
+
+    The rows are read from the storage backend once, on first use. They are kept
+    in booking order under a sequence number (the backend's key), and every
+    index maps a key to {seq: row}, so a lookup only touches the rows that match.
+    Callers must go through the store's update methods so the indexes stay in
+    step with storage.
+
+    All public methods hold an RLock, so a background compaction can run while
+    the pages keep reading.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self):
+        self._rows = {}                       # seq -> booking dict (file order)
+        self._next_seq = 0
+        self._by_slot = defaultdict(dict)     # (venue, room, date) -> {seq: row}
+        self._by_date = defaultdict(dict)     # date -> {seq: row}
+        self._by_owner = defaultdict(dict)    # owner_id -> {seq: row}
+        self._by_member = defaultdict(dict)   # member student ID -> {seq: row}
+        self._by_name = defaultdict(dict)     # upper-cased owner/member name -> {seq: row}
+        self._spans = {}                      # seq -> (start_min, end_min), parsed once
+        self._room_times = defaultdict(IntervalIndex)   # (venue, room, date) -> intervals
+        self._owner_times = defaultdict(IntervalIndex)  # (owner_id, date) -> intervals
+        self._occupancy = {}                  # (venue, date) -> {room: slot bitmask}
+
+    # ----- loading -----
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for seq, row in self._load():
+            self._index(row, seq)
+
+    def _load(self):
+        """[(seq, booking), ...] from storage (subclasses)."""
+        return []
+
+    @_locked
+    def reload(self):
+        """Drop the in-memory copy and read storage again."""
+        self._reset()
+        self._loaded = False
+        self._ensure_loaded()
+
+    # ----- index maintenance -----
+    def _index(self, row, seq=None):
+        if seq is None:
+            seq = self._next_seq
+        self._next_seq = max(self._next_seq, seq + 1)
+        self._rows[seq] = row
+        self._occupancy.pop((row.get("venue", ""), row.get("date", "")), None)
+        for bucket in self._buckets(row):
+            bucket[seq] = row
+        try:
+            span = (to_minutes(row["start"]), to_minutes(row["end"]))
+        except (KeyError, ValueError, AttributeError):
+            return seq  # Unreadable times: still listed, just never conflicts
+        self._spans[seq] = span
+        for times in self._time_indexes(row):
+            times.add(span[0], span[1], seq)
+        return seq
+
+    def _unindex(self, seq):
+        row = self._rows.pop(seq)
+        self._occupancy.pop((row.get("venue", ""), row.get("date", "")), None)
+        for bucket in self._buckets(row):
+            bucket.pop(seq, None)
+        span = self._spans.pop(seq, None)
+        if span:
+            for times in self._time_indexes(row):
+                times.remove(span[0], seq)
+
+    def _time_indexes(self, row):
+        yield self._room_times[slot_key(row)]
+        yield self._owner_times[(row.get("owner_id", ""), row.get("date", ""))]
+
+    def _buckets(self, row):
+        """Every index bucket this row belongs to."""
+        yield self._by_slot[slot_key(row)]
+        yield self._by_date[row.get("date", "")]
+        yield self._by_owner[row.get("owner_id", "").strip()]
+        yield self._by_name[row.get("owner_name", "").strip().upper()]
+        for sid, name in split_members(row.get("members", "")):
+            yield self._by_member[sid]
+            if name:
+                yield self._by_name[name.upper()]
+
+    # ----- lookups -----
+    @_locked
+    def all(self):
+        """All bookings in booking order."""
+        self._ensure_loaded()
+        return list(self._rows.values())
+
+    @_locked
+    def from_date(self, date):
+        """Bookings on or after a YYYY-MM-DD date, in booking order."""
+        self._ensure_loaded()
+        found = {}
+        for d, bucket in self._by_date.items():
+            if d >= date:
+                found.update(bucket)
+        return [found[seq] for seq in sorted(found)]
+
+    @_locked
+    def for_user(self, current_user):
+        """Bookings the user owns or is a member of, matched by student ID or (case-insensitive) name."""
+        self._ensure_loaded()
+        user = str(current_user).strip()
+        found = {}
+        for index, key in ((self._by_owner, user), (self._by_member, user), (self._by_name, user.upper())):
+            found.update(index.get(key, {}))
+        return [found[seq] for seq in sorted(found)]
+
+    @_locked
+    def occupancy(self, venue, date):
+        """
+        Booked slots for every room of a venue on one day, as {room: bitmask}.
+
+        Bit i is set when slot i (SLOT_START + i * SLOT_MINUTES, one slot long)
+        overlaps a booking. Built in one pass over that day's bookings and cached
+        until a booking for the same venue and date is added or removed.
+        """
+        self._ensure_loaded()
+        key = (venue, date)
+        cached = self._occupancy.get(key)
+        if cached is not None:
+            return cached
+        masks = {}
+        for seq, row in self._by_date.get(date, {}).items():
+            span = self._spans.get(seq)
+            if row.get("venue") != venue or span is None:
+                continue
+            first = max(0, (span[0] - SLOT_START) // SLOT_MINUTES)
+            last = min(SLOT_COUNT, -((SLOT_START - span[1]) // SLOT_MINUTES))  # ceil division
+            if last > first:
+                bits = ((1 << (last - first)) - 1) << first
+                masks[row["room"]] = masks.get(row["room"], 0) | bits
+        self._occupancy[key] = masks
+        return masks
+
+    @_locked
+    def find_conflict(self, venue, room, date, owner_id, start, end):
+        """
+        First booking (in booking order) on this date that overlaps [start, end)
+        minutes and is either the owner's or in the same room.
+
+        Returns ("owner", booking), ("room", booking) or None. A booking that is
+        both counts as "owner", matching the old linear scan.
+        """
+        self._ensure_loaded()
+        owner_times = self._owner_times.get((owner_id, date))
+        room_times = self._room_times.get((venue, room, date))
+        first_owner = min(owner_times.overlapping(start, end), default=None) if owner_times else None
+        first_room = min(room_times.overlapping(start, end), default=None) if room_times else None
+        if first_owner is not None and (first_room is None or first_owner <= first_room):
+            return "owner", self._rows[first_owner]
+        if first_room is not None:
+            return "room", self._rows[first_room]
+        return None
+
+    def _matching(self, booking):
+        return [seq for seq, r in self._by_slot.get(slot_key(booking), {}).items() if same_booking(r, booking)]
+
+
+# ---------------- Active / Cancelled ----------------
+class ActiveBookingStore(BookingStore):
+    """
+    Bookings that are still active.
+
+    append() and cancel() write through the storage backend, which keeps them
+    cheap (the CSV backend appends to bookings.csv or to its cancellation
+    journal; SQLite inserts or updates one row). When the backend reports that
+    compaction is due, compact() runs on a daemon thread and the indexes are
+    rebuilt from the keys it hands back.
+    """
+
+    def __init__(self, cancelled):
+        super().__init__()
+        self.cancelled = cancelled    # Store that lists cancelled bookings
+        self._compacting = False
+
+    def _load(self):
+        return get_backend().load_bookings()
+
+    @_locked
+    def append(self, booking: dict):
+        """Store a new booking and index it."""
+        row = {k: booking.get(k, "") for k in FIELDNAMES}
+        self._ensure_loaded()  # Backend keys must be known before writing
+        self._index(row, get_backend().append_booking(row))
+        return row
+
+    @_locked
+    def cancel(self, booking: dict):
+        """Cancel every active booking matching this one's room, time and owner; return them."""
+        self._ensure_loaded()
+        backend = get_backend()
+        matches = self._matching(booking)
+        record = {k: booking.get(k, "") for k in FIELDNAMES}
+        backend.cancel_booking(record, matches)
+
+        removed = [self._rows[seq] for seq in matches]
+        for seq in matches:
+            self._unindex(seq)
+        self.cancelled.add(record)
+
+        if backend.compaction_due() and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self.compact, daemon=True).start()
+        return removed
+
+    @_locked
+    def compact(self):
+        """Let the backend fold pending cancellations away, then re-key the indexes."""
+        try:
+            self._ensure_loaded()
+            pairs = get_backend().compact_bookings(list(self._rows.values()))
+            if pairs is None:
+                return
+            self._reset()
+            for seq, row in pairs:
+                self._index(row, seq)
+        finally:
+            self._compacting = False
+
+
+class CancelledBookingStore(BookingStore):
+    """Cancelled bookings, oldest cancellation first."""
+
+    def _load(self):
+        return enumerate(get_backend().load_cancelled())
+
+    @_locked
+    def add(self, row: dict):
+        """Index a cancellation the backend has just recorded."""
+        if not self._loaded:
+            self._ensure_loaded()  # First read already picks up the new row
+            return
+        self._index(row)
+
+
+# Shared stores used by all booking pages
+CANCELLED = CancelledBookingStore()
+BOOKINGS = ActiveBookingStore(CANCELLED)
@@ -1,78 +1,114 @@
 import tkinter as tk              # Import tkinter for GUI components
+import itertools                  # Import itertools to page through the history
 from tkinter import ttk, messagebox  # Import ttk for themed widgets, messagebox for popups
-import winsound                   # Import winsound for playing beep sounds on Windows
-import time                       # Import time module for formatting current time
-from datetime import datetime, timedelta  # Import datetime and timedelta for date/time handling
-import csv                        # Import csv module to read and write CSV files
-import os                         # Import os module for file and directory handling
+from alarm import ALARM           # Import shared alarm (beeps on a worker thread)
+from reminder_archive import iter_history, last_archived_id  # Import archived reminder reader and ID mark
+from recurrence import FREQUENCIES, parse_rule, format_rule, next_occurrence  # Import repeat rules
+from datetime import datetime     # Import datetime for date/time handling
+from reminder_service import (    # Import process-wide reminder service (cache, writer, timer)
+    SERVICE, DT_FORMAT, load_reminders, save_reminders
+)
 
 # ---------------- CSV File Operations ----------------
-DATA_DIR = "data"                 # Define the directory to store reminder CSV files
-os.makedirs(DATA_DIR, exist_ok=True)  # Create the "data" directory if it does not already exist
-
-
-def reminder_file(user):
-    """Return the file path for a user's reminder CSV file"""
-    return os.path.join(DATA_DIR, f"{user}_reminder.csv")  # Combine directory and filename with user ID
-
-
-def load_reminders(user):
-    """Load reminders from CSV for a given user"""
-    events = []                   # Initialize an empty list to store reminders
-    file = reminder_file(user)     # Get the CSV file path for the user
-    if os.path.exists(file):       # Check if the file exists
-        with open(file, newline="", encoding="utf-8") as f:  # Open the file in read mode
-            reader = csv.DictReader(f)  # Create a CSV reader that reads rows as dictionaries
-            for row in reader:          # Loop through each row in the CSV file
-                events.append({         # Append each reminder as a dictionary into events list
-                    "id": int(row.get("id", len(events))),  # Use ID from file, or generate one if missing
-                    "task": row["task"],                    # Task description
-                    "datetime": row["datetime"],            # Date and time string
-                    "status": row["status"],                # Status (Pending, Ringing, Rang)
-                    "repeat": row.get("repeat", "None")     # Repeat type (None, Daily, Weekly)
-                })
-    return events  # Return the list of reminders
-
-
-def save_reminders(user, events):
-    """Save all reminders back to the CSV file"""
-    file = reminder_file(user)     # Get the file path for the user
-    with open(file, "w", newline="", encoding="utf-8") as f:  # Open the file in write mode
-        writer = csv.DictWriter(f, fieldnames=["id", "task", "datetime", "status", "repeat"])  
-        # Create a CSV writer with fixed field names
-        writer.writeheader()       # Write the header row (column names)
-        for i, e in enumerate(events):  # Loop through all reminders
-            writer.writerow({      # Write each reminder as a row in the CSV file
-                "id": e.get("id", i),          # ID of the reminder (use existing or index as fallback)
-                "task": e["task"],             # Task description
-                "datetime": e["datetime"],     # Date and time string
-                "status": e["status"],         # Status of reminder
-                "repeat": e.get("repeat", "None")  # Repeat value, default to "None"
-            })
+HISTORY_PAGE = 200                # Archived reminders shown per "Load More"
+
+
+class ReminderBatch:
+    """
+    Load a user's reminders once, apply any number of changes in memory and
+    save them once when the with-block ends (nothing is saved on error).
+
+        with ReminderBatch(user) as batch:
+            batch.set_status(rid, "Ringing")
+            batch.complete(rid, old_dt_str)
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.reminders = []
+        self.changed = False
+
+    def __enter__(self):
+        self.reminders = load_reminders(self.user)  # One read for the whole batch
+        self._by_id = {r["id"]: r for r in self.reminders}
+        self._next_id = max(max(self._by_id, default=-1), last_archived_id(self.user)) + 1
+        # Never reuse an archived ID: the History view lists those reminders by ID too
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and self.changed:
+            save_reminders(self.user, self.reminders)  # One write for the whole batch
+        return False
+
+    def get(self, reminder_id):
+        return self._by_id.get(reminder_id)
+
+    def add(self, task, dt_str, repeat="None"):
+        """Append a new Pending reminder and return it"""
+        reminder = {"id": self._next_id, "task": task, "datetime": dt_str, "status": "Pending", "repeat": repeat}
+        self._next_id += 1
+        self.reminders.append(reminder)
+        self._by_id[reminder["id"]] = reminder
+        self.changed = True
+        return reminder
+
+    def update(self, reminder_id, **fields):
+        """Change fields of a reminder; return it (None if it no longer exists)"""
+        reminder = self._by_id.get(reminder_id)
+        if reminder is not None:
+            reminder.update(fields)
+            self.changed = True
+        return reminder
+
+    def delete(self, reminder_id):
+        """Remove a reminder; return it (None if it no longer exists)"""
+        reminder = self._by_id.pop(reminder_id, None)
+        if reminder is not None:
+            self.reminders.remove(reminder)
+            self.changed = True
+        return reminder
+
+    def set_status(self, reminder_id, new_status):
+        """Change a reminder's status; return the reminder (None if it no longer exists)"""
+        reminder = self._by_id.get(reminder_id)
+        if reminder is not None and reminder["status"] != new_status:
+            reminder["status"] = new_status
+            self.changed = True
+        return reminder
+
+    def complete(self, reminder_id, fired_dt_str):
+        """
+        The occurrence due at fired_dt_str has rung. A repeating reminder moves
+        on to its next occurrence after now (same row, still Pending); anything
+        else, or a series past its end date, becomes "Rang".
+        """
+        reminder = self._by_id.get(reminder_id)
+        if reminder is None:
+            return None
+        rule = parse_rule(reminder.get("repeat"))
+        next_dt = None
+        if rule is not None:
+            fired = datetime.strptime(fired_dt_str, DT_FORMAT)
+            next_dt = next_occurrence(rule, fired, max(fired, datetime.now()))
+        if next_dt is not None:
+            reminder["datetime"] = next_dt.strftime(DT_FORMAT)
+            reminder["status"] = "Pending"
+        else:
+            reminder["status"] = "Rang"
+        self.changed = True
+        return reminder
 
 
 def add_reminder_to_csv(user, task, dt_str, repeat="None"):
     """Add a new reminder to the CSV"""
-    events = load_reminders(user)  # Load all reminders for the user
-    next_id = max([e["id"] for e in events], default=-1) + 1  # Generate the next ID (increment by 1)
-    events.append({                # Append a new reminder dictionary
-        "id": next_id,             # Unique reminder ID
-        "task": task,              # Task description
-        "datetime": dt_str,        # Reminder date/time string
-        "status": "Pending",       # Initial status is "Pending"
-        "repeat": repeat           # Repeat option
-    })
-    save_reminders(user, events)   # Save the updated reminder list back to CSV
+    with ReminderBatch(user) as batch:
+        batch.add(task, dt_str, repeat)
 
 
 def update_reminder_status(user, reminder_id, new_status):
     """Update the status of a reminder by ID"""
-    events = load_reminders(user)  # Load all reminders for the user
-    for e in events:               # Loop through all reminders
-        if e["id"] == reminder_id: # Find the reminder with matching ID
-            e["status"] = new_status  # Update its status
-            break                  # Exit the loop after updating
-    save_reminders(user, events)   # Save the updated reminders back to CSV
+    with ReminderBatch(user) as batch:
+        batch.set_status(reminder_id, new_status)
 
 
 # ---------------- Reminder GUI ----------------
@@ -95,11 +131,22 @@ class ReminderApp:
         # Create a labeled frame for reminder list
         list_frame.pack(pady=10, padx=20, fill="x")  # Pack it with padding and horizontal fill
 
-        self.listbox = tk.Listbox(
-            list_frame, width=100, height=12, font=("Courier New", 10),
-            bg="white", relief="solid", bd=1
-        )  # Create a listbox to show reminders
-        self.listbox.pack(pady=5, padx=10)  # Pack the listbox inside the frame
+        columns = {"date": ("Date", 100), "time": ("Time", 80), "task": ("Task", 300),
+                   "repeat": ("Repeat", 130), "status": ("Status", 80)}
+        self.tree = ttk.Treeview(list_frame, columns=list(columns), show="headings",
+                                 height=12, selectmode="browse")
+        # Create a table of reminders; each row's id is the reminder ID
+        for col, (heading, width) in columns.items():
+            self.tree.heading(col, text=heading)
+            self.tree.column(col, width=width, anchor="w")
+        scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=tk.RIGHT, fill="y", pady=5)
+        self.tree.pack(pady=5, padx=(10, 0), fill="x")  # Pack the table inside the frame
+        self.empty_label = tk.Label(list_frame, text="No reminder events.", bg="white")
+        # Placeholder shown over the table when there are no reminders
+        self._shown = {}   # row id -> values currently in the table
+        self._order = []   # row ids in table order
 
         # ---------------- Buttons Section ----------------
         btn_frame = tk.Frame(self.root, bg="#E0FFFF")  # Create a frame to hold buttons
@@ -121,6 +168,10 @@ class ReminderApp:
                   command=self.delete_reminder).pack(side=tk.LEFT, padx=8)  
         # Button to delete a selected reminder
 
+        tk.Button(btn_frame, text="History", bg="lightblue", width=15,
+                  command=self.open_history).pack(side=tk.LEFT, padx=8)  
+        # Button to browse archived reminders
+
 
                # ---------------- Form Section (Add Reminder) ----------------
         form_frame = tk.LabelFrame(self.root, text="Add New Reminder", bg="#E0FFFF", font=("Arial", 12, "bold"))
@@ -189,41 +240,74 @@ class ReminderApp:
         tk.Label(form_frame, text="Repeat:", bg="#E0FFFF", anchor="e", width=10).grid(row=3, column=0, padx=5, pady=5)
         # Label for repeat selection
         self.repeat_var = tk.StringVar()  # Variable to store repeat option
-        ttk.Combobox(form_frame, textvariable=self.repeat_var, values=["None", "Daily", "Weekly"],
-                     width=10, state="readonly").grid(row=3, column=1, pady=5, sticky="w")
+        ttk.Combobox(form_frame, textvariable=self.repeat_var, values=["None"] + FREQUENCIES,
+                     width=14, state="readonly").grid(row=3, column=1, pady=5, sticky="w")
         # Dropdown for repeat options
         self.repeat_var.set("None")  # Default value is "None"
 
+        repeat_frame = tk.Frame(form_frame, bg="#E0FFFF")  # Frame for interval and end date
+        repeat_frame.grid(row=3, column=2, columnspan=2, sticky="w")
+        tk.Label(repeat_frame, text="N:", bg="#E0FFFF").grid(row=0, column=0)
+        self.interval_var = tk.StringVar(value="2")  # Interval for "Every N days/weeks"
+        tk.Spinbox(repeat_frame, from_=1, to=52, textvariable=self.interval_var, width=4).grid(row=0, column=1, padx=2)
+        tk.Label(repeat_frame, text="Until (YYYY-MM-DD):", bg="#E0FFFF").grid(row=0, column=2, padx=(8, 2))
+        self.until_entry = tk.Entry(repeat_frame, width=12)  # Optional last day of the series
+        self.until_entry.grid(row=0, column=3)
+
         # Add button
         tk.Button(form_frame, text="Add Reminder", bg="lightgreen", width=20, command=self.add_reminder)\
             .grid(row=4, column=0, columnspan=4, pady=10)
         # Button to add the reminder with entered details
 
-        # Start clock + reminders check
-        self.update_clock()       # Start updating clock
-        self.check_reminders()    # Start checking reminders
+        # Join the shared clock + reminder timer
+        SERVICE.subscribe(self.root, self.current_user, self.check_reminders)  # Alerts when reminders fall due
+        SERVICE.add_clock(self.clock_label)  # Clock ticked by the service
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
+        SERVICE.rotate(self.current_user)  # Archive reminders that rang long ago
         self.refresh_list()       # Load reminders into the list
 
+    def on_destroy(self, event):
+        """Leave the shared timer when the reminder window closes (its open alerts are dismissed with it)"""
+        if event.widget is self.root:
+            SERVICE.unsubscribe(self.root, self.current_user, self.check_reminders)
+
 
      # ---------------- Refresh List ----------------
     def refresh_list(self):
-        """Reload and display all reminders in the listbox"""
-        self.listbox.delete(0, tk.END)          # Clear the listbox before reloading
-        events = load_reminders(self.current_user)  # Load all reminders for current user
-        if not events:                          # If no reminders exist
-            self.listbox.insert(tk.END, "No reminder events.")  # Show placeholder text
+        """Bring the table in line with the stored reminders, touching only changed rows"""
+        rows = {}
+        for e in load_reminders(self.current_user):  # Load all reminders for current user
+            date, _, time_part = e["datetime"].partition(" ")  # Split into date and time parts
+            rows[str(e["id"])] = (date, time_part, e["task"], e.get("repeat", "None"), e["status"])
+
+        removed = [iid for iid in self._order if iid not in rows]
+        if removed:
+            self.tree.delete(*removed)            # Drop deleted reminders
+            self._order = [iid for iid in self._order if iid in rows]
+
+        for i, (iid, values) in enumerate(rows.items()):
+            old = self._shown.get(iid)
+            if old is None:                       # New reminder
+                self.tree.insert("", i, iid=iid, values=values)
+                self._order.insert(i, iid)
+                continue
+            if old != values:                     # Changed reminder
+                self.tree.item(iid, values=values)
+            if self._order[i] != iid:             # Moved reminder
+                self.tree.move(iid, "", i)
+                self._order.remove(iid)
+                self._order.insert(i, iid)
+        self._shown = rows
+
+        if rows:
+            self.empty_label.place_forget()
         else:
-            self.listbox.insert(
-                tk.END,
-                f"{'Date':<15} | {'Time':<10} | {'Task':<40} | {'Repeat':<10} | {'Status':<10}"
-            )  # Insert header row
-            self.listbox.insert(tk.END, "-" * 100)  # Insert a separator line
-            for e in events:                        # Loop through all reminders
-                date, time_part = e['datetime'].split(" ", 1)  # Split into date and time parts
-                self.listbox.insert(
-                    tk.END,
-                    f"{date:<15} | {time_part:<10} | {e['task']:<40} | {e.get('repeat','None'):<10} | {e['status']:<10}"
-                )  # Insert formatted reminder row
+            self.empty_label.place(relx=0.5, rely=0.5, anchor="center")  # Show placeholder text
+
+    def selected_id(self):
+        """ID of the reminder selected in the table, or None"""
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
 
 
     # ---------------- Add Reminder ----------------
@@ -245,9 +329,9 @@ class ReminderApp:
         try:
             dt_str_input = f"{year}-{month}-{day} {hour}:{minute} {ampm}"  
             # Build full datetime string from inputs
-            dt_obj = datetime.strptime(dt_str_input, "%Y-%m-%d %I:%M %p")  
+            dt_obj = datetime.strptime(dt_str_input, DT_FORMAT)  
             # Convert string to datetime object for validation
-            dt_str = dt_obj.strftime("%Y-%m-%d %I:%M %p")  
+            dt_str = dt_obj.strftime(DT_FORMAT)  
             # Re-format datetime string
         except ValueError:
             messagebox.showerror("Error", "Invalid date or time format!")  # Show error if invalid input
@@ -261,6 +345,18 @@ class ReminderApp:
             messagebox.showerror("Error", "You cannot select a past date or time!")
             return
 
+        if repeat != "None":
+            until = self.until_entry.get().strip()
+            try:
+                interval = int(self.interval_var.get())
+                if until:
+                    datetime.strptime(until, "%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Error", "Invalid repeat interval or end date!")
+                return
+            repeat = format_rule(repeat, interval, until or None)  
+            # Store the rule once, e.g. "Every 2 weeks until 2026-12-31"
+
         add_reminder_to_csv(self.current_user, task, dt_str, repeat)  
         # Save new reminder to CSV
         messagebox.showinfo("Success", f"Reminder added for {dt_str}")  
@@ -269,94 +365,130 @@ class ReminderApp:
         # Refresh reminder list display
 
 
-    # ---------------- Clock Update ----------------
-    def update_clock(self):
-        """Update the on-screen clock every second"""
-        now = time.strftime("%I:%M:%S %p")   # Get current time in HH:MM:SS AM/PM format
-        self.clock_label.config(text=f"{now}")  # Update clock label text
-        if self.root.winfo_exists():  # Check if window still exists
-            self.root.after(1000, self.update_clock)  
-            # Call this function again after 1 second
-
-
     # ---------------- Check Reminders ----------------
-    def check_reminders(self):
-        """Check reminders every second (trigger normal + catch-up alarms)"""
-        now_dt = datetime.now()  
-        # Get current datetime
-        now_str = now_dt.strftime("%Y-%m-%d %I:%M %p")  
-        # Format current time to match reminder format
-        events = load_reminders(self.current_user)  
-        # Load all reminders
-
-        for e in events:  
-            # Loop through each reminder
-            event_dt = datetime.strptime(e["datetime"], "%Y-%m-%d %I:%M %p")  
-            # Convert reminder datetime string to datetime object
-
-            # Normal on-time reminder
-            if e["datetime"] == now_str and e["status"] == "Pending":
-                update_reminder_status(self.current_user, e["id"], "Ringing")  
-                # Mark status as "Ringing"
-                self.root.after(0, lambda t=e["task"], rid=e["id"], r=e.get("repeat"), dt=e["datetime"]:
-                                self.alert(t, rid, r, dt))  
-                # Call alert popup immediately
-
-            # Catch-up reminder (missed but still Pending)
-            elif event_dt < now_dt and e["status"] == "Pending":
-                update_reminder_status(self.current_user, e["id"], "Ringing")  
-                # Mark status as "Ringing"
-                self.root.after(500, lambda t=e["task"], rid=e["id"], r=e.get("repeat"), dt=e["datetime"]:
-                                self.alert(t, rid, r, dt))  
-                # Call alert popup slightly delayed (0.5s)
-
-        if self.root.winfo_exists():  
-            # Check again after 1 second if window is still open
-            self.root.after(1000, self.check_reminders)
+    def check_reminders(self, due):
+        """Called by the reminder service with due reminders (trigger normal + catch-up alarms)"""
+        ringing, missed = [], []
+        with ReminderBatch(self.current_user) as batch:  # One save for the whole burst
+            for e, was_missed in due:
+                if was_missed:
+                    # Catch-up: kept as "Missed" until the user dismisses the missed-reminders popup
+                    if batch.set_status(e["id"], "Missed") is not None:
+                        missed.append(e)
+                elif batch.set_status(e["id"], "Ringing") is not None:
+                    ringing.append(e)
+        if missed:
+            self.refresh_list()  
+            # Show them as "Missed" while the popup is open
+
+        for e in ringing:
+            self.root.after(0, lambda t=e["task"], rid=e["id"], r=e.get("repeat"), dt=e["datetime"]:
+                            self.alert(t, rid, r, dt))  
+            # Call alert popup immediately
+        if missed:
+            self.root.after(500, lambda: self.alert_missed(missed))  
+            # One popup for all missed reminders, slightly delayed (0.5s)
 
 
     # ---------------- Alarm Sound ----------------
     def play_alarm_sequence(self, times_left):
-        """Play beep sound multiple times"""
-        if times_left <= 0 or not self.root.winfo_exists():  
-            # Stop if no times left or window closed
-            return
-        winsound.Beep(1000, 700)  
-        # Play beep sound (1000 Hz, 0.7s)
-        self.root.after(1000, lambda: self.play_alarm_sequence(times_left - 1))  
-        # Call again after 1 second until times_left is 0
+        """Play beep sound multiple times (on the alarm thread, the window stays responsive)"""
+        if times_left > 0 and self.root.winfo_exists():
+            ALARM.play(times_left)
 
 
     # ---------------- Show Reminder Alert ----------------
+    def show_popup(self, title, message, on_close=None):
+        """Non-modal alert window; several can be open while the clock keeps running"""
+        popup = tk.Toplevel(self.root)
+        popup.title(title)
+        popup.configure(bg="#FFFACD")
+        popup.resizable(False, False)
+        popup.attributes("-topmost", True)     # Keep it in front of the other windows
+        tk.Label(popup, text=message, bg="#FFFACD", font=("Arial", 12), justify="left",
+                 wraplength=400).pack(padx=20, pady=15)
+
+        closed = False
+
+        def on_destroy(event):
+            # OK, the window manager and closing the reminder window all end here; act only once
+            nonlocal closed
+            if event.widget is not popup or closed:
+                return
+            closed = True
+            ALARM.stop()                       # Dismissing an alert silences the alarm
+            if on_close:
+                on_close()
+
+        tk.Button(popup, text="OK", width=10, command=popup.destroy).pack(pady=(0, 12))
+        popup.bind("<Destroy>", on_destroy, add="+")
+        return popup
+
     def alert(self, title, reminder_id, repeat, old_dt_str):
         """Show popup + play alarm when reminder time is reached"""
         self.play_alarm_sequence(3)  
         # Play alarm sound 3 times
-        messagebox.showinfo("Reminder", f"{self.current_user}, time for: {title}")  
-        # Show popup reminder
-        update_reminder_status(self.current_user, reminder_id, "Rang")  
-        # Mark reminder as already "Rang"
-
-        reminders = load_reminders(self.current_user)  
-        # Reload reminders
-        latest = next((r for r in reminders if r["id"] == reminder_id), None)  
-        # Find the latest reminder with this ID
-
-        if latest is None or latest["repeat"] != repeat:  
-            # If no reminder found or repeat is changed, do nothing
-            return
+        self.show_popup("Reminder", f"{self.current_user}, time for: {title}",
+                        lambda: self.dismiss(reminder_id, repeat, old_dt_str))  
+        # Show popup reminder; it is marked "Rang" once dismissed
+
+    def dismiss(self, reminder_id, repeat, old_dt_str):
+        """Alert closed: mark the reminder "Rang", or move a repeating one to its next time"""
+        with ReminderBatch(self.current_user) as batch:
+            batch.complete(reminder_id, old_dt_str)  
+            # Uses the current repeat rule, so a cancelled repeat just rings out
+        if self.root.winfo_exists():
+            self.refresh_list()  
+            # Show the new status
 
-        # Create next repeat reminder
-        if repeat == "Daily":
-            new_dt = datetime.now() + timedelta(days=1)  
-            # Add 1 day
-            add_reminder_to_csv(self.current_user, title, new_dt.strftime("%Y-%m-%d %I:%M %p"), repeat)  
-            # Save new reminder for tomorrow
-        elif repeat == "Weekly":
-            new_dt = datetime.strptime(old_dt_str, "%Y-%m-%d %I:%M %p") + timedelta(weeks=1)  
-            # Add 1 week to old reminder date
-            add_reminder_to_csv(self.current_user, title, new_dt.strftime("%Y-%m-%d %I:%M %p"), repeat)  
-            # Save new reminder for next week
+    def alert_missed(self, missed):
+        """Show one popup + alarm for reminders that were due while nobody was watching"""
+        self.play_alarm_sequence(3)  
+        # Play alarm sound 3 times
+        lines = [f"{e['datetime']}  {e['task']}" for e in missed[:10]]
+        if len(missed) > 10:
+            lines.append(f"... and {len(missed) - 10} more")
+        self.show_popup("Missed Reminders", f"{self.current_user}, you missed:\n\n" + "\n".join(lines),
+                        lambda: self.dismiss_missed(missed))  
+        # Show popup listing the missed reminders; they are marked "Rang" once dismissed
+
+    def dismiss_missed(self, missed):
+        """Missed-reminders popup closed: complete them all in one save (repeats move on)"""
+        with ReminderBatch(self.current_user) as batch:
+            for e in missed:
+                batch.complete(e["id"], e["datetime"])
+        if self.root.winfo_exists():
+            self.refresh_list()
+
+    # ---------------- History ----------------
+    def open_history(self):
+        """Read-only list of archived reminders, loaded from the archives a page at a time"""
+        win = tk.Toplevel(self.root)
+        win.title("Reminder History")
+        win.geometry("700x420")
+        win.configure(bg="#E0FFFF")
+
+        tree = ttk.Treeview(win, columns=("datetime", "task", "repeat", "status"), show="headings", height=15)
+        for col, heading, width in (("datetime", "Date & Time", 160), ("task", "Task", 330),
+                                    ("repeat", "Repeat", 110), ("status", "Status", 70)):
+            tree.heading(col, text=heading)
+            tree.column(col, width=width, anchor="w")
+        tree.pack(padx=10, pady=10, fill="both", expand=True)
+
+        rows = iter_history(self.current_user)  # Lazy: archives are opened as we reach them
+        more_btn = tk.Button(win, text="Load More", width=15)
+        more_btn.pack(pady=(0, 10))
+
+        def load_page():
+            count = 0
+            for r in itertools.islice(rows, HISTORY_PAGE):
+                tree.insert("", tk.END, values=(r["datetime"], r["task"], r.get("repeat", "None"), r["status"]))
+                count += 1
+            if count < HISTORY_PAGE:
+                more_btn.config(state="disabled", text="No More History" if tree.get_children() else "No History")
+
+        more_btn.config(command=load_page)
+        load_page()
 
       # ---------------- Clear History ----------------
     def clear_history(self):
@@ -366,60 +498,23 @@ class ReminderApp:
             clear_rang_reminders(self.current_user)  
             # Remove reminders with status = "Rang"
             self.refresh_list()  
-            # Refresh the listbox to show updated reminders
+            # Refresh the table to show updated reminders
 
 
     # ---------------- Cancel Repeat ----------------
     def cancel_repeat(self):
         """Cancel repeat for the selected reminder"""
-        selection = self.listbox.curselection()  
-        # Get the selected row index from the listbox
-        if not selection:
+        reminder_id = self.selected_id()  
+        # Get the selected reminder ID from the table
+        if reminder_id is None:
             messagebox.showwarning("No Selection", "Please select a reminder to cancel repeat.")
             # Show warning if nothing is selected
             return
-        index = selection[0]  
-        # Get index of selected item
-        if index <= 1:  
-            # Prevent canceling header/separator rows
-            messagebox.showwarning("Invalid Selection", "Please select a valid reminder row.")
-            return
 
-        line = self.listbox.get(index)  
-        # Get the selected reminder text line
-        parts = line.split("|")  
-        # Split the line into parts (Date, Time, Task, Repeat, Status)
-        if len(parts) < 5:
-            messagebox.showerror("Error", "Invalid reminder format.")  
-            # Error if format is not valid
-            return
+        with ReminderBatch(self.current_user) as batch:
+            batch.update(reminder_id, repeat="None")  
+            # Cancel the series: its rule is stored only on this row
 
-        date = parts[0].strip()       # Extract date
-        time_part = parts[1].strip()  # Extract time
-        task = parts[2].strip()       # Extract task
-        dt_str = f"{date} {time_part}"  
-        # Combine date and time into datetime string
-
-        reminders = load_reminders(self.current_user)  
-        # Load reminders from CSV
-        for r in reminders:  
-            if r["datetime"] == dt_str and r["task"] == task:
-                r["repeat"] = "None"  
-                # Cancel repeat by setting it to "None"
-
-        now = datetime.now()
-        reminders = [
-            r for r in reminders
-            if not (
-                r["task"] == task and
-                r["repeat"] == "Daily" and
-                datetime.strptime(r["datetime"], "%Y-%m-%d %I:%M %p") > now
-            )
-        ]
-        # Remove any future daily repeat reminders for this task
-
-        save_reminders(self.current_user, reminders)  
-        # Save updated reminders back to CSV
         self.refresh_list()  
         # Refresh the reminder list
         messagebox.showinfo("Cancelled", "Next Repeat Cancelled.")  
@@ -429,27 +524,12 @@ class ReminderApp:
     # ---------------- Delete Reminder ----------------
     def delete_reminder(self):
         """Delete the selected reminder"""
-        selection = self.listbox.curselection()  
-        # Get the selected row index from listbox
-        if not selection:
+        reminder_id = self.selected_id()  
+        # Get the selected reminder ID from the table
+        if reminder_id is None:
             messagebox.showwarning("No Selection", "Please select a reminder to delete.")
             # Warn if nothing is selected
             return
-        index = selection[0]  
-        # Get index of selected item
-        if index <= 1:
-            # Prevent deleting header/separator rows
-            messagebox.showwarning("Invalid Selection", "Please select a valid reminder row.")
-            return
-
-        line = self.listbox.get(index)  
-        # Get the selected reminder line
-        parts = line.split("|")  
-        # Split into parts
-        if len(parts) < 5:
-            messagebox.showerror("Error", "Invalid reminder format.")  
-            # Error if format is invalid
-            return
 
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete and stop repeat this reminder now?")
         # Ask user confirmation before deleting
@@ -457,20 +537,11 @@ class ReminderApp:
             # Do nothing if user cancels
             return
 
-        date = parts[0].strip()       # Extract date
-        time_part = parts[1].strip()  # Extract time
-        task = parts[2].strip()       # Extract task
-        dt_str = f"{date} {time_part}"  
-        # Build datetime string
-
-        reminders = load_reminders(self.current_user)  
-        # Load all reminders
-        reminders = [r for r in reminders if not (r["datetime"] == dt_str and r["task"] == task)]
-        # Filter out the selected reminder (delete it)
-        save_reminders(self.current_user, reminders)  
-        # Save updated reminders
+        with ReminderBatch(self.current_user) as batch:
+            batch.delete(reminder_id)  
+            # Delete the selected reminder
         self.refresh_list()  
-        # Refresh the listbox
+        # Remove its row from the table
         messagebox.showinfo("Deleted", "Reminder deleted successfully.")  
         # Show success popup
 
@@ -0,0 +1,51 @@
+# File: storage/__init__.py
+"""
+Pluggable storage for users, bookings, timetable events and reminders.
+
+    from storage import get_backend
+    get_backend().load_events("tan")
+
+The backend is chosen once per process: STORAGE_BACKEND=csv (default, the
+original files under data/) or STORAGE_BACKEND=sqlite (data/assistant.db).
+Copy existing files into SQLite with: python -m storage.importer
+"""
+import os                                  # Import os to read the backend setting
+import threading                           # Import threading to guard backend creation
+from .base import (                        # Re-export shared layouts and helpers
+    StorageBackend, USER_FIELDS, BOOKING_FIELDS, EVENT_FIELDS, REMINDER_FIELDS,
+    LEGACY_STUDENT_ID, same_booking
+)
+from .csv_backend import CsvBackend
+from .sqlite_backend import SqliteBackend
+
+__all__ = [
+    "get_backend", "set_backend", "BACKENDS", "StorageBackend", "CsvBackend", "SqliteBackend",
+    "USER_FIELDS", "BOOKING_FIELDS", "EVENT_FIELDS", "REMINDER_FIELDS", "LEGACY_STUDENT_ID", "same_booking"
+]
+
+BACKENDS = {"csv": CsvBackend, "sqlite": SqliteBackend}
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "csv").strip().lower()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """The process-wide backend, created on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if STORAGE_BACKEND not in BACKENDS:
+                raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r} (use one of: {', '.join(BACKENDS)})")
+            _backend = BACKENDS[STORAGE_BACKEND]()
+        return _backend
+
+
+def set_backend(backend):
+    """Use a backend instance, or a name from BACKENDS, from now on."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None and _backend is not backend:
+            _backend.close()
+        _backend = BACKENDS[backend]() if isinstance(backend, str) else backend
+        return _backend
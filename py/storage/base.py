@@ -0,0 +1,144 @@
+# File: storage/base.py
+
+# Column layouts shared by every backend
+USER_FIELDS = ["student_id", "username", "password"]
+BOOKING_FIELDS = [
+    "venue", "room", "date", "start", "end", "pax",
+    "owner_id", "owner_name", "members"
+]
+EVENT_FIELDS = [
+    "id", "date", "start_time", "end_time", "title", "reminder", "category", "description",
+    "appt_id"  # Shared by every participant's copy of one appointment ("" for other events)
+]
+REMINDER_FIELDS = ["id", "task", "datetime", "status", "repeat"]
+
+LEGACY_STUDENT_ID = "0000000"  # ID reported for old "username,password" user rows
+FIRST_STUDENT_ID = 1000001     # ID given to the first registered student
+STUDENT_ID_WIDTH = 7           # IDs are zero-padded to this many digits
+
+
+def format_student_id(n: int) -> str:
+    return str(n).zfill(STUDENT_ID_WIDTH)
+
+
+def highest_student_id(users) -> int:
+    """Largest numeric student ID in [(student_id, ...), ...] (FIRST_STUDENT_ID - 1 if none)."""
+    ids = [int(u[0]) for u in users if u[0].isdigit()]
+    return max(ids + [FIRST_STUDENT_ID - 1])
+
+
+def same_booking(a: dict, b: dict) -> bool:
+    """Cancellation match: same room, date, time and owner."""
+    return all(a.get(k) == b.get(k) for k in ("venue", "room", "date", "start", "end", "owner_id"))
+
+
+class StorageBackend:
+    """
+    Interface every storage backend implements.
+
+    Records are plain dicts/tuples in the same shapes the modules always used,
+    so callers do not care where they are kept. Bookings are addressed by a
+    key chosen by the backend (CSV row number, SQLite rowid).
+    """
+
+    name = ""
+
+    # ----- users -----
+    def read_users(self):
+        """Return [(student_id, username, password), ...] in registration order."""
+        raise NotImplementedError
+
+    def append_user(self, student_id, username, password):
+        raise NotImplementedError
+
+    def append_users(self, users):
+        """Store many (student_id, username, password) rows at once."""
+        for student_id, username, password in users:
+            self.append_user(student_id, username, password)
+
+    def next_student_ids(self, count=1):
+        """Reserve `count` new student IDs; they are never handed out again."""
+        last = highest_student_id(self.read_users())  # Fallback: scan every user
+        return [format_student_id(last + i) for i in range(1, count + 1)]
+
+    def users_stamp(self):
+        """Cheap value that changes whenever users are added (None: unknown, always reload)."""
+        return None
+
+    # ----- bookings -----
+    def init_bookings(self):
+        """Create empty booking storage if it does not exist yet."""
+        raise NotImplementedError
+
+    def load_bookings(self):
+        """Return [(key, booking), ...] for active bookings in booking order."""
+        raise NotImplementedError
+
+    def load_cancelled(self):
+        """Return cancelled bookings, oldest cancellation first."""
+        raise NotImplementedError
+
+    def append_booking(self, booking):
+        """Store a new booking and return its key."""
+        raise NotImplementedError
+
+    def cancel_booking(self, booking, keys):
+        """Record one cancellation of `booking`, removing the active bookings `keys`."""
+        raise NotImplementedError
+
+    def compaction_due(self):
+        """True when compact_bookings() has work worth doing."""
+        return False
+
+    def compact_bookings(self, live):
+        """Fold pending cancellations away; return new [(key, booking)] for `live`, or None."""
+        return None
+
+    # ----- timetable events -----
+    def load_events(self, user):
+        """Return every event of a user (EVENT_FIELDS, id as int)."""
+        raise NotImplementedError
+
+    def save_events(self, user, events):
+        raise NotImplementedError
+
+    def append_event(self, user, event):
+        """Store one new event (its id already assigned)."""
+        self.save_events(user, self.load_events(user) + [event])
+
+    def update_event(self, user, event):
+        """Replace the stored event with the same id."""
+        self.save_events(user, [event if e["id"] == event["id"] else e for e in self.load_events(user)])
+
+    def delete_event(self, user, eid):
+        self.save_events(user, [e for e in self.load_events(user) if e["id"] != eid])
+
+    def commit_events(self, changes):
+        """
+        Replace the events of several users ({user: events}) at once: either every
+        list is stored or none is. This fallback saves them one by one.
+        """
+        for user, events in changes.items():
+            self.save_events(user, events)
+
+    def events_compaction_due(self, user):
+        """True when compact_events() has work worth doing."""
+        return False
+
+    def compact_events(self, user, events):
+        """Fold logged event changes away, given the user's current events."""
+
+    def events_stamp(self, user):
+        """Cheap value that changes whenever the user's events change (None: unknown, always reload)."""
+        return None
+
+    # ----- reminders -----
+    def load_reminders(self, user):
+        """Return every reminder of a user (REMINDER_FIELDS, id as int)."""
+        raise NotImplementedError
+
+    def save_reminders(self, user, reminders):
+        raise NotImplementedError
+
+    def close(self):
+        pass
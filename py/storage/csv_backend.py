@@ -0,0 +1,440 @@
+# File: storage/csv_backend.py
+
+import os                                  # Import os for file paths
+import csv                                 # Import csv for reading/writing the data files
+import io                                  # Import io to build staged files in memory
+import threading                           # Import threading to serialise ID allocation in-process
+from contextlib import contextmanager      # Import contextmanager for the file lock
+from .base import (
+    StorageBackend, BOOKING_FIELDS, EVENT_FIELDS, REMINDER_FIELDS,
+    LEGACY_STUDENT_ID, same_booking, format_student_id, highest_student_id
+)
+
+try:
+    import msvcrt                          # Windows file locking
+except ImportError:
+    msvcrt = None
+    import fcntl                           # POSIX file locking
+
+# Journal rows are the cancelled booking plus "rows": the ';'-joined positions
+# (0-based data rows of bookings.csv) that the cancellation removed.
+JOURNAL_FIELDS = BOOKING_FIELDS + ["rows"]
+COMPACT_THRESHOLD = 50  # Fold the journal into the CSV files once it holds this many cancellations
+
+# Event log rows are a whole event plus "op": "put" (add or replace by id) or "del" (only id used)
+EVENT_LOG_FIELDS = ["op"] + EVENT_FIELDS
+EVENT_COMPACT_THRESHOLD = 200  # Rewrite {user}_events.csv once its log holds this many changes
+
+
+# ---------------- Helpers ----------------
+def read_csv(path, encoding="utf-8"):
+    """All rows of a CSV file as dicts ([] if the file is missing)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", newline="", encoding=encoding) as f:
+        return list(csv.DictReader(f))
+
+
+def append_csv(path, fieldnames, rows):
+    """Append rows to a CSV file in one write, adding the header for a new file."""
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_csv(path, fieldnames, rows):
+    """Rewrite a CSV file through a temp file so readers never see half of it."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def write_synced(path, text):
+    """Create `path` holding `text`, flushed to disk before returning."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def csv_text(fieldnames, rows):
+    """A whole CSV file (header and rows) as one string."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+def parse_event(row):
+    """Event dict from a CSV row (old "H,M" start times accepted), None if unreadable."""
+    start_time_str = row.get("start_time") or ""
+    if ":" in start_time_str:                  # Format HH:MM
+        start = start_time_str
+    elif "," in start_time_str:                # Format H,M
+        h, m = start_time_str.split(",")
+        start = f"{int(h):02d}:{int(m):02d}"
+    else:
+        return None                            # Skip invalid format
+    return {
+        "id": int(row["id"]),
+        "date": row["date"],
+        "start_time": start,
+        "end_time": row["end_time"],
+        "title": row["title"],
+        "reminder": row.get("reminder") or "0",
+        "category": row.get("category") or "event",
+        "description": row.get("description") or "",
+        "appt_id": row.get("appt_id") or ""
+    }
+
+
+def file_stamp(path):
+    """(mtime, size) of a file, None if it does not exist; size catches writes within the mtime resolution."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` (created if missing) across processes."""
+    with open(path, "a+b") as f:
+        if msvcrt:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)   # Retries for up to 10 seconds
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ---------------- Backend ----------------
+class CsvBackend(StorageBackend):
+    """
+    The original flat files under data/:
+
+      users.txt                 student_id,username,password (or username,password)
+      users.seq                 last student ID handed out (guarded by users.seq.lock)
+      bookings.csv              active bookings, append-only between compactions
+      cancelled_journal.csv     cancellations not yet folded into the two files below
+      cancelled_bookings.csv    cancelled bookings
+      bookings_compact.txt      marks a journal compaction being applied
+      {user}_events.csv         timetable events (as of the last compaction)
+      {user}_events.log         event adds/edits/deletes since then, append-only
+      events_commit.txt         users of a multi-user event commit being applied
+      {user}_reminder.csv       reminders
+    """
+
+    name = "csv"
+
+    def __init__(self, data_dir="data", threshold=COMPACT_THRESHOLD, event_threshold=EVENT_COMPACT_THRESHOLD):
+        self.data_dir = data_dir
+        os.makedirs(data_dir, exist_ok=True)
+        self.users_file = os.path.join(data_dir, "users.txt")
+        self.seq_file = os.path.join(data_dir, "users.seq")
+        self._id_lock = threading.Lock()
+        self.bookings_file = os.path.join(data_dir, "bookings.csv")
+        self.cancelled_file = os.path.join(data_dir, "cancelled_bookings.csv")
+        self.journal_file = os.path.join(data_dir, "cancelled_journal.csv")
+        self.compact_file = os.path.join(data_dir, "bookings_compact.txt")
+        self.threshold = threshold
+        self._booking_rows = None  # Data rows in bookings.csv (row number of the next append)
+        self._pending = 0          # Journal entries not yet compacted
+        self._bookings_lock = threading.RLock()  # Compaction vs. reading the booking files
+        self.event_threshold = event_threshold
+        self._event_log_rows = {}  # user -> rows in {user}_events.log
+        self.commit_file = os.path.join(data_dir, "events_commit.txt")
+        self._events_lock = threading.RLock()  # Commits and their recovery vs. reading event files
+
+    def events_file(self, user):
+        return os.path.join(self.data_dir, f"{user}_events.csv")
+
+    def reminders_file(self, user):
+        return os.path.join(self.data_dir, f"{user}_reminder.csv")
+
+    def _users_with(self, suffix):
+        """Usernames that have a data/{user}{suffix} file."""
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(n[:-len(suffix)] for n in os.listdir(self.data_dir) if n.endswith(suffix))
+
+    def event_users(self):
+        return sorted(set(self._users_with("_events.csv")) | set(self._users_with("_events.log")))
+
+    def reminder_users(self):
+        return self._users_with("_reminder.csv")
+
+    # ----- users -----
+    def ensure_users_file(self):
+        if not os.path.exists(self.users_file):
+            os.makedirs(os.path.dirname(self.users_file) or ".", exist_ok=True)
+            open(self.users_file, "w").close()
+
+    def read_users(self):
+        self.ensure_users_file()
+        users = []
+        with open(self.users_file, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split(",")
+                if len(parts) == 3:            # New format: id, username, password
+                    users.append((parts[0], parts[1], parts[2]))
+                elif len(parts) == 2:          # Old format fallback: username, password
+                    users.append((LEGACY_STUDENT_ID, parts[0], parts[1]))
+        return users
+
+    def append_user(self, student_id, username, password):
+        self.append_users([(student_id, username, password)])
+
+    def append_users(self, users):
+        self.ensure_users_file()
+        lines = "".join(f"{sid},{username},{password}\n" for sid, username, password in users)
+        with open(self.users_file, "a", encoding="utf-8") as f:
+            f.write(lines)                     # One buffered write for the whole batch
+
+    def next_student_ids(self, count=1):
+        """
+        Reserve IDs from the users.seq high-water mark instead of scanning users.txt.
+        The first call seeds the mark from users.txt; the lock file keeps two
+        registrations (threads or processes) from getting the same ID.
+        """
+        self.ensure_users_file()
+        with self._id_lock, file_lock(self.seq_file + ".lock"):
+            try:
+                with open(self.seq_file, "r", encoding="utf-8") as f:
+                    last = int(f.read().strip())
+            except (FileNotFoundError, ValueError):
+                last = highest_student_id(self.read_users())
+            tmp = self.seq_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(f"{last + count}\n")
+            os.replace(tmp, self.seq_file)
+        return [format_student_id(last + i) for i in range(1, count + 1)]
+
+    def users_stamp(self):
+        return file_stamp(self.users_file)
+
+    # ----- bookings -----
+    def init_bookings(self):
+        if not os.path.exists(self.bookings_file):
+            with open(self.bookings_file, "w", newline="", encoding="utf-8") as f:
+                csv.DictWriter(f, fieldnames=BOOKING_FIELDS).writeheader()
+
+    def load_bookings(self):
+        with self._bookings_lock:
+            self._recover_bookings()
+            rows = read_csv(self.bookings_file)
+            entries = read_csv(self.journal_file)
+        self._booking_rows = len(rows)
+        self._pending = len(entries)
+        dropped = set()
+        for entry in entries:
+            for pos in filter(None, entry.get("rows", "").split(";")):
+                i = int(pos)
+                # Only drop the row if it is still the one that was cancelled
+                if i < len(rows) and same_booking(rows[i], entry):
+                    dropped.add(i)
+        return [(i, row) for i, row in enumerate(rows) if i not in dropped]
+
+    def load_cancelled(self):
+        with self._bookings_lock:          # The cancelled list may be loaded while bookings compact
+            self._recover_bookings()
+            rows = read_csv(self.cancelled_file) + read_csv(self.journal_file)
+        return [{k: r.get(k, "") for k in BOOKING_FIELDS} for r in rows]
+
+    def append_booking(self, booking):
+        if self._booking_rows is None:
+            self._booking_rows = len(read_csv(self.bookings_file))
+        append_csv(self.bookings_file, BOOKING_FIELDS, [booking])
+        key = self._booking_rows
+        self._booking_rows += 1
+        return key
+
+    def cancel_booking(self, booking, keys):
+        entry = {k: booking.get(k, "") for k in BOOKING_FIELDS}
+        entry["rows"] = ";".join(str(k) for k in keys)
+        append_csv(self.journal_file, JOURNAL_FIELDS, [entry])
+        self._pending += 1
+
+    def compaction_due(self):
+        return self._pending >= self.threshold
+
+    def compact_bookings(self, live):
+        """
+        Fold the journal into the two booking files, as one write-ahead commit:
+
+          1. the new bookings.csv and cancelled_bookings.csv are written as .staged files
+          2. bookings_compact.txt is renamed into place: the commit point
+          3. both staged files are renamed over the originals, then the journal is removed
+          4. bookings_compact.txt is removed
+
+        A crash before step 2 leaves the old files and journal untouched; after
+        it, the next load finishes steps 3-4. The journal's row positions are
+        therefore never applied to a rewritten bookings.csv, and its entries
+        reach the cancelled history exactly once.
+        """
+        with self._bookings_lock:
+            self._recover_bookings()
+            entries = read_csv(self.journal_file)
+            if not entries:
+                return None
+            cancelled = read_csv(self.cancelled_file) + entries
+            write_synced(self.bookings_file + ".staged", csv_text(BOOKING_FIELDS, live))
+            write_synced(self.cancelled_file + ".staged", csv_text(BOOKING_FIELDS, cancelled))
+            tmp = self.compact_file + ".tmp"
+            write_synced(tmp, f"{len(entries)}\n")
+            os.replace(tmp, self.compact_file)
+            self._recover_bookings()
+            self._booking_rows = len(live)     # Row numbers restart from the rewritten file
+            self._pending = 0
+        return list(enumerate(live))
+
+    def _recover_bookings(self):
+        """Finish a compaction interrupted after its commit point, drop one that was not (caller holds _bookings_lock)."""
+        staged = [self.bookings_file + ".staged", self.cancelled_file + ".staged"]
+        if os.path.exists(self.compact_file):
+            for path in staged:
+                if os.path.exists(path):
+                    os.replace(path, path[:-len(".staged")])
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)   # Already part of the staged files
+            os.remove(self.compact_file)
+        else:
+            for path in staged:
+                if os.path.exists(path):
+                    os.remove(path)            # Left by a compaction that never reached its commit point
+
+    # ----- timetable events -----
+    def events_log(self, user):
+        return os.path.join(self.data_dir, f"{user}_events.log")
+
+    def load_events(self, user):
+        with self._events_lock:                # Never read a file pair a commit is swapping
+            self._recover_events()
+            rows = read_csv(self.events_file(user))
+            log = read_csv(self.events_log(user))
+        events = {}                            # id -> event, in file order
+        for row in rows:
+            e = parse_event(row)
+            if e is not None:
+                events[e["id"]] = e
+        for row in log:                        # Replay changes made since the last compaction
+            if row.get("op") == "del":
+                events.pop(int(row["id"]), None)
+            else:
+                e = parse_event(row)
+                if e is not None:
+                    events[e["id"]] = e        # New event, or an edit that keeps its place
+        self._event_log_rows[user] = len(log)
+        if log and any(k not in log[0] for k in EVENT_LOG_FIELDS):
+            with self._events_lock:
+                self.save_events(user, list(events.values()))  # Older column layout: fold it in before appending
+        return list(events.values())
+
+    def save_events(self, user, events):
+        rows = [{**e, "description": e.get("description", "")} for e in events]
+        write_csv(self.events_file(user), EVENT_FIELDS, rows)
+        if os.path.exists(self.events_log(user)):
+            os.remove(self.events_log(user))   # The rewritten file already holds every change
+        self._event_log_rows[user] = 0
+
+    def commit_events(self, changes):
+        """
+        Write-ahead commit over several users' files:
+
+          1. each user's new event list is written to {user}_events.csv.staged
+          2. events_commit.txt naming those users is renamed into place: the commit point
+          3. every staged file is renamed over {user}_events.csv and its log removed
+          4. events_commit.txt is removed
+
+        A crash before step 2 leaves only staged files, which the next commit
+        discards; after it, the next load finishes steps 3-4, so no user is ever
+        left half-written. Commits, recovery and event reads in this process
+        take turns on one lock.
+        """
+        with self._events_lock:
+            self._recover_events()
+            for user in self._users_with("_events.csv.staged"):
+                os.remove(self._staged_file(user))    # Left by a commit that never reached step 2
+            for user, events in changes.items():
+                rows = [{**e, "description": e.get("description", "")} for e in events]
+                write_synced(self._staged_file(user), csv_text(EVENT_FIELDS, rows))
+            tmp = self.commit_file + ".tmp"
+            write_synced(tmp, "".join(f"{user}\n" for user in changes))
+            os.replace(tmp, self.commit_file)
+            self._recover_events()
+
+    def _staged_file(self, user):
+        return self.events_file(user) + ".staged"
+
+    def _recover_events(self):
+        """Finish a commit that was interrupted after its commit point (caller holds _events_lock)."""
+        if os.path.exists(self.commit_file):
+            with open(self.commit_file, "r", encoding="utf-8") as f:
+                users = [line.rstrip("\n") for line in f if line.strip()]
+            for user in users:
+                if os.path.exists(self._staged_file(user)):
+                    os.replace(self._staged_file(user), self.events_file(user))
+                if os.path.exists(self.events_log(user)):
+                    os.remove(self.events_log(user))  # Already part of the staged file
+                self._event_log_rows[user] = 0
+            os.remove(self.commit_file)
+
+    def _log_event(self, user, op, event):
+        append_csv(self.events_log(user), EVENT_LOG_FIELDS, [{**event, "op": op}])
+        self._event_log_rows[user] = self._event_log_rows.get(user, 0) + 1
+
+    def append_event(self, user, event):
+        self._log_event(user, "put", event)
+
+    def update_event(self, user, event):
+        self._log_event(user, "put", event)
+
+    def delete_event(self, user, eid):
+        self._log_event(user, "del", {"id": eid})
+
+    def events_compaction_due(self, user):
+        return self._event_log_rows.get(user, 0) >= self.event_threshold
+
+    def compact_events(self, user, events):
+        self.save_events(user, events)
+
+    def events_stamp(self, user):
+        return (file_stamp(self.events_file(user)), file_stamp(self.events_log(user)))
+
+    # ----- reminders -----
+    def load_reminders(self, user):
+        reminders = []
+        for row in read_csv(self.reminders_file(user), encoding="utf-8-sig"):
+            if not row or not row.get("datetime"):
+                continue
+            reminders.append({
+                "id": int(row.get("id") or len(reminders)),
+                "task": row.get("task", ""),
+                "datetime": row["datetime"],
+                "status": row.get("status") or "Pending",
+                "repeat": row.get("repeat") or "None"
+            })
+        return reminders
+
+    def save_reminders(self, user, reminders):
+        rows = [
+            {**r, "id": r.get("id", i), "repeat": r.get("repeat", "None")}
+            for i, r in enumerate(reminders)
+        ]
+        write_csv(self.reminders_file(user), REMINDER_FIELDS, rows)
@@ -0,0 +1,82 @@
+# File: storage/importer.py
+"""
+One-shot copy of the CSV/text data files into the SQLite database.
+
+    python -m storage.importer [--data data] [--db data/assistant.db] [--force]
+
+Run it from the folder that holds data/. The import happens in a single
+transaction; an existing non-empty database is left alone unless --force
+is given, in which case its tables are emptied first.
+"""
+import argparse                            # Import argparse for the command line
+import os                                  # Import os for the default paths
+from .base import BOOKING_FIELDS, EVENT_FIELDS, REMINDER_FIELDS
+from .csv_backend import CsvBackend
+from .sqlite_backend import SqliteBackend, BOOKING_COLUMNS, BOOKING_PLACEHOLDERS
+
+TABLES = ["users", "bookings", "events", "reminders"]
+
+
+def import_csv_data(source: CsvBackend, target: SqliteBackend, force=False):
+    """Copy everything from `source` into `target`; return {table: rows imported}."""
+    counts = dict.fromkeys(TABLES, 0)
+    with target.transaction() as db:
+        existing = sum(db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in TABLES)
+        if existing and not force:
+            raise RuntimeError(f"{target.path} already holds data; use --force to replace it.")
+        for t in TABLES:
+            db.execute(f"DELETE FROM {t}")
+        db.execute("DELETE FROM counters")     # Student IDs are re-seeded from the imported users
+
+        users = source.read_users()
+        db.executemany("INSERT INTO users (student_id, username, password) VALUES (?, ?, ?)", users)
+        counts["users"] = len(users)
+
+        insert_booking = f"INSERT INTO bookings ({BOOKING_COLUMNS}, cancelled_seq) VALUES ({BOOKING_PLACEHOLDERS}, ?)"
+        active = [row for _, row in source.load_bookings()]
+        cancelled = source.load_cancelled()
+        db.executemany(insert_booking, [[b.get(k, "") for k in BOOKING_FIELDS] + [None] for b in active])
+        db.executemany(insert_booking, [[b.get(k, "") for k in BOOKING_FIELDS] + [i]
+                                        for i, b in enumerate(cancelled, start=1)])
+        counts["bookings"] = len(active) + len(cancelled)
+
+        for user in source.event_users():
+            events = source.load_events(user)
+            db.executemany(
+                f"INSERT OR REPLACE INTO events (username, {', '.join(EVENT_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' for _ in EVENT_FIELDS)})",
+                [[user] + [e.get(k, "") for k in EVENT_FIELDS] for e in events]
+            )
+            counts["events"] += len(events)
+
+        for user in source.reminder_users():
+            reminders = source.load_reminders(user)
+            db.executemany(
+                f"INSERT OR REPLACE INTO reminders (username, {', '.join(REMINDER_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' for _ in REMINDER_FIELDS)})",
+                [[user] + [r.get(k, "") for k in REMINDER_FIELDS] for r in reminders]
+            )
+            counts["reminders"] += len(reminders)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import the CSV data files into SQLite.")
+    parser.add_argument("--data", default="data", help="folder holding the CSV/text files")
+    parser.add_argument("--db", default=os.path.join("data", "assistant.db"), help="SQLite database to fill")
+    parser.add_argument("--force", action="store_true", help="replace data already in the database")
+    args = parser.parse_args(argv)
+
+    target = SqliteBackend(args.db)
+    try:
+        counts = import_csv_data(CsvBackend(args.data), target, force=args.force)
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        target.close()
+    for table, n in counts.items():
+        print(f"{table:<10} {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# File: storage/sqlite_backend.py
+
+import os                                  # Import os for the database path
+import sqlite3                             # Import sqlite3 for the database
+import threading                           # Import threading to share one connection safely
+from .base import (
+    StorageBackend, BOOKING_FIELDS, EVENT_FIELDS, REMINDER_FIELDS,
+    FIRST_STUDENT_ID, format_student_id
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,   -- registration order
+    student_id TEXT NOT NULL,
+    username   TEXT NOT NULL,
+    password   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_username ON users(username);
+CREATE INDEX IF NOT EXISTS users_student_id ON users(student_id);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,                         -- e.g. 'student_id'
+    value INTEGER NOT NULL                          -- last value handed out
+);
+
+CREATE TABLE IF NOT EXISTS bookings (
+    id            INTEGER PRIMARY KEY,              -- booking key
+    venue         TEXT NOT NULL,
+    room          TEXT NOT NULL,
+    date          TEXT NOT NULL,
+    start         TEXT NOT NULL,
+    "end"         TEXT NOT NULL,
+    pax           TEXT NOT NULL DEFAULT '',
+    owner_id      TEXT NOT NULL DEFAULT '',
+    owner_name    TEXT NOT NULL DEFAULT '',
+    members       TEXT NOT NULL DEFAULT '',
+    cancelled_seq INTEGER                           -- NULL while active, else cancellation order
+);
+CREATE INDEX IF NOT EXISTS bookings_slot ON bookings(venue, room, date);
+CREATE INDEX IF NOT EXISTS bookings_date ON bookings(date);
+CREATE INDEX IF NOT EXISTS bookings_owner ON bookings(owner_id);
+CREATE INDEX IF NOT EXISTS bookings_cancelled ON bookings(cancelled_seq);
+
+CREATE TABLE IF NOT EXISTS events (
+    username    TEXT NOT NULL,
+    id          INTEGER NOT NULL,
+    date        TEXT NOT NULL,
+    start_time  TEXT NOT NULL,
+    end_time    TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    reminder    TEXT NOT NULL DEFAULT '0',
+    category    TEXT NOT NULL DEFAULT 'event',
+    description TEXT NOT NULL DEFAULT '',
+    appt_id     TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (username, id)
+);
+CREATE INDEX IF NOT EXISTS events_user_date ON events(username, date);
+
+CREATE TABLE IF NOT EXISTS reminders (
+    username TEXT NOT NULL,
+    id       INTEGER NOT NULL,
+    task     TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    status   TEXT NOT NULL DEFAULT 'Pending',
+    repeat   TEXT NOT NULL DEFAULT 'None',
+    PRIMARY KEY (username, id)
+);
+CREATE INDEX IF NOT EXISTS reminders_user_status ON reminders(username, status);
+"""
+
+BOOKING_COLUMNS = ", ".join(f'"{c}"' for c in BOOKING_FIELDS)
+BOOKING_PLACEHOLDERS = ", ".join("?" for _ in BOOKING_FIELDS)
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Everything in one SQLite database (data/assistant.db) in WAL mode.
+
+    Whole-list saves (events, reminders) replace a user's rows inside one
+    transaction, so other windows never see a half-written list.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path=os.path.join("data", "assistant.db")):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created."""
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(events)")}
+        if "appt_id" not in columns:
+            self._conn.execute("ALTER TABLE events ADD COLUMN appt_id TEXT NOT NULL DEFAULT ''")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def transaction(self):
+        """Context manager: one IMMEDIATE transaction on the shared connection."""
+        return _Transaction(self)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----- users -----
+    def read_users(self):
+        rows = self._query("SELECT student_id, username, password FROM users ORDER BY seq")
+        return [(r["student_id"], r["username"], r["password"]) for r in rows]
+
+    def append_user(self, student_id, username, password):
+        self.append_users([(student_id, username, password)])
+
+    def append_users(self, users):
+        with self.transaction() as db:
+            db.executemany("INSERT INTO users (student_id, username, password) VALUES (?, ?, ?)", users)
+
+    def next_student_ids(self, count=1):
+        with self.transaction() as db:         # IMMEDIATE: one allocator at a time
+            row = db.execute("SELECT value FROM counters WHERE name = 'student_id'").fetchone()
+            if row:
+                last = row[0]
+            else:                              # First use: seed from the numeric IDs already stored
+                last = db.execute(
+                    "SELECT MAX(COALESCE(MAX(CAST(student_id AS INTEGER)), 0), ?) FROM users "
+                    "WHERE student_id <> '' AND student_id NOT GLOB '*[^0-9]*'",
+                    (FIRST_STUDENT_ID - 1,)
+                ).fetchone()[0]
+            db.execute("INSERT OR REPLACE INTO counters (name, value) VALUES ('student_id', ?)", (last + count,))
+        return [format_student_id(last + i) for i in range(1, count + 1)]
+
+    def users_stamp(self):
+        row = self._query("SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM users")[0]
+        return (row[0], row[1])  # Users are only ever appended
+
+    # ----- bookings -----
+    def init_bookings(self):
+        pass  # Tables are created on connect
+
+    def load_bookings(self):
+        rows = self._query(f"SELECT id, {BOOKING_COLUMNS} FROM bookings WHERE cancelled_seq IS NULL ORDER BY id")
+        return [(r["id"], {k: r[k] for k in BOOKING_FIELDS}) for r in rows]
+
+    def load_cancelled(self):
+        rows = self._query(f"SELECT {BOOKING_COLUMNS} FROM bookings WHERE cancelled_seq IS NOT NULL "
+                           f"ORDER BY cancelled_seq, id")
+        return [{k: r[k] for k in BOOKING_FIELDS} for r in rows]
+
+    def append_booking(self, booking):
+        with self.transaction() as db:
+            cur = db.execute(f"INSERT INTO bookings ({BOOKING_COLUMNS}) VALUES ({BOOKING_PLACEHOLDERS})",
+                             [booking.get(k, "") for k in BOOKING_FIELDS])
+            return cur.lastrowid
+
+    def cancel_booking(self, booking, keys):
+        with self.transaction() as db:
+            seq = db.execute("SELECT COALESCE(MAX(cancelled_seq), 0) + 1 FROM bookings").fetchone()[0]
+            if keys:
+                db.executemany("UPDATE bookings SET cancelled_seq = ? WHERE id = ?", [(seq, k) for k in keys])
+            else:
+                # Nothing active matched: still keep the cancellation in history
+                db.execute(f"INSERT INTO bookings ({BOOKING_COLUMNS}, cancelled_seq) "
+                           f"VALUES ({BOOKING_PLACEHOLDERS}, ?)",
+                           [booking.get(k, "") for k in BOOKING_FIELDS] + [seq])
+
+    # ----- timetable events -----
+    def load_events(self, user):
+        rows = self._query(f"SELECT {', '.join(EVENT_FIELDS)} FROM events WHERE username = ? ORDER BY rowid",
+                           (user,))
+        return [dict(r) for r in rows]
+
+    def save_events(self, user, events):
+        with self.transaction() as db:
+            db.execute("DELETE FROM events WHERE username = ?", (user,))
+            db.executemany(
+                f"INSERT INTO events (username, {', '.join(EVENT_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' for _ in EVENT_FIELDS)})",
+                [[user] + [e.get(k, "") for k in EVENT_FIELDS] for e in events]
+            )
+
+    def commit_events(self, changes):
+        with self.transaction() as db:         # One transaction for every user
+            for user, events in changes.items():
+                db.execute("DELETE FROM events WHERE username = ?", (user,))
+                db.executemany(
+                    f"INSERT INTO events (username, {', '.join(EVENT_FIELDS)}) "
+                    f"VALUES (?, {', '.join('?' for _ in EVENT_FIELDS)})",
+                    [[user] + [e.get(k, "") for k in EVENT_FIELDS] for e in events]
+                )
+
+    def append_event(self, user, event):
+        with self.transaction() as db:
+            db.execute(f"INSERT INTO events (username, {', '.join(EVENT_FIELDS)}) "
+                       f"VALUES (?, {', '.join('?' for _ in EVENT_FIELDS)})",
+                       [user] + [event.get(k, "") for k in EVENT_FIELDS])
+
+    def update_event(self, user, event):
+        fields = [k for k in EVENT_FIELDS if k != "id"]
+        with self.transaction() as db:
+            db.execute(f"UPDATE events SET {', '.join(f'{k} = ?' for k in fields)} WHERE username = ? AND id = ?",
+                       [event.get(k, "") for k in fields] + [user, event["id"]])
+
+    def delete_event(self, user, eid):
+        with self.transaction() as db:
+            db.execute("DELETE FROM events WHERE username = ? AND id = ?", (user, eid))
+
+    def events_stamp(self, user):
+        # Bumped by commits from other connections; our own writes go through the caller's cache
+        return self._query("PRAGMA data_version")[0][0]
+
+    # ----- reminders -----
+    def load_reminders(self, user):
+        rows = self._query(f"SELECT {', '.join(REMINDER_FIELDS)} FROM reminders WHERE username = ? ORDER BY rowid",
+                           (user,))
+        return [dict(r) for r in rows]
+
+    def save_reminders(self, user, reminders):
+        with self.transaction() as db:
+            db.execute("DELETE FROM reminders WHERE username = ?", (user,))
+            db.executemany(
+                f"INSERT INTO reminders (username, {', '.join(REMINDER_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' for _ in REMINDER_FIELDS)})",
+                [[user, r.get("id", i), r["task"], r["datetime"], r["status"], r.get("repeat", "None")]
+                 for i, r in enumerate(reminders)]
+            )
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK while holding the backend lock."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __enter__(self):
+        self.backend._lock.acquire()
+        self.backend._conn.execute("BEGIN IMMEDIATE")
+        return self.backend._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.backend._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.backend._lock.release()
+        return False
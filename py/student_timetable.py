@@ -1,72 +1,25 @@
 import tkinter as tk  # Import tkinter GUI library
 from tkinter import ttk, messagebox  # Import themed widgets and message boxes
 import os  # Import OS module for file operations
-import csv  # Import CSV module to read/write CSV files
 from datetime import datetime  # Import datetime module for date and time handling
 from PIL import Image, ImageTk  # Import Pillow for image handling
 from simple_reminder import open_reminder  # Import function to open reminder window
-DATA_DIR = "data"  # Define directory to store user data
-os.makedirs(DATA_DIR, exist_ok=True)  # Create data directory if it doesn't exist
+from reminder_service import load_reminders, save_reminders  # Shared reminder cache (same as the reminder window)
+from reminder_archive import last_archived_id  # Highest archived reminder ID (never reused)
+from event_cache import EVENTS, to_minutes  # Import shared per-date events cache
+import appointments  # Import group appointment booking/cancelling
 
 # =========================================================
 
 # =========================================================
-def get_user_events_file(username):
-    return os.path.join("data", f"{username}_events.csv")  # Return file path for user's events CSV
-
 def load_events(user, date=None):
     """load event"""
-    events = []  # Initialize empty list of events
-    file = get_user_events_file(user)  # Get CSV file path for the user
-    if not os.path.exists(file):  # If file doesn't exist
-        return events  # Return empty list
-
-    with open(file, "r", encoding="utf-8") as f:  # Open CSV file in read mode
-        reader = csv.DictReader(f)  # Read rows as dictionaries
-        for row in reader:  # Loop through each row
-            start_time_str = row["start_time"]  # Get start time string
-
-            
-            if ":" in start_time_str:  # If format is HH:MM
-                start = start_time_str  # Keep as is
-            elif "," in start_time_str:  # If format is H,M
-                h, m = start_time_str.split(",")  # Split by comma
-                start = f"{int(h):02d}:{int(m):02d}"  # Convert to HH:MM
-            else:
-                continue  # Skip invalid format
-
-            events.append({  # Append event to list
-                "id": int(row["id"]),  # Event ID
-                "date": row["date"],  # Event date
-                "start_time": start,  # Start time in HH:MM
-                "end_time": row["end_time"],  # End time
-                "title": row["title"],  # Event title
-                "reminder": row.get("reminder", "0"),  # Reminder flag
-                "category": row.get("category", "event"),  # Event category
-                "description": row.get("description", "")  # Event description
-            })
-
     if date:  # If date filter is provided
-        events = [e for e in events if e["date"] == date]  # Filter events by date
-    return events  # Return list of events
-
-def save_events(username, events):
-    """保存某用户的所有事件"""
-    file = get_user_events_file(username)  # Get CSV file path
-    with open(file, "w", newline="", encoding="utf-8") as f:  # Open file in write mode
-        writer = csv.writer(f)  # Create CSV writer
-        writer.writerow(["id", "date", "start_time", "end_time", "title", "reminder", "category","description"])  # Write header
-        for e in events:  # Loop through events
-            writer.writerow([  # Write event data
-                e["id"], e["date"], e["start_time"], e["end_time"],
-                e["title"], e["reminder"], e["category"],e.get("description","")
-            ])
+        return EVENTS.day(user, date)  # Only that day's events, earliest first
+    return EVENTS.all(user)  # Return list of all events
 
 def add_event_txt(username, date, start, end, title, category="event",description=""):
-    events = load_events(username)  # Load existing events
-    eid = max([e["id"] for e in events], default=0) + 1  # Generate new event ID
-    events.append({  # Append new event
-        "id": eid,
+    return EVENTS.add(username, {  # Store new event (ID assigned by the cache)
         "date": date,
         "start_time": start,
         "end_time": end,
@@ -75,49 +28,19 @@ def add_event_txt(username, date, start, end, title, category="event",descriptio
         "category": category,
         "description" : description
     })
-    save_events(username, events)  # Save updated events
 
 def update_event_txt(username, eid, title, start, end, category,description):
-    events = load_events(username)  # Load existing events
-    for e in events:  # Find the event by ID
-        if e["id"] == eid:
-            e["title"] = title  # Update title
-            e["start_time"] = start  # Update start time
-            e["end_time"] = end  # Update end time
-            e["category"] = category  # Update category
-            e["description"] = description  # Update description
-            break
-    save_events(username, events)  # Save updated events
+    EVENTS.update(username, eid, title=title, start_time=start, end_time=end,
+                  category=category, description=description)  # Update the event by ID
 
 def delete_event_txt(username, eid):
-    events = load_events(username)  # Load existing events
-    events = [e for e in events if e["id"] != eid]  # Remove event by ID
-    save_events(username, events)  # Save updated events
+    EVENTS.delete(username, eid)  # Remove event by ID
 
 # =========================================================
-# Appointment Delete (check delete of two person)
+# Appointment Delete (every participant at once)
 # =========================================================
 def delete_appointment(current_user, event):
-    title = event["title"]  # Get event title
-    date = event["date"]  # Get event date
-    start = event["start_time"]  # Get start time
-    end = event["end_time"]  # Get end time
-
-    delete_event_txt(current_user, event["id"])  # Delete current user's event
-
-    if title.startswith("Appointment with "):  # Check if it is an appointment
-        other_user = title.replace("Appointment with ", "").strip()  # Extract other user
-        other_events = load_events(other_user)  # Load other user's events
-        for ev in other_events:  # Loop through other user's events
-            expected_title = f"Appointment with {current_user}"  # Expected reciprocal title
-            if (
-                ev["date"] == date
-                and ev["start_time"] == start
-                and ev["end_time"] == end
-                and ev["title"] == expected_title
-            ):
-                delete_event_txt(other_user, ev["id"])  # Delete reciprocal event
-                break
+    appointments.cancel(current_user, event)  # Delete every participant's copy (matched by appt_id) at once
 
 # =========================================================
 # Reminder 
@@ -125,39 +48,9 @@ def delete_appointment(current_user, event):
 # =========================================================
 # Reminder CSV
 # =========================================================
-def get_user_reminders_file(username):
-    return os.path.join(DATA_DIR, f"{username}_reminder.csv")  # Return path to user's reminder CSV
-
-def load_reminders(username):
-    reminders = []  # Initialize empty list
-    file = get_user_reminders_file(username)  # Get file path
-    if not os.path.exists(file):  # If file does not exist
-        return reminders  # Return empty list
-
-    with open(file, "r", encoding="utf-8-sig") as f:  # Open CSV with BOM-safe encoding
-        reader = csv.DictReader(f)  # Read rows as dicts
-        for i, row in enumerate(reader, start=1):  # Loop with default index
-            if not row:  # Skip empty rows
-                continue
-            reminders.append({  # Append reminder
-                "id": int(row.get("id", i)),  # Use CSV ID or default index
-                "task": row.get("task", ""),  # Reminder task
-                "datetime": row.get("datetime", ""),  # Date and time string
-                "status": row.get("status", "Pending")  # Status
-            })
-    return reminders  # Return reminders list
-
-def save_reminders(username, reminders):
-    file = get_user_reminders_file(username)  # Get file path
-    with open(file, "w", newline="", encoding="utf-8") as f:  # Open file to write
-        writer = csv.writer(f)  # CSV writer
-        writer.writerow(["id", "task", "datetime", "status"])  # Write header
-        for r in reminders:  # Loop through reminders
-            writer.writerow([r["id"], r["task"], r["datetime"], r["status"]])  # Write row
-
 def add_reminder(username, task, dt_str):
     reminders = load_reminders(username)  # Load existing reminders
-    rid = max([r["id"] for r in reminders], default=0) + 1  # Generate new reminder ID
+    rid = max([r["id"] for r in reminders] + [last_archived_id(username)], default=0) + 1  # New ID, above archived ones too
     reminders.append({  # Append new reminder
         "id": rid,
         "task": task,
@@ -174,7 +67,7 @@ def update_reminder_status(username, rid, status):
             break
     save_reminders(username, reminders)  # Save changes
 
-def toggle_reminder(username, event, all_events):
+def toggle_reminder(username, event):
     # click the reminder
     reminders = load_reminders(username)  # Load reminders
     dt_str = datetime.strptime(
@@ -195,8 +88,8 @@ def toggle_reminder(username, event, all_events):
         save_reminders(username, reminders)  # Save
         event["reminder"] = "0"  # Update event flag
 
-    # save title CSV
-    save_events(username, all_events)  # Save events
+    # save the event's reminder flag
+    EVENTS.update(username, event["id"], reminder=event["reminder"])  # Save only this event
 
 # =========================================================
 # Time
@@ -379,7 +272,7 @@ class TimetableApp:
                 action_frame, text="🔔 Reminder",
                 variable=var, bg=bg_color,
                 command=lambda ev=e, v=var: (
-                    toggle_reminder(self.current_user, ev, events),
+                    toggle_reminder(self.current_user, ev),
                     self.redraw()
                 )
             )
@@ -396,8 +289,7 @@ class TimetableApp:
         self.event_popup()
 
     def edit_event_popup(self, eid):
-        events = load_events(self.current_user, self.date_var.get())
-        event = next((ev for ev in events if ev["id"] == eid), None)
+        event = EVENTS.get(self.current_user, eid)
         if event:
             self.event_popup(event)
 
@@ -490,21 +382,15 @@ class TimetableApp:
                 messagebox.showerror("Error", "Start time must be before end time.")
                 return
 
-            events = load_events(self.current_user, self.date_var.get())
-            for ev in events:
-                if event and ev["id"] == event["id"]:
-                    continue  
-
-                ev_start = ev["start_time"]
-                ev_end   = ev["end_time"]
-
-                # Check if time tumplica
-                if not (end <= ev_start or start >= ev_end):
-                    messagebox.showerror(
-                        "Error",
-                        f"Time conflict with existing event:\n{ev['title']} ({ev_start} - {ev_end})"
-                    )
-                    return
+            # Check if time tumplica (only that day's events, by minute offset)
+            ev = EVENTS.conflict(self.current_user, self.date_var.get(), to_minutes(start), to_minutes(end),
+                                 ignore_id=event["id"] if event else None)
+            if ev:
+                messagebox.showerror(
+                    "Error",
+                    f"Time conflict with existing event:\n{ev['title']} ({ev['start_time']} - {ev['end_time']})"
+                )
+                return
                     
             title = title_var.get().strip()
             category = category_var.get().strip()
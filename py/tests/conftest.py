@@ -0,0 +1,19 @@
+# File: tests/conftest.py
+# The app imports its modules flat from py/ (run from that folder), so the tests do the same.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage                              # noqa: E402  (needs the path above)
+from storage.csv_backend import CsvBackend  # noqa: E402
+
+
+@pytest.fixture
+def csv_backend(tmp_path, monkeypatch):
+    """A CsvBackend on an empty data folder, installed as the process-wide backend."""
+    backend = CsvBackend(str(tmp_path))
+    monkeypatch.setattr(storage, "_backend", backend)
+    return backend
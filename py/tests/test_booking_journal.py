@@ -0,0 +1,113 @@
+# File: tests/test_booking_journal.py
+import os
+import time
+
+import storage
+from room_booking.booking_store import ActiveBookingStore, CancelledBookingStore
+from storage.csv_backend import CsvBackend, csv_text, read_csv, write_synced, BOOKING_FIELDS, JOURNAL_FIELDS
+
+
+def booking(owner, start="9:00 AM", end="10:00 AM", room="R1"):
+    return {"venue": "Library", "room": room, "date": "2026-03-02", "start": start, "end": end,
+            "pax": "2", "owner_id": owner, "owner_name": f"name{owner}", "members": ""}
+
+
+def stores():
+    cancelled = CancelledBookingStore()
+    return ActiveBookingStore(cancelled), cancelled
+
+
+def owners(rows):
+    return [r["owner_id"] for r in rows]
+
+
+def wait_for_compaction(store):
+    deadline = time.time() + 5
+    while store._compacting and time.time() < deadline:
+        time.sleep(0.01)
+    assert not store._compacting
+
+
+def test_cancel_survives_a_reload(csv_backend):
+    active, _ = stores()
+    for owner in "123":
+        active.append(booking(owner, room=f"R{owner}"))
+    active.cancel(booking("2", room="R2"))
+    assert os.path.exists(csv_backend.journal_file)
+
+    active, cancelled = stores()                   # Fresh stores read bookings.csv + the journal
+    assert owners(active.all()) == ["1", "3"]
+    assert owners(cancelled.all()) == ["2"]
+
+
+def test_compaction_past_the_threshold(tmp_path, monkeypatch):
+    backend = CsvBackend(str(tmp_path), threshold=3)
+    monkeypatch.setattr(storage, "_backend", backend)
+    active, cancelled = stores()
+    for owner in "123456":
+        active.append(booking(owner, room=f"R{owner}"))
+    for owner in "135":
+        active.cancel(booking(owner, room=f"R{owner}"))
+    wait_for_compaction(active)
+
+    assert not os.path.exists(backend.journal_file)
+    assert owners(read_csv(backend.bookings_file)) == ["2", "4", "6"]
+    assert owners(read_csv(backend.cancelled_file)) == ["1", "3", "5"]
+    active.append(booking("7", room="R7"))         # Row numbers restart from the rewritten file
+    active.cancel(booking("4", room="R4"))
+    fresh, fresh_cancelled = stores()
+    assert owners(fresh.all()) == ["2", "6", "7"]
+    assert owners(fresh_cancelled.all()) == ["1", "3", "5", "4"]
+
+
+def prepare_compaction(backend):
+    """bookings.csv with rows 1, 2, 3 and a journal cancelling row 1 (owner 2)."""
+    backend.init_bookings()
+    for owner in "123":
+        backend.append_booking(booking(owner))
+    backend.load_bookings()
+    backend.cancel_booking(booking("2"), [1])
+    live = [booking("1"), booking("3")]
+    staged = {backend.bookings_file + ".staged": csv_text(BOOKING_FIELDS, live),
+              backend.cancelled_file + ".staged": csv_text(BOOKING_FIELDS, [booking("2")])}
+    for path, text in staged.items():
+        write_synced(path, text)
+
+
+def test_crash_before_the_commit_point_is_discarded(csv_backend):
+    prepare_compaction(csv_backend)                # Staged files, but no marker
+    assert owners(r for _, r in csv_backend.load_bookings()) == ["1", "3"]  # Journal still applies
+    assert owners(csv_backend.load_cancelled()) == ["2"]
+    assert not os.path.exists(csv_backend.bookings_file + ".staged")
+    assert not os.path.exists(csv_backend.cancelled_file + ".staged")
+    assert len(read_csv(csv_backend.bookings_file)) == 3
+
+
+def test_crash_after_the_commit_point_rolls_forward(csv_backend):
+    prepare_compaction(csv_backend)
+    write_synced(csv_backend.compact_file, "1\n")  # Marker in place, nothing renamed yet
+    assert csv_backend.load_bookings() == [(0, booking("1")), (1, booking("3"))]
+    assert owners(csv_backend.load_cancelled()) == ["2"]   # Exactly once
+    for path in (csv_backend.compact_file, csv_backend.journal_file,
+                 csv_backend.bookings_file + ".staged", csv_backend.cancelled_file + ".staged"):
+        assert not os.path.exists(path)
+
+
+def test_roll_forward_after_a_partial_rename(csv_backend):
+    prepare_compaction(csv_backend)
+    write_synced(csv_backend.compact_file, "1\n")
+    os.replace(csv_backend.bookings_file + ".staged", csv_backend.bookings_file)  # Crash after one rename
+    csv_backend.append_booking(booking("2"))       # Rebooked at row 2 of the rewritten file
+    assert owners(r for _, r in CsvBackend(csv_backend.data_dir).load_bookings()) == ["1", "3", "2"]
+
+
+def test_tombstone_for_a_row_that_no_longer_matches(csv_backend):
+    csv_backend.init_bookings()
+    csv_backend.append_booking(booking("1"))
+    csv_backend.append_booking(booking("2", start="11:00 AM", end="12:00 PM"))
+    # Journal entry cancelling owner 9 at row 1, but row 1 is owner 2's booking
+    entry = dict(booking("9"), rows="1")
+    with open(csv_backend.journal_file, "w", newline="", encoding="utf-8") as f:
+        f.write(csv_text(JOURNAL_FIELDS, [entry]))
+    assert owners(r for _, r in csv_backend.load_bookings()) == ["1", "2"]
+    assert owners(csv_backend.load_cancelled()) == ["9"]
@@ -0,0 +1,84 @@
+# File: tests/test_event_commit.py
+import os
+
+import pytest
+
+import appointments
+from event_cache import EventCache
+from storage.csv_backend import csv_text, write_synced, EVENT_FIELDS
+
+
+def event(eid, title, start="09:00", end="10:00", appt_id=""):
+    return {"id": eid, "date": "2026-03-02", "start_time": start, "end_time": end, "title": title,
+            "reminder": "0", "category": "event", "description": "", "appt_id": appt_id}
+
+
+@pytest.fixture
+def events(csv_backend, monkeypatch):
+    cache = EventCache()
+    monkeypatch.setattr(appointments, "EVENTS", cache)
+    return cache
+
+
+def titles(backend, user):
+    return [e["title"] for e in backend.load_events(user)]
+
+
+def test_commit_writes_every_user(csv_backend):
+    csv_backend.append_event("a", event(1, "old"))
+    csv_backend.commit_events({"a": [event(2, "new a")], "b": [event(1, "new b")]})
+    assert titles(csv_backend, "a") == ["new a"]
+    assert titles(csv_backend, "b") == ["new b"]
+    assert not os.path.exists(csv_backend.events_log("a"))
+    assert not os.path.exists(csv_backend.commit_file)
+
+
+def test_leftover_manifest_is_rolled_forward_on_load(csv_backend):
+    csv_backend.save_events("a", [event(1, "before")])
+    csv_backend.append_event("a", event(2, "logged before the commit"))
+    for user in ("a", "b"):                        # Crash right after the commit point
+        write_synced(csv_backend.events_file(user) + ".staged", csv_text(EVENT_FIELDS, [event(1, f"after {user}")]))
+    write_synced(csv_backend.commit_file, "a\nb\n")
+    assert titles(csv_backend, "a") == ["after a"]
+    assert titles(csv_backend, "b") == ["after b"]
+    assert not os.path.exists(csv_backend.commit_file)
+    assert not os.path.exists(csv_backend.events_log("a"))
+
+
+def test_staged_files_without_a_manifest_are_discarded(csv_backend):
+    csv_backend.save_events("a", [event(1, "before")])
+    staged = csv_backend.events_file("a") + ".staged"
+    write_synced(staged, csv_text(EVENT_FIELDS, [event(1, "never committed")]))
+    assert titles(csv_backend, "a") == ["before"]
+    csv_backend.commit_events({"b": [event(1, "other")]})
+    assert not os.path.exists(staged)
+    assert titles(csv_backend, "a") == ["before"]
+
+
+def test_book_and_cancel_by_appointment_id(events):
+    events.add("b", event(None, "Appointment with a", appt_id="older"))   # Same time, another appointment
+    appt_id = appointments.book(["a", "b", "c"], "2026-03-02", "09:00", "10:00")
+    copies = {u: events.day(u, "2026-03-02") for u in "abc"}
+    assert [e["title"] for e in copies["a"]] == ["Appointment with b, c"]
+    assert all(e["appt_id"] == appt_id for e in copies["c"])
+
+    appointments.cancel("c", copies["c"][0])
+    assert events.day("a", "2026-03-02") == []
+    assert events.day("c", "2026-03-02") == []
+    assert [e["appt_id"] for e in events.day("b", "2026-03-02")] == ["older"]
+
+
+def test_cancel_falls_back_to_the_reciprocal_title(events):
+    mine = events.add("a", event(None, "Appointment with b"))
+    events.add("b", event(None, "Appointment with a", start="11:00", end="12:00"))  # Different time: not it
+    events.add("b", event(None, "Appointment with a"))
+    appointments.cancel("a", mine)
+    assert events.day("a", "2026-03-02") == []
+    assert [e["start_time"] for e in events.day("b", "2026-03-02")] == ["11:00"]
+
+
+def test_conflicts_per_participant(events):
+    events.add("b", event(None, "Lecture", "09:30", "11:00"))
+    events.add("c", event(None, "Lab", "10:00", "11:00"))         # Touches the end: no clash
+    clashes = appointments.find_conflicts(["a", "b", "c"], "2026-03-02", "09:00", "10:00")
+    assert {u: e["title"] for u, e in clashes.items()} == {"b": "Lecture"}
@@ -0,0 +1,59 @@
+# File: tests/test_free_slots.py
+from datetime import date, datetime
+
+import appointments
+from appointments import find_common_free_slots
+
+MONDAY = date(2026, 3, 2)
+
+
+class FakeEvents:
+    """Stands in for EVENTS: {(user, "YYYY-MM-DD"): [(start_min, end_min), ...]}"""
+
+    def __init__(self, busy):
+        self._busy = busy
+
+    def busy(self, user, date):
+        return sorted(self._busy.get((user, date), []))
+
+
+def slots(monkeypatch, busy, duration, **kwargs):
+    monkeypatch.setattr(appointments, "EVENTS", FakeEvents(busy))
+    kwargs.setdefault("count", 3)
+    return find_common_free_slots(["a", "b"], MONDAY, kwargs.pop("last", MONDAY), duration, **kwargs)
+
+
+def test_empty_day_starts_at_day_start(monkeypatch):
+    assert slots(monkeypatch, {}, 60) == [("2026-03-02", "08:00", "09:00"),
+                                          ("2026-03-02", "08:30", "09:30"),
+                                          ("2026-03-02", "09:00", "10:00")]
+
+
+def test_busy_intervals_of_both_users_are_merged(monkeypatch):
+    busy = {("a", "2026-03-02"): [(8 * 60, 9 * 60), (10 * 60, 11 * 60)],
+            ("b", "2026-03-02"): [(8 * 60 + 30, 10 * 60 + 15)]}
+    assert slots(monkeypatch, busy, 60, count=2) == [("2026-03-02", "11:00", "12:00"),
+                                                     ("2026-03-02", "11:30", "12:30")]
+
+
+def test_slot_may_touch_events_and_the_day_end(monkeypatch):
+    busy = {("a", "2026-03-02"): [(8 * 60, 21 * 60)]}
+    assert slots(monkeypatch, busy, 60) == [("2026-03-02", "21:00", "22:00")]
+
+
+def test_events_past_the_day_end_are_ignored(monkeypatch):
+    busy = {("a", "2026-03-02"): [(8 * 60, 21 * 60 + 30), (23 * 60, 23 * 60 + 30)],
+            ("b", "2026-03-02"): [(0, 7 * 60)]}
+    assert slots(monkeypatch, busy, 30) == [("2026-03-02", "21:30", "22:00")]
+
+
+def test_full_day_moves_on_to_the_next_day(monkeypatch):
+    busy = {("b", "2026-03-02"): [(7 * 60, 23 * 60)]}
+    assert slots(monkeypatch, busy, 90, count=1, last=date(2026, 3, 3)) == [("2026-03-03", "08:00", "09:30")]
+
+
+def test_nothing_before_not_before(monkeypatch):
+    found = slots(monkeypatch, {}, 30, count=1, not_before=datetime(2026, 3, 2, 13, 10))
+    assert found == [("2026-03-02", "13:30", "14:00")]  # Rounded up to the next half hour
+    found = slots(monkeypatch, {}, 30, count=1, last=date(2026, 3, 3), not_before=datetime(2026, 3, 2, 21, 50))
+    assert found == [("2026-03-03", "08:00", "08:30")]
@@ -0,0 +1,43 @@
+# File: tests/test_interval_index.py
+from room_booking.booking_store import IntervalIndex, to_minutes
+
+
+def make_index(*spans):
+    index = IntervalIndex()
+    for seq, (start, end) in enumerate(spans):
+        index.add(start, end, seq)
+    return index
+
+
+def test_touching_intervals_do_not_overlap():
+    index = make_index((540, 600))                 # 9:00-10:00
+    assert index.overlapping(600, 660) == []       # Starts when it ends
+    assert index.overlapping(480, 540) == []       # Ends when it starts
+
+
+def test_one_minute_of_overlap_counts():
+    index = make_index((540, 600))
+    assert index.overlapping(599, 660) == [0]
+    assert index.overlapping(480, 541) == [0]
+
+
+def test_long_interval_found_behind_later_starts():
+    # The running max end lets the search reach 0 past the short ones after it
+    index = make_index((480, 1200), (540, 560), (600, 620), (700, 720))
+    assert sorted(index.overlapping(650, 660)) == [0]
+    assert sorted(index.overlapping(545, 610)) == [0, 1, 2]
+
+
+def test_same_start_and_remove():
+    index = make_index((540, 600), (540, 570))
+    assert sorted(index.overlapping(560, 580)) == [0, 1]
+    index.remove(540, 0)
+    assert index.overlapping(560, 580) == [1]
+    assert index.overlapping(575, 600) == []       # The 10:00 end was the removed one
+    assert len(index) == 1
+
+
+def test_to_minutes():
+    assert to_minutes("12:00 AM") == 0
+    assert to_minutes("12:30 PM") == 12 * 60 + 30
+    assert to_minutes("9:05 pm") == 21 * 60 + 5
@@ -0,0 +1,68 @@
+# File: tests/test_note_index.py
+from note_index import NoteIndex, tokenize
+
+NOTES = [
+    {"id": 1, "title": "Chemistry exam", "tags": "school", "category": "Study", "content": "Revise organic chemistry."},
+    {"id": 2, "title": "Shopping", "tags": "", "category": "Home", "content": "Buy milk for the chemistry club."},
+    {"id": 3, "title": "Exam timetable", "tags": "school", "category": "Study", "content": "Maths on Monday."},
+]
+
+
+def build(tmp_path, notes=NOTES, threshold=200):
+    index = NoteIndex(str(tmp_path), threshold=threshold)
+    index.ensure("s1", lambda: notes)
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Hello, World! it's 2026") == ["hello", "world", "it", "s", "2026"]
+
+
+def test_words_match_as_prefixes(tmp_path):
+    index = build(tmp_path)
+    assert set(index.search("chem")) == {1, 2}
+    assert index.search("timet") == [3]
+    assert index.search("emistry") == []           # Prefixes only, not substrings
+
+
+def test_words_are_anded(tmp_path):
+    index = build(tmp_path)
+    assert set(index.search("exam")) == {1, 3}
+    assert index.search("exam chem") == [1]
+    assert index.search("exam milk") == []
+
+
+def test_title_words_rank_above_content_words(tmp_path):
+    index = build(tmp_path)
+    assert index.search("chemistry") == [1, 2]     # Title (and content) beats content only
+
+
+def test_empty_query_and_within(tmp_path):
+    index = build(tmp_path)
+    assert index.search("  ") is None
+    assert index.search("exam", within={3}) == [3]
+
+
+def test_put_and_remove_survive_a_reload(tmp_path):
+    index = build(tmp_path)
+    index.put({"id": 4, "title": "Chemistry lab", "content": ""}, "s2")
+    index.remove([1], "s3")
+    again = NoteIndex(str(tmp_path))
+    again.ensure("s3", lambda: [])                 # Snapshot + log match: no rebuild
+    assert again.search("chem") == [4, 2]
+
+
+def test_compaction_keeps_every_change(tmp_path):
+    index = build(tmp_path, threshold=2)
+    index.put({"id": 4, "title": "Biology", "content": ""}, "s2")
+    index.put({"id": 5, "title": "Biography", "content": ""}, "s3")   # Rewrites the snapshot
+    again = NoteIndex(str(tmp_path))
+    again.ensure("s3", lambda: [])
+    assert set(again.search("bio")) == {4, 5}
+
+
+def test_stale_stamp_rebuilds_from_the_notes(tmp_path):
+    build(tmp_path)
+    index = NoteIndex(str(tmp_path))
+    index.ensure("changed elsewhere", lambda: NOTES[1:])
+    assert index.search("chem") == [2]
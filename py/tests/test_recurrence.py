@@ -0,0 +1,51 @@
+# File: tests/test_recurrence.py
+from datetime import date, datetime
+
+from recurrence import Rule, format_rule, next_occurrence, parse_rule
+
+
+def test_parse_rule():
+    assert parse_rule("Daily") == Rule("daily", 1, None)
+    assert parse_rule("Every 2 weeks until 2026-12-31") == Rule("weekly", 2, date(2026, 12, 31))
+    assert parse_rule("Every 1 day") == Rule("daily", 1, None)
+    assert parse_rule("None") is None
+    assert parse_rule("Every 0 days") is None
+    assert parse_rule("Daily until someday") is None
+
+
+def test_format_rule_round_trip():
+    text = format_rule("Every N days", 3, "2026-05-01")
+    assert text == "Every 3 days until 2026-05-01"
+    assert parse_rule(text) == Rule("daily", 3, date(2026, 5, 1))
+    assert format_rule("None") == "None"
+
+
+def test_daily_rolls_over_to_the_first_occurrence_after_now():
+    start = datetime(2026, 3, 2, 9, 0)
+    assert next_occurrence(parse_rule("Daily"), start, start) == datetime(2026, 3, 3, 9, 0)
+    # Missed for ten and a half days: skips straight past them
+    assert next_occurrence(parse_rule("Daily"), start, datetime(2026, 3, 12, 21, 0)) == datetime(2026, 3, 13, 9, 0)
+
+
+def test_every_n_weeks_keeps_its_phase():
+    start = datetime(2026, 3, 2, 9, 0)             # Monday
+    rule = parse_rule("Every 2 weeks")
+    assert next_occurrence(rule, start, datetime(2026, 3, 10)) == datetime(2026, 3, 16, 9, 0)
+    assert next_occurrence(rule, start, datetime(2026, 3, 16, 9, 0)) == datetime(2026, 3, 30, 9, 0)
+
+
+def test_weekdays_skip_the_weekend():
+    friday = datetime(2026, 3, 6, 8, 30)
+    assert next_occurrence(parse_rule("Weekdays"), friday, friday) == datetime(2026, 3, 9, 8, 30)
+
+
+def test_series_ends_at_until():
+    start = datetime(2026, 3, 2, 9, 0)
+    rule = parse_rule("Daily until 2026-03-03")
+    assert next_occurrence(rule, start, start) == datetime(2026, 3, 3, 9, 0)
+    assert next_occurrence(rule, start, datetime(2026, 3, 3, 9, 0)) is None
+
+
+def test_no_rule_never_repeats():
+    start = datetime(2026, 3, 2, 9, 0)
+    assert next_occurrence(None, start, start) is None
@@ -0,0 +1,77 @@
+# File: tests/test_reminder_batch.py
+import pytest
+
+import reminder_archive
+import simple_reminder
+import storage
+from reminder_service import ReminderService
+from storage.csv_backend import CsvBackend
+
+
+class CountingBackend(CsvBackend):
+    """CSV backend that counts reminder writes."""
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.saves = 0
+
+    def save_reminders(self, user, reminders):
+        self.saves += 1
+        super().save_reminders(user, reminders)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    backend = CountingBackend(str(tmp_path))
+    backend.save_reminders("tan", [
+        {"id": 0, "task": "Essay", "datetime": "2030-01-07 09:00 AM", "status": "Pending", "repeat": "None"},
+        {"id": 1, "task": "Lab", "datetime": "2030-01-08 02:00 PM", "status": "Pending", "repeat": "None"},
+    ])
+    backend.saves = 0
+    monkeypatch.setattr(storage, "_backend", backend)
+    monkeypatch.setattr(reminder_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    service = ReminderService()
+    monkeypatch.setattr(simple_reminder, "load_reminders", service.load)
+    monkeypatch.setattr(simple_reminder, "save_reminders", service.save)
+    service.backend = backend
+    return service
+
+
+def test_many_changes_one_save(service):
+    with simple_reminder.ReminderBatch("tan") as batch:
+        added = batch.add("Quiz", "2030-01-09 10:00 AM")
+        batch.set_status(0, "Ringing")
+        batch.update(1, task="Lab report")
+        batch.delete(added["id"])
+        batch.add("Talk", "2030-01-10 10:00 AM")
+    service.flush()
+    assert service.backend.saves == 1
+    saved = service.backend.load_reminders("tan")
+    assert [(r["id"], r["task"], r["status"]) for r in saved] == [
+        (0, "Essay", "Ringing"), (1, "Lab report", "Pending"), (3, "Talk", "Pending")]
+
+
+def test_unchanged_batch_saves_nothing(service):
+    with simple_reminder.ReminderBatch("tan") as batch:
+        batch.set_status(0, "Pending")     # Already Pending
+        batch.update(7, task="gone")       # No such reminder
+        assert batch.delete(7) is None
+    service.flush()
+    assert service.backend.saves == 0
+
+
+def test_failed_batch_saves_nothing(service):
+    with pytest.raises(RuntimeError):
+        with simple_reminder.ReminderBatch("tan") as batch:
+            batch.add("Quiz", "2030-01-09 10:00 AM")
+            raise RuntimeError("boom")
+    service.flush()
+    assert service.backend.saves == 0
+    assert len(service.load("tan")) == 2
+
+
+def test_new_ids_stay_above_archived_ones(service):
+    reminder_archive.archive("tan", [
+        {"id": 41, "task": "Old", "datetime": "2025-03-01 09:00 AM", "status": "Rang", "repeat": "None"}])
+    with simple_reminder.ReminderBatch("tan") as batch:
+        assert batch.add("Quiz", "2030-01-09 10:00 AM")["id"] == 42
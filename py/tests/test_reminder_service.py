@@ -0,0 +1,118 @@
+# File: tests/test_reminder_service.py
+from datetime import datetime, timedelta
+
+import pytest
+
+import storage
+import reminder_archive
+from reminder_service import ReminderService, DT_FORMAT
+from storage.csv_backend import CsvBackend
+
+
+class CountingBackend(CsvBackend):
+    """CSV backend that counts reminder writes and can be told to fail them."""
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.saves = 0
+        self.fail = False
+
+    def save_reminders(self, user, reminders):
+        if self.fail:
+            raise OSError("disk full")
+        self.saves += 1
+        super().save_reminders(user, reminders)
+
+
+class FakeRoot:
+    """Just enough of a Tk widget for the service's timer."""
+
+    def __init__(self):
+        self.timers = {}
+        self.last_id = 0
+
+    def after(self, ms, callback):
+        self.last_id += 1
+        self.timers[self.last_id] = (ms, callback)
+        return self.last_id
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def winfo_exists(self):
+        return True
+
+    def fire(self):
+        """Run the one pending timer, as the Tk main loop would."""
+        (after_id,) = self.timers
+        _, callback = self.timers.pop(after_id)
+        callback()
+
+
+def reminder(rid, when, status="Pending"):
+    return {"id": rid, "task": f"task {rid}", "datetime": when.strftime(DT_FORMAT), "status": status, "repeat": "None"}
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = CountingBackend(str(tmp_path))
+    monkeypatch.setattr(storage, "_backend", backend)
+    monkeypatch.setattr(reminder_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    return backend
+
+
+def test_load_settles_ringing_and_missed(backend):
+    later = datetime.now() + timedelta(days=1)
+    backend.save_reminders("tan", [reminder(0, later, "Ringing"), reminder(1, later, "Missed"),
+                                   reminder(2, later, "Rang")])
+    service = ReminderService()
+    assert [r["status"] for r in service.load("tan")] == ["Pending", "Pending", "Rang"]
+    service.flush()
+    assert [r["status"] for r in backend.load_reminders("tan")] == ["Pending", "Pending", "Rang"]
+
+
+def test_saves_for_one_user_coalesce(backend):
+    service = ReminderService()
+    later = datetime.now() + timedelta(days=1)
+    with service._lock:                    # Hold the writer back until every save is queued
+        service._start_writer()
+        for n in range(1, 6):
+            service.save("tan", [reminder(i, later) for i in range(n)])
+    service.flush()
+    assert backend.saves == 1
+    assert len(backend.load_reminders("tan")) == 5
+
+
+def test_failed_write_is_reported_and_retried(backend):
+    service = ReminderService()
+    reported = []
+    service.on_save_error = lambda root, user, error: reported.append((root, user, str(error)))
+    later = datetime.now() + timedelta(days=1)
+    backend.fail = True
+    service.save("tan", [reminder(0, later)])
+    service._writes.join()
+    assert reported == []                  # Only reported from the Tk thread
+    service.report_errors()
+    assert reported == [(None, "tan", "disk full")]
+
+    backend.fail = False
+    service.flush()                        # Failed lists are written once more
+    assert [r["id"] for r in backend.load_reminders("tan")] == [0]
+
+
+def test_wake_delivers_due_reminders_in_order(backend):
+    now = datetime.now().replace(second=0, microsecond=0)  # The datetime column keeps minutes only
+    backend.save_reminders("tan", [reminder(0, now + timedelta(hours=1)),
+                                   reminder(1, now),
+                                   reminder(2, now - timedelta(minutes=10)),
+                                   reminder(3, now + timedelta(minutes=5), "Rang")])
+    service = ReminderService()
+    root, calls = FakeRoot(), []
+    service.subscribe(root, "tan", calls.append)
+    assert service._heap[0][3]["id"] == 2  # Earliest due on top
+    assert [ms for ms, _ in root.timers.values()] == [0]
+
+    root.fire()
+    assert [[(e["id"], missed) for e, missed in items] for items in calls] == [[(2, True), (1, False)]]
+    assert [item[3]["id"] for item in service._heap] == [0]
+    assert [ms for ms, _ in root.timers.values()] == [60 * 1000]  # Capped at MAX_SLEEP_MS
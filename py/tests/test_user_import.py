@@ -0,0 +1,83 @@
+# File: tests/test_user_import.py
+import pytest
+
+import storage
+import user_import
+from storage.csv_backend import CsvBackend
+from user_directory import UserDirectory
+
+
+class CountingBackend(CsvBackend):
+    """CSV backend that counts user writes and ID reservations."""
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.appends = 0
+        self.reservations = []
+
+    def append_users(self, users):
+        self.appends += 1
+        super().append_users(users)
+
+    def next_student_ids(self, count=1):
+        self.reservations.append(count)
+        return super().next_student_ids(count)
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = CountingBackend(str(tmp_path))
+    backend.append_users([("1000001", "tan", "pw"), ("1000002", "lee", "pw")])
+    backend.appends = 0
+    monkeypatch.setattr(storage, "_backend", backend)
+    monkeypatch.setattr(user_import, "USERS", UserDirectory())
+    return backend
+
+
+def roster(tmp_path, *lines):
+    path = tmp_path / "roster.csv"
+    path.write_text("\n".join(("username,password",) + lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_invalid_rows_are_reported_and_the_rest_imported(backend, tmp_path):
+    path = roster(tmp_path,
+                  "ng,a1",            # line 2
+                  "tan,x",            # line 3: already registered
+                  ",b2",              # line 4: empty username
+                  "",                 # line 5: blank, skipped silently
+                  "ng,c3",            # line 6: duplicate in the file
+                  '"o,h",d4',         # line 7: comma
+                  "wong,e5")          # line 8
+    users, errors = user_import.import_roster(path)
+    assert [u.username for u in users] == ["ng", "wong"]
+    assert [line for line, _ in errors] == [3, 4, 6, 7]
+    assert "already exists" in errors[0][1]
+    assert "cannot be empty" in errors[1][1]
+    assert "already exists" in errors[2][1]
+    assert "commas" in errors[3][1]
+
+
+def test_one_id_block_and_one_write(backend, tmp_path):
+    users, errors = user_import.import_roster(roster(tmp_path, "a,1", "b,2", "c,3"))
+    assert errors == []
+    assert [u.student_id for u in users] == ["1000003", "1000004", "1000005"]
+    assert backend.reservations == [3]
+    assert backend.appends == 1
+    assert [sid for sid, _, _ in backend.read_users()][-3:] == ["1000003", "1000004", "1000005"]
+    assert user_import.USERS.get("b").student_id == "1000004"
+
+
+def test_roster_without_required_columns(backend, tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("name,pass\na,1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        user_import.import_roster(str(path))
+    assert backend.appends == 0
+
+
+def test_dry_run_registers_nobody(backend, tmp_path, capsys):
+    assert user_import.main([roster(tmp_path, "a,1", "tan,2"), "--dry-run"]) == 1
+    assert "1 users can be registered" in capsys.readouterr().out
+    assert backend.appends == 0
+    assert backend.reservations == []
@@ -0,0 +1,130 @@
+# File: user_directory.py
+"""
+In-memory directory of registered users, shared by login, room booking and
+appointments.
+
+    from user_directory import USERS
+    USERS.get("tan")           # exact username
+    USERS.find("TAN")          # case-insensitive username
+    USERS.by_id("1000001")     # student ID
+
+Lookups are dict hits. Before answering, the directory asks the storage
+backend for its users stamp (users.txt mtime/size, or the SQLite row count)
+and reloads only when it changed, so users registered by another window or
+process show up without restarting.
+"""
+import threading                           # Import threading to guard reloads
+from collections import namedtuple         # Import namedtuple for user records
+from storage import get_backend, LEGACY_STUDENT_ID  # Import storage backend
+
+User = namedtuple("User", ["student_id", "username", "password"])
+
+
+class UserDirectory:
+    """Users indexed by username, case-folded username and student ID."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._loaded = False
+        self._users = []       # User records in registration order
+        self._by_name = {}     # username -> User (first registration wins)
+        self._by_folded = {}   # username.casefold() -> User
+        self._by_id = {}       # student_id -> User (old rows without an ID are left out)
+
+    # ---------------- Loading ----------------
+    def _index(self, user):
+        self._users.append(user)
+        self._by_name.setdefault(user.username, user)
+        self._by_folded.setdefault(user.username.casefold(), user)
+        if user.student_id != LEGACY_STUDENT_ID:
+            self._by_id.setdefault(user.student_id, user)
+
+    def _reload(self, stamp):
+        self._users, self._by_name, self._by_folded, self._by_id = [], {}, {}, {}
+        for sid, username, password in get_backend().read_users():
+            self._index(User(sid.strip(), username.strip(), password))
+        self._stamp = stamp
+        self._loaded = True
+
+    def refresh(self):
+        """Reload if the stored users changed since the last load."""
+        with self._lock:
+            stamp = get_backend().users_stamp()
+            if not self._loaded or stamp is None or stamp != self._stamp:
+                self._reload(stamp)
+
+    # ---------------- Lookups ----------------
+    def get(self, username):
+        """User with exactly this username, or None."""
+        with self._lock:
+            self.refresh()
+            return self._by_name.get(username.strip())
+
+    def find(self, username):
+        """User whose username matches ignoring case, or None."""
+        with self._lock:
+            self.refresh()
+            return self._by_folded.get(username.strip().casefold())
+
+    def by_id(self, student_id):
+        """User with this student ID, or None."""
+        with self._lock:
+            self.refresh()
+            return self._by_id.get(student_id.strip())
+
+    def exists(self, username):
+        return self.get(username) is not None
+
+    def authenticate(self, username, password):
+        """The user if the username and password match, else None."""
+        user = self.get(username)
+        return user if user is not None and user.password == password else None
+
+    def all(self):
+        """Every user record in registration order."""
+        with self._lock:
+            self.refresh()
+            return list(self._users)
+
+    def usernames(self, exclude=None):
+        """Distinct usernames in registration order, optionally leaving one out."""
+        with self._lock:
+            self.refresh()
+            return [name for name in self._by_name if name != exclude]
+
+    # ---------------- Updates ----------------
+    def add(self, student_id, username, password):
+        """Store a new user and index it without reloading the others."""
+        return self.add_many([(student_id, username, password)])[0]
+
+    def add_many(self, rows):
+        """Store many (student_id, username, password) rows in one write; return their records."""
+        users = [User(*row) for row in rows]
+        with self._lock:
+            self.refresh()
+            backend = get_backend()
+            before = backend.users_stamp()
+            backend.append_users(users)
+            for user in users:
+                self._index(user)
+            # Only trust the new stamp if nobody else wrote in between
+            if before == self._stamp:
+                self._stamp = backend.users_stamp()
+            else:
+                self._loaded = False
+            return users
+
+    def register(self, username, password):
+        """Give a new user the next student ID and store it; return the record."""
+        return self.register_many([(username, password)])[0]
+
+    def register_many(self, accounts):
+        """Register [(username, password), ...] with one block of new student IDs."""
+        accounts = list(accounts)
+        ids = get_backend().next_student_ids(len(accounts)) if accounts else []
+        return self.add_many((sid, username, password) for sid, (username, password) in zip(ids, accounts))
+
+
+# Shared directory used by every module
+USERS = UserDirectory()
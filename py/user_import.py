@@ -0,0 +1,90 @@
+# File: user_import.py
+"""
+Register a whole roster of students at once.
+
+    python user_import.py roster.csv [--output assigned.csv] [--dry-run]
+
+The roster is a CSV file with "username" and "password" columns (any other
+columns are ignored). Run it from the folder that holds data/, like the app.
+Rows are checked against the users already registered and against earlier
+rows of the same file; bad rows are reported by line number and skipped,
+the rest get one block of student IDs and are written in a single append.
+"""
+import argparse                            # Import argparse for the command line
+import csv                                 # Import csv to stream the roster
+import sys                                 # Import sys for error output
+from user_directory import USERS           # Import shared user directory
+
+
+def read_roster(path, existing):
+    """
+    Stream the roster; return (accounts, errors).
+
+    accounts: [(username, password), ...] that can be registered
+    errors:   [(line_number, message), ...] for rows that were skipped
+    """
+    accounts, errors = [], []
+    taken = set(existing)                  # Usernames already registered or earlier in the file
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        if "username" not in columns or "password" not in columns:
+            raise ValueError(f"{path}: roster needs 'username' and 'password' columns")
+        for row in reader:
+            line = reader.line_num
+            username = (row.get(columns["username"]) or "").strip()
+            password = (row.get(columns["password"]) or "").strip()
+            if not username and not password:
+                continue                   # Blank line
+            if not username or not password:
+                errors.append((line, "username and password cannot be empty"))
+            elif "," in username or "," in password:
+                errors.append((line, f"'{username}': commas are not allowed"))
+            elif username in taken:
+                errors.append((line, f"'{username}': username already exists"))
+            else:
+                taken.add(username)
+                accounts.append((username, password))
+    return accounts, errors
+
+
+def import_roster(path):
+    """Register every valid roster row; return (registered users, errors)."""
+    accounts, errors = read_roster(path, USERS.usernames())
+    return USERS.register_many(accounts), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Register the students listed in a roster CSV.")
+    parser.add_argument("roster", help="CSV file with username,password columns")
+    parser.add_argument("--output", help="write the assigned student_id,username pairs to this CSV")
+    parser.add_argument("--dry-run", action="store_true", help="only check the roster, register nobody")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.dry_run:
+            accounts, errors = read_roster(args.roster, USERS.usernames())
+            users = []
+        else:
+            users, errors = import_roster(args.roster)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+
+    for line, message in errors:
+        print(f"line {line}: {message}", file=sys.stderr)
+
+    if args.output and users:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["student_id", "username"])
+            writer.writerows((u.student_id, u.username) for u in users)
+
+    if args.dry_run:
+        print(f"{len(accounts)} users can be registered, {len(errors)} rows would be skipped.")
+    else:
+        print(f"Registered {len(users)} users, skipped {len(errors)} rows.")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())